@@ -341,17 +341,41 @@ except FileNotFoundError:
     """, unsafe_allow_html=True)
 
 # Import des fonctions utilitaires
-from utils.data_processing import load_and_process_data, calculate_performance_metrics, filter_data_by_period
+from utils.bitmap_index import BitmapIndex
+from utils.data_processing import calculate_performance_metrics
+from utils.data_watcher import start_data_watcher
+from utils.metrics_cache import METRICS_CACHE, FilterMetrics, filter_signature, tracked_team
+from utils.olap_cube import MatchCube
+from utils.period_index import PeriodIndex
 from utils.visualizations import create_performance_evolution, create_comparison_charts, create_home_advantage_chart
 
-# Chargement des données
-@st.cache_data
-def load_data():
-    return load_and_process_data()
+# Chargement des données : un seul surveillant par processus serveur, qui recharge
+# les CSV en arrière-plan et publie chaque nouvelle version pour toutes les sessions
+@st.cache_resource
+def get_data_watcher():
+    return start_data_watcher()
 
 try:
-    df = load_data()
-    france_data = df.copy()
+    data_snapshot = get_data_watcher().current()
+    df = data_snapshot.france_data
+    # Table de la version courante, partagée en lecture seule par toutes les sessions
+    france_data = df
+    # Sommes cumulées de la version courante : métriques d'une période en O(1)
+    period_index = data_snapshot.aggregates.get('period_index') or PeriodIndex(france_data)
+    # Bitmaps par compétition et par année : masque des filtres sans parcourir la table
+    bitmap_index = data_snapshot.aggregates.get('bitmap_index') or BitmapIndex(france_data)
+    # Cube de compteurs année × mois × compétition × adversaire × lieu : vues agrégées par cumul de cellules
+    match_cube = data_snapshot.aggregates.get('olap_cube') or MatchCube(france_data)
+    # Classement Elo de toutes les équipes (mis à jour à chaque ajout de matchs)
+    elo_ratings = data_snapshot.aggregates.get('elo')
+    # Confrontations directes de toutes les équipes, par couple et par année
+    head_to_head = data_snapshot.aggregates.get('head_to_head')
+    # Forces d'attaque et de défense de toutes les équipes (projections Monte-Carlo)
+    poisson_rates = data_snapshot.aggregates.get('poisson_rates')
+    # Compteurs par équipe et par année de toutes les équipes (standards internationaux)
+    team_periods = data_snapshot.aggregates.get('team_periods')
+    # Buts de chaque match (data/goalscorers.csv) : meilleures buteuses de la période
+    goalscorers = data_snapshot.aggregates.get('goalscorers')
 except Exception as e:
     st.error("⚠️ Erreur lors du chargement des données. Veuillez vérifier que le fichier CSV est présent dans le dossier 'data/'")
     st.info("📁 Structure attendue : data/france_matches.csv")
@@ -444,10 +468,33 @@ except:
     # Fallback avec texte si les images ne chargent pas
     st.sidebar.markdown("🇫🇷 **FFF** | 🏢 **Durabilis&Co**")
 
-# Application des filtres
-filtered_data = filter_data_by_period(france_data, year_range[0], year_range[1])
-if match_type:
-    filtered_data = filtered_data[filtered_data['tournament'].isin(match_type)]
+# Signature des filtres : version des données, équipe, années et compétitions
+signature = filter_signature(data_snapshot.version, tracked_team(france_data), year_range, match_type)
+
+# Application des filtres : combinaison des bitmaps années et compétitions. Le masque
+# et les lignes retenues (tables et graphiques des pages) sont calculés une fois par
+# combinaison de filtres et mémorisés avec les métriques : un rerun aux mêmes filtres
+# ne recopie pas la table
+def select_filtered_rows():
+    mask = bitmap_index.mask(year_range[0], year_range[1], match_type)
+    return mask, france_data[mask]
+
+filter_mask, filtered_data = METRICS_CACHE.get_or_compute((signature, 'filtered_rows'), select_filtered_rows)
+
+# Métriques des filtres : lues dans l'index des périodes (ou sur la table complète
+# via le masque) et mémorisées pour toutes les pages et sessions sous la signature
+filter_metrics = FilterMetrics(
+    filtered_data, france_data,
+    signature=signature,
+    period_index=period_index,
+    mask=filter_mask,
+    cube=match_cube,
+    elo=elo_ratings,
+    head_to_head=head_to_head,
+    poisson_rates=poisson_rates,
+    team_periods=team_periods,
+    goalscorers=goalscorers
+)
 
 # Affichage des pages
 # if page == "🏠 Accueil":
@@ -467,7 +514,7 @@ if match_type:
 if page == "🏠 Accueil":
     try:
         from page_modules.accueil import show_accueil
-        show_accueil(filtered_data, france_data)
+        show_accueil(filtered_data, france_data, filter_metrics)
     except Exception as e:
         st.error(f"Erreur lors du chargement de la page Accueil: {str(e)}")
         st.info("Vérifiez que le fichier page_modules/accueil.py existe et contient la fonction show_accueil")
@@ -475,7 +522,7 @@ if page == "🏠 Accueil":
 elif page == "📊 Analyse":
     try:
         from page_modules.analyse import show_analyse
-        show_analyse(filtered_data, france_data)
+        show_analyse(filtered_data, france_data, filter_metrics)
     except Exception as e:
         st.error(f"Erreur lors du chargement de la page Analyse: {str(e)}")
         st.info("Vérifiez que le fichier page_modules/analyse.py existe et contient la fonction show_analyse")
@@ -483,7 +530,7 @@ elif page == "📊 Analyse":
 elif page == "💡 Insights":
     try:
         from page_modules.insights import show_insights
-        show_insights(filtered_data, france_data)
+        show_insights(filtered_data, france_data, filter_metrics)
     except Exception as e:
         st.error(f"Erreur lors du chargement de la page Insights: {str(e)}")
         st.info("Vérifiez que le fichier page_modules/insights.py existe et contient la fonction show_insights")
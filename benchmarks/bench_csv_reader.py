@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la lecture de results.csv : ancienne lecture (types inférés,
+dates sans format, scores convertis après coup) contre le lecteur typé
+(types explicites, format de date fixe, moteur C ou pyarrow, colonnes du
+dashboard seulement).
+
+Temps : meilleur de --repeat mesures. Mémoire : pic tracemalloc (allocations
+Python/numpy) auquel s'ajoute, pour pyarrow, le pic de son allocateur propre ;
+chaque mesure mémoire tourne dans un processus neuf.
+
+Usage : python benchmarks/bench_csv_reader.py [--rows 1000000]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.csv_reader import DASHBOARD_COLUMNS, PYARROW_AVAILABLE, read_results_csv
+from utils.synthetic_data import write_synthetic_dataset
+
+
+def legacy_read(path):
+    """Reproduction de l'ancienne lecture"""
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.dropna(subset=['home_score', 'away_score'])
+    df['home_score'] = df['home_score'].astype(int)
+    df['away_score'] = df['away_score'].astype(int)
+    return df
+
+
+def typed_reader(engine, usecols):
+    def read(path):
+        df = read_results_csv(path, usecols=usecols, engine=engine).dropna(subset=['home_score', 'away_score'])
+        df['home_score'] = df['home_score'].astype('int16')
+        df['away_score'] = df['away_score'].astype('int16')
+        return df
+    return read
+
+
+def readers():
+    cases = [
+        ('ancienne lecture', legacy_read),
+        ('typé, moteur C', typed_reader('c', None)),
+        ('typé, C, colonnes dashboard', typed_reader('c', DASHBOARD_COLUMNS)),
+    ]
+    if PYARROW_AVAILABLE:
+        cases += [
+            ('typé, pyarrow', typed_reader('pyarrow', None)),
+            ('typé, pyarrow, col. dashboard', typed_reader('pyarrow', DASHBOARD_COLUMNS)),
+        ]
+    return cases
+
+
+def peak_memory(case_index, path, queue):
+    """Pic mémoire d'une lecture, mesuré dans un processus dédié"""
+    read = readers()[case_index][1]
+    tracemalloc.start()
+    df = read(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if PYARROW_AVAILABLE:
+        import pyarrow
+        peak += pyarrow.default_memory_pool().max_memory() or 0
+    queue.put((peak, int(df.memory_usage(deep=True).sum())))
+
+
+def run_file(label, path, repeat):
+    context = multiprocessing.get_context('spawn')
+    for index, (name, read) in enumerate(readers()):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            read(path)
+            timings.append(time.perf_counter() - start)
+
+        queue = context.Queue()
+        process = context.Process(target=peak_memory, args=(index, path, queue))
+        process.start()
+        peak, frame_size = queue.get()
+        process.join()
+
+        print(f"{label:<22} {name:<32} {min(timings) * 1000:>10.1f} {peak / 2**20:>10.1f} {frame_size / 2**20:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[1_000_000],
+                        help="tailles des fichiers synthétiques")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    print(f"{'Fichier':<22} {'Lecture':<32} {'Temps (ms)':>10} {'Pic (Mo)':>10} {'Table (Mo)':>10}")
+    run_file('data/results.csv', os.path.join(root, 'data', 'results.csv'), args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path, _ = write_synthetic_dataset(os.path.join(tmp, str(n_rows)), n_rows, with_goalscorers=False)
+            run_file(f'synthétique {n_rows:,}'.replace(',', ' '), path, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la dérivation des colonnes du point de vue France :
+ancienne version (filtre France puis 4 passes DataFrame.apply(axis=1)) contre
+la table point de vue équipe vectorisée (toutes équipes) suivie du découpage France,
+et contre le seul découpage France d'une table déjà construite : c'est le
+chemin de chaque chargement tant que la table est relue depuis le cache
+(utils.data_cache), la construction complète n'ayant lieu qu'une fois.
+
+Usage : python benchmarks/bench_derivation.py [--rows 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_processing import dashboard_data_for_team, process_results_file
+from utils.synthetic_data import write_synthetic_dataset
+from utils.team_perspective import TeamPerspective, build_team_perspective
+
+
+def legacy_derivation(df):
+    """Reproduction de l'ancienne dérivation ligne à ligne"""
+    df = df.copy()
+    df['is_home'] = df['home_team'] == 'france'
+    df['france_score'] = df.apply(
+        lambda row: row['home_score'] if row['home_team'] == 'france' else row['away_score'], axis=1
+    )
+    df['opponent_score'] = df.apply(
+        lambda row: row['away_score'] if row['home_team'] == 'france' else row['home_score'], axis=1
+    )
+    df['opponent'] = df.apply(
+        lambda row: row['away_team'] if row['home_team'] == 'france' else row['home_team'], axis=1
+    )
+    df['result'] = df.apply(
+        lambda row: 'Victoire' if row['france_score'] > row['opponent_score']
+                   else 'Défaite' if row['france_score'] < row['opponent_score']
+                   else 'Nul',
+        axis=1
+    )
+    df['goal_difference'] = df['france_score'] - df['opponent_score']
+    return df
+
+
+def legacy_derivation_from_matches(matches):
+    france = matches[(matches['home_team'] == 'france') | (matches['away_team'] == 'france')]
+    return legacy_derivation(france)
+
+
+def vectorized_derivation(matches):
+    return TeamPerspective(build_team_perspective(matches)).team_view('france')
+
+
+def team_slice(perspective):
+    """Découpage France d'une table point de vue équipe déjà construite (table en cache)"""
+    return dashboard_data_for_team(perspective)
+
+
+def best_of(func, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_case(label, path, repeat):
+    matches = process_results_file(path)
+    legacy_time, legacy = best_of(legacy_derivation_from_matches, matches, repeat)
+    vector_time, vector = best_of(vectorized_derivation, matches, repeat)
+    perspective = TeamPerspective(build_team_perspective(matches))
+    slice_time, sliced = best_of(team_slice, perspective, repeat)
+
+    # Les deux versions doivent produire exactement les mêmes colonnes France
+    legacy = legacy.sort_values('match_id')
+    vector = vector.sort_values('match_id').rename(columns={'team_score': 'france_score'})
+    sliced = sliced.sort_values('match_id')
+    for column in ['is_home', 'france_score', 'opponent_score', 'opponent', 'result', 'goal_difference']:
+        assert (legacy[column].astype(str).to_numpy() == vector[column].astype(str).to_numpy()).all(), column
+        assert (legacy[column].astype(str).to_numpy() == sliced[column].astype(str).to_numpy()).all(), column
+
+    print(f"{label:<28} {len(matches):>10} {legacy_time * 1000:>12.1f} {vector_time * 1000:>12.2f} "
+          f"{legacy_time / vector_time:>9.1f}x {slice_time * 1000:>12.2f} {legacy_time / slice_time:>9.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[100_000, 1_000_000],
+                        help="tailles des fichiers synthétiques")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    print(f"{'Jeu de données':<28} {'Lignes':>10} {'apply (ms)':>12} {'vecto (ms)':>12} {'Gain':>10} "
+          f"{'découpe (ms)':>12} {'Gain':>10}")
+    run_case('data/results.csv', os.path.join(root, 'data', 'results.csv'), args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            # Fichier où la France joue chaque match, face à 8 adversaires
+            path, _ = write_synthetic_dataset(os.path.join(tmp, str(n_rows)), n_rows, with_goalscorers=False,
+                                              n_teams=9, focus_team='France')
+            # L'ancienne version est très lente : une seule mesure sur les gros fichiers
+            run_case(f'synthétique {n_rows:,}'.replace(',', ' '), path, 1 if n_rows > 100_000 else args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark des agrégations groupées des vues (par année, mois et compétition) :
+ancienne version (groupby().agg avec lambda, un appel Python par groupe ; boucle
+de filtres par compétition de la page analyse) contre réducteurs natifs pandas
+sur colonnes indicatrices, utils.grouped_aggregation (np.bincount) et cumul des
+cellules du cube (utils.olap_cube, construit une fois par version des données).
+
+La table France est répétée 10, 100 et 1000 fois (par défaut) pour mesurer
+le comportement à plus grande échelle.
+
+Usage : python benchmarks/bench_grouped_aggregation.py [--scales 1 10 100 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_processing import dashboard_data_for_team, load_team_perspective
+from utils.grouped_aggregation import grouped_metrics, match_indicators
+from utils.metrics_kernel import COUNTER_FIELDS, frame_scores
+from utils.olap_cube import MatchCube
+
+
+def legacy_lambda(df, column):
+    """Reproduction des anciennes agrégations (lambda par groupe)"""
+    return df.groupby(column, observed=True).agg({
+        'result': lambda x: (x == 'Victoire').sum() / len(x) * 100,
+        'france_score': 'mean',
+        'opponent_score': 'mean',
+        'goal_difference': 'mean'
+    })
+
+
+def legacy_tournament_loop(df):
+    """Reproduction de l'ancienne boucle de filtres par compétition (page analyse)"""
+    stats = []
+    for tournament in df['tournament'].unique():
+        tourn_data = df[df['tournament'] == tournament]
+        if len(tourn_data) >= 2:
+            wins = len(tourn_data[tourn_data['result'] == 'Victoire'])
+            stats.append({
+                'Compétition': tournament,
+                'Matchs': len(tourn_data),
+                '% Victoires': round((wins / len(tourn_data)) * 100, 1),
+                'Buts/Match': round(tourn_data['france_score'].mean(), 2),
+                'Diff./Match': round(tourn_data['goal_difference'].mean(), 2)
+            })
+    return pd.DataFrame(stats)
+
+
+def pandas_native(df, column):
+    """Réducteurs natifs pandas (sum) sur colonnes indicatrices précalculées"""
+    indicators = pd.DataFrame(match_indicators(*frame_scores(df)), columns=COUNTER_FIELDS, index=df.index)
+    indicators[column] = df[column]
+    sums = indicators.groupby(column, observed=True, sort=True).sum()
+    return pd.DataFrame({
+        'win_rate': sums['victories'] / sums['matches'] * 100,
+        'avg_goals_scored': sums['goals_scored'] / sums['matches'],
+        'avg_goals_conceded': sums['goals_conceded'] / sums['matches']
+    })
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_scale(france_data, scale, repeat):
+    df = pd.concat([france_data] * scale, ignore_index=True) if scale > 1 else france_data
+    cube_time, cube = best_time(lambda: MatchCube(df), repeat)
+
+    for column in ['year', 'month', 'tournament']:
+        legacy_time, legacy = best_time(lambda: legacy_lambda(df, column), repeat)
+        native_time, native = best_time(lambda: pandas_native(df, column), repeat)
+        kernel_time, kernel = best_time(lambda: grouped_metrics(df, column), repeat)
+        rollup_time, rollup = best_time(lambda: cube.rollup(column), repeat)
+
+        # Mêmes valeurs pour toutes les versions
+        for table in (native, kernel, rollup):
+            assert np.allclose(table['win_rate'].to_numpy(), legacy['result'].to_numpy())
+            assert np.allclose(table['avg_goals_scored'].to_numpy(), legacy['france_score'].to_numpy())
+
+        print(f"{len(df):>10,} {column:<12} {legacy_time * 1000:>12.2f} {native_time * 1000:>12.2f} "
+              f"{kernel_time * 1000:>12.2f} {rollup_time * 1000:>12.3f}".replace(',', ' '))
+
+    loop_time, _ = best_time(lambda: legacy_tournament_loop(df), repeat)
+    table_time, _ = best_time(lambda: grouped_metrics(df, 'tournament'), repeat)
+    print(f"{len(df):>10,} {'boucle comp.':<12} {loop_time * 1000:>12.2f} {'':>12} {table_time * 1000:>12.2f} "
+          f"{'':>12}   (construction du cube : {cube_time * 1000:.1f} ms)".replace(',', ' '))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='*', default=[1, 10, 100, 1000],
+                        help="facteurs de répétition de la table France")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    france_data = dashboard_data_for_team(load_team_perspective(os.path.join(root, 'data', 'results.csv')))
+
+    print(f"{'Lignes':>10} {'Vue':<12} {'lambda (ms)':>12} {'natif (ms)':>12} {'bincount (ms)':>12} {'cube (ms)':>12}")
+    for scale in args.scales:
+        run_scale(france_data, scale, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la projection Monte-Carlo : ajustement des forces de Poisson sur
+data/results.csv, puis simulation de saisons en un processus et avec un pool
+de processus (mêmes lots et mêmes graines : résultats identiques).
+
+Usage : python benchmarks/bench_projection.py [--simulations 10000 100000 1000000] [--processes 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_processing import dashboard_data_for_team, load_team_perspective
+from utils.projection import PoissonRates, project_season
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--simulations', type=int, nargs='*', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--matches', type=int, default=14, help="matchs par saison simulée")
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    perspective = load_team_perspective(os.path.join(root, 'data', 'results.csv'))
+    france_data = dashboard_data_for_team(perspective)
+    schedule = france_data[france_data['year'] >= france_data['year'].max() - 2]
+
+    fit_time, rates = best_time(lambda: PoissonRates(perspective.table), args.repeat)
+    print(f"Ajustement des forces ({len(perspective.table):,} lignes) : {fit_time * 1000:.1f} ms".replace(',', ' '))
+    print(f"{'Simulations':>12} {'1 processus (ms)':>18} {f'{args.processes} processus (ms)':>18} {'Médiane %V':>12}")
+
+    for n_simulations in args.simulations:
+        serial_time, serial = best_time(
+            lambda: project_season(rates, 'france', schedule, args.matches, n_simulations, processes=1),
+            args.repeat)
+        pool_time, pooled = best_time(
+            lambda: project_season(rates, 'france', schedule, args.matches, n_simulations, processes=args.processes),
+            args.repeat)
+        assert np.array_equal(serial['win_rates'], pooled['win_rates'])
+        print(f"{n_simulations:>12,} {serial_time * 1000:>18.1f} {pool_time * 1000:>18.1f} "
+              f"{np.median(serial['win_rates']):>12.1f}".replace(',', ' '))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Racine du dépôt : permet aux tests d'importer le paquet utils avec pytest seul
@@ -1,18 +1,24 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_processing import calculate_performance_metrics, calculate_home_advantage
+from utils.metrics_cache import FilterMetrics
 from utils.visualizations import create_performance_evolution, create_momentum_chart
 
-def show_accueil(filtered_data, france_data):
+def show_accueil(filtered_data, france_data, filter_metrics=None):
     """
     Page d'accueil avec vue d'ensemble et KPIs principaux
     """
     st.title("🏠 Tableau de Bord - Vue d'Ensemble")
     
-    # Calcul des métriques pour la période filtrée et complète
-    current_metrics = calculate_performance_metrics(filtered_data)
-    historical_metrics = calculate_performance_metrics(france_data)
+    # Métriques de la période filtrée et de tout l'historique (partagées entre
+    # pages et sessions quand app.py fournit les métriques des filtres)
+    if filter_metrics is None:
+        filter_metrics = FilterMetrics(filtered_data, france_data)
+    current_metrics = filter_metrics.current()
+    historical_metrics = filter_metrics.all_time()
+    # Intervalles de confiance bootstrap à 95% de la période filtrée
+    intervals = filter_metrics.intervals()
+    interval = intervals.iloc[0] if len(intervals) > 0 else None
     
     # Section KPIs principaux
     st.markdown("### 📊 Indicateurs Clés de Performance")
@@ -27,6 +33,8 @@ def show_accueil(filtered_data, france_data):
             value=f"{current_metrics.get('win_rate', 0):.1f}%",
             delta=f"{delta_wins:.1f}%"
         )
+        if interval is not None:
+            st.caption(f"IC 95% : {interval['win_rate_low']:.1f}% – {interval['win_rate_high']:.1f}%")
     
     with col2:
         delta_goals = current_metrics.get('avg_goals_scored', 0) - historical_metrics.get('avg_goals_scored', 0)
@@ -35,6 +43,8 @@ def show_accueil(filtered_data, france_data):
             value=f"{current_metrics.get('avg_goals_scored', 0):.2f}",
             delta=f"{delta_goals:.2f}"
         )
+        if interval is not None:
+            st.caption(f"IC 95% : {interval['avg_goals_scored_low']:.2f} – {interval['avg_goals_scored_high']:.2f}")
     
     with col3:
         delta_conceded = historical_metrics.get('avg_goals_conceded', 0) - current_metrics.get('avg_goals_conceded', 0)
@@ -56,7 +66,7 @@ def show_accueil(filtered_data, france_data):
     col5, col6, col7, col8 = st.columns(4)
     
     with col5:
-        home_advantage = calculate_home_advantage(filtered_data)
+        home_advantage = filter_metrics.home_advantage()
         st.metric(
             label="🏠 Avantage Domicile",
             value=f"{home_advantage:.1f}%",
@@ -87,6 +97,8 @@ def show_accueil(filtered_data, france_data):
             value=f"{goal_diff_total:+d}",
             delta=f"{current_metrics.get('avg_goal_difference', 0):.2f}/match"
         )
+        if interval is not None:
+            st.caption(f"IC 95% : {interval['avg_goal_difference_low']:+.2f} – {interval['avg_goal_difference_high']:+.2f}/match")
     
     st.markdown("---")
     
@@ -96,7 +108,7 @@ def show_accueil(filtered_data, france_data):
     with col_left:
         st.markdown("### 📈 Évolution des Performances")
         if len(filtered_data) > 0:
-            evolution_chart = create_performance_evolution(filtered_data)
+            evolution_chart = create_performance_evolution(filtered_data, filter_metrics.rollup('year'))
             st.plotly_chart(evolution_chart, use_container_width=True)
         else:
             st.warning("Aucune donnée disponible pour la période sélectionnée")
@@ -106,6 +118,7 @@ def show_accueil(filtered_data, france_data):
         
         # Graphique en secteurs des résultats
         result_counts = filtered_data['result'].value_counts()
+        result_counts = result_counts[result_counts > 0]
         
         fig_pie = go.Figure(data=[go.Pie(
             labels=result_counts.index,
@@ -134,7 +147,7 @@ def show_accueil(filtered_data, france_data):
     st.markdown("### ⏱️ Analyse du Momentum")
     
     if len(filtered_data) >= 10:  # Minimum de données pour le momentum
-        momentum_chart = create_momentum_chart(filtered_data)
+        momentum_chart = create_momentum_chart(filtered_data, filter_metrics.trend(10))
         st.plotly_chart(momentum_chart, use_container_width=True)
         
         # Analyse textuelle du momentum
@@ -242,7 +255,8 @@ def show_accueil(filtered_data, france_data):
         **Types de compétition:**
         """)
         
-        for tournament, count in filtered_data['tournament'].value_counts().items():
+        tournament_counts = filtered_data['tournament'].value_counts()
+        for tournament, count in tournament_counts[tournament_counts > 0].items():
             st.markdown(f"- {tournament}: {count} matchs")
         
         st.markdown(f"""
@@ -2,23 +2,31 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from utils.data_processing import get_performance_by_opponent, calculate_home_advantage
+from utils.metrics_cache import FilterMetrics
 from utils.visualizations import create_comparison_charts, create_home_advantage_chart, create_tournament_performance_chart
+from page_modules.sections import section_selector
 
-def show_analyse(filtered_data, full_data):
+def show_analyse(filtered_data, full_data, filter_metrics=None):
     """
     Page d'analyse avec comparaisons internationales et facteurs de performance
     """
     st.title("📊 Analyse Approfondie")
     
-    # Tabs pour organiser les analyses
-    tab1, tab2, tab3 = st.tabs(["🌍 Comparaisons Internationales", "🏠 Facteurs de Performance", "🏆 Analyse par Compétition"])
+    # Métriques partagées entre pages et sessions quand app.py les fournit
+    if filter_metrics is None:
+        filter_metrics = FilterMetrics(filtered_data, full_data)
     
-    with tab1:
+    # Bilan de tous les adversaires de la période, mémorisé par combinaison de filtres
+    opponent_stats = filter_metrics.by_opponent()
+    all_opponents = opponent_stats.set_index('opponent')['matches_played']
+    
+    # Sections pour organiser les analyses (seule la section affichée est calculée)
+    tab1, tab2, tab3 = "🌍 Comparaisons Internationales", "🏠 Facteurs de Performance", "🏆 Analyse par Compétition"
+    section = section_selector([tab1, tab2, tab3], key="analyse_section")
+    
+    if section == tab1:
         st.markdown("### 🌍 Performance contre les Principales Nations")
         
-        # Sélection des adversaires à analyser
-        all_opponents = filtered_data['opponent'].value_counts()
         min_matches = st.slider("Nombre minimum de confrontations", 1, 10, 3)
         
         col1, col2 = st.columns([2, 1])
@@ -33,12 +41,10 @@ def show_analyse(filtered_data, full_data):
         
         with col2:
             st.markdown("#### 🎯 Top Adversaires")
-            top_opponents = all_opponents.head(5)
+            top_opponents = opponent_stats.head(5)
             
-            for opponent, matches in top_opponents.items():
-                opp_data = filtered_data[filtered_data['opponent'] == opponent]
-                wins = len(opp_data[opp_data['result'] == 'Victoire'])
-                win_rate = (wins / matches) * 100 if matches > 0 else 0
+            for _, opp in top_opponents.iterrows():
+                opponent, matches, win_rate = opp['opponent'], opp['matches_played'], opp['win_rate']
                 
                 # Détermination de la couleur selon la performance
                 if win_rate >= 60:
@@ -51,7 +57,7 @@ def show_analyse(filtered_data, full_data):
                 st.markdown(f"""
                 **{color} {opponent}**
                 - {matches} matchs - {win_rate:.1f}% victoires
-                - Buts: {opp_data['france_score'].sum()}-{opp_data['opponent_score'].sum()}
+                - Buts: {opp['goals_scored']}-{opp['goals_conceded']}
                 """)
         
         # Analyse détaillée par adversaire
@@ -60,7 +66,7 @@ def show_analyse(filtered_data, full_data):
         
         # Performance par adversaire (tableau)
         if len(all_opponents[all_opponents >= min_matches]) > 0:
-            opponent_performance = get_performance_by_opponent(filtered_data, min_matches)
+            opponent_performance = opponent_stats[opponent_stats['matches_played'] >= min_matches]
             
             if len(opponent_performance) > 0:
                 # Préparation des données pour l'affichage
@@ -71,6 +77,13 @@ def show_analyse(filtered_data, full_data):
                 display_df['Buts/Match'] = display_df['Buts/Match'].round(2)
                 display_df['Buts Encaissés/Match'] = display_df['Buts Encaissés/Match'].round(2)
                 
+                # Incertitude du % de victoires (souvent calculé sur quelques matchs)
+                opponent_intervals = filter_metrics.intervals('opponent').reindex(opponent_performance['opponent'])
+                display_df.insert(3, 'IC 95% Victoires', [
+                    f"{low:.0f}% – {high:.0f}%" for low, high in
+                    opponent_intervals[['win_rate_low', 'win_rate_high']].to_numpy()
+                ])
+                
                 st.dataframe(
                     display_df,
                     use_container_width=True,
@@ -105,8 +118,74 @@ def show_analyse(filtered_data, full_data):
         
         else:
             st.info(f"Aucun adversaire avec au moins {min_matches} confrontations dans la période sélectionnée")
+        
+        # Performance ajustée à la force des adversaires (classement Elo de toutes les équipes),
+        # masquée si l'équipe suivie n'a pas de note
+        strength = filter_metrics.strength_adjusted()
+        elo = filter_metrics.elo
+        rating = elo.rating(filter_metrics.team) if elo is not None else None
+        if strength and rating is not None:
+            st.markdown("---")
+            st.markdown("### 📐 Performance Ajustée au Niveau des Adversaires")
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Note Elo actuelle", f"{rating:.0f}")
+                st.caption(f"{elo.rank(filter_metrics.team)}e au classement Elo mondial")
+            with col2:
+                st.metric("Note moyenne des adversaires", f"{strength['avg_opponent_rating']:.0f}")
+                st.caption(f"{strength['strong_opponent_matches']} matchs contre un adversaire mieux classé")
+            with col3:
+                st.metric("Points obtenus / attendus", 
+                         f"{strength['actual_score']:.1f} / {strength['expected_score']:.1f}",
+                         f"{strength['performance_vs_expected']:+.1f}")
+                st.caption("Victoire = 1 point, nul = 0,5 ; attendu selon les notes d'avant-match")
+            
+            rating_history = elo.team_series(filter_metrics.team)
+            rating_history = rating_history[rating_history['match_id'].isin(filtered_data['match_id'])]
+            fig_elo = px.line(
+                rating_history, x='date', y='rating',
+                title="Évolution de la Note Elo",
+                labels={'date': 'Date', 'rating': 'Note Elo'}
+            )
+            fig_elo.update_layout(template="plotly_white", height=350)
+            st.plotly_chart(fig_elo, use_container_width=True)
+        
+        # Confrontation directe entre deux nations quelconques (index des confrontations)
+        if filter_metrics.head_to_head is not None:
+            st.markdown("---")
+            st.markdown("### ⚔️ Confrontation Directe entre Nations")
+            
+            head_to_head = filter_metrics.head_to_head
+            nations = list(head_to_head.teams)
+            col1, col2 = st.columns(2)
+            with col1:
+                team_a = st.selectbox("Équipe", nations,
+                                      index=nations.index(filter_metrics.team) if filter_metrics.team in nations else 0)
+            # Adversaires proposés : nations déjà rencontrées par l'équipe choisie
+            rivals = list(head_to_head.opponents(team_a))
+            default_opponent = top_opponents['opponent'].iloc[0] if len(top_opponents) > 0 else None
+            with col2:
+                team_b = st.selectbox("Adversaire", rivals,
+                                      index=rivals.index(default_opponent) if default_opponent in rivals else 0)
+            
+            confrontation = filter_metrics.confrontation(team_a, team_b) if team_b is not None else {}
+            start_year, end_year = filter_metrics.year_range()
+            if confrontation:
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Matchs", confrontation['total_matches'])
+                with col2:
+                    st.metric("V-N-D", f"{confrontation['victories']}-{confrontation['draws']}-{confrontation['defeats']}")
+                with col3:
+                    st.metric("% Victoires", f"{confrontation['win_rate']:.1f}%")
+                with col4:
+                    st.metric("Buts", f"{confrontation['goals_scored']}-{confrontation['goals_conceded']}")
+                st.caption(f"Toutes compétitions, de {start_year} à {end_year}")
+            else:
+                st.info(f"Aucune confrontation entre {team_a} et {team_b} de {start_year} à {end_year}")
     
-    with tab2:
+    if section == tab2:
         st.markdown("### 🏠 Facteurs Influençant la Performance")
         
         # Analyse de l'avantage du terrain
@@ -244,40 +323,43 @@ def show_analyse(filtered_data, full_data):
                 st.success(f"🛡️ **Solidité mentale** (seulement {fragility:.1f}% de lourdes défaites)")
             elif fragility > 15:
                 st.warning(f"⚠️ **Vulnérabilité aux corrections** ({fragility:.1f}% de lourdes défaites)")
+        
+        # Meilleures buteuses des matchs filtrés (index des buts de data/goalscorers.csv)
+        top_scorers = filter_metrics.top_scorers()
+        if top_scorers is not None and len(top_scorers) > 0:
+            st.markdown("#### ⚽ Meilleures Buteuses de la Période")
+            scorers_table = top_scorers.rename(columns={
+                'scorer': 'Buteuse', 'goals': 'Buts', 'penalties': 'Dont penalties'
+            })
+            st.dataframe(scorers_table, use_container_width=True, hide_index=True)
+            st.caption("Hors buts contre son camp ; matchs sans détail des buteuses non comptés")
     
-    with tab3:
+    if section == tab3:
         st.markdown("### 🏆 Performance par Type de Compétition")
         
         # Graphique de performance par tournoi
         if len(filtered_data) > 0:
-            tournament_chart = create_tournament_performance_chart(filtered_data)
+            tournament_chart = create_tournament_performance_chart(filtered_data, filter_metrics.rollup('tournament'))
             st.plotly_chart(tournament_chart, use_container_width=True)
         
         # Tableau détaillé par compétition
         st.markdown("#### 📊 Statistiques Détaillées par Compétition")
         
-        tournament_stats = []
-        for tournament in filtered_data['tournament'].unique():
-            tourn_data = filtered_data[filtered_data['tournament'] == tournament]
-            
-            if len(tourn_data) >= 2:  # Minimum 2 matchs
-                wins = len(tourn_data[tourn_data['result'] == 'Victoire'])
-                draws = len(tourn_data[tourn_data['result'] == 'Nul'])
-                defeats = len(tourn_data[tourn_data['result'] == 'Défaite'])
-                
-                tournament_stats.append({
-                    'Compétition': tournament,
-                    'Matchs': len(tourn_data),
-                    'V-N-D': f"{wins}-{draws}-{defeats}",
-                    '% Victoires': round((wins / len(tourn_data)) * 100, 1),
-                    'Buts/Match': round(tourn_data['france_score'].mean(), 2),
-                    'Buts Encaissés/Match': round(tourn_data['opponent_score'].mean(), 2),
-                    'Diff./Match': round(tourn_data['goal_difference'].mean(), 2)
-                })
+        by_tournament = filter_metrics.rollup('tournament')
+        by_tournament = by_tournament[by_tournament['total_matches'] >= 2]  # Minimum 2 matchs
         
-        if tournament_stats:
-            tournament_df = pd.DataFrame(tournament_stats)
-            tournament_df = tournament_df.sort_values('Matchs', ascending=False)
+        if len(by_tournament) > 0:
+            tournament_df = pd.DataFrame({
+                'Compétition': by_tournament.index.to_numpy(),
+                'Matchs': by_tournament['total_matches'].to_numpy(),
+                'V-N-D': [f"{wins}-{draws}-{defeats}" for wins, draws, defeats in
+                          by_tournament[['victories', 'draws', 'defeats']].to_numpy()],
+                '% Victoires': by_tournament['win_rate'].round(1).to_numpy(),
+                'Buts/Match': by_tournament['avg_goals_scored'].round(2).to_numpy(),
+                'Buts Encaissés/Match': by_tournament['avg_goals_conceded'].round(2).to_numpy(),
+                'Diff./Match': by_tournament['avg_goal_difference'].round(2).to_numpy()
+            })
+            tournament_df = tournament_df.sort_values('Matchs', ascending=False, kind='stable')
             
             st.dataframe(tournament_df, use_container_width=True, hide_index=True)
             
@@ -351,7 +433,7 @@ def show_analyse(filtered_data, full_data):
     
     # Adversaires les plus difficiles
     if len(all_opponents) > 0:
-        main_opponents = get_performance_by_opponent(filtered_data, min_matches=2)
+        main_opponents = opponent_stats[opponent_stats['matches_played'] >= 2]
         if len(main_opponents) > 0:
             toughest_opponent = main_opponents.loc[main_opponents['win_rate'].idxmin()]
             best_opponent = main_opponents.loc[main_opponents['win_rate'].idxmax()]
@@ -360,7 +442,7 @@ def show_analyse(filtered_data, full_data):
             insights.append(f"🟢 **Meilleure confrontation:** {best_opponent['opponent']} ({best_opponent['win_rate']:.1f}% victoires)")
     
     # Avantage terrain
-    home_advantage = calculate_home_advantage(filtered_data)
+    home_advantage = filter_metrics.home_advantage()
     if home_advantage > 10:
         insights.append(f"🏠 **Fort avantage domicile:** +{home_advantage:.1f}% de performance")
     elif home_advantage < -5:
@@ -4,31 +4,42 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from utils.data_processing import calculate_performance_metrics, calculate_trend_metrics, calculate_home_advantage
+from utils.metrics_cache import FilterMetrics
+from utils.metrics_kernel import batch_performance_metrics
+from page_modules.sections import section_selector
 
-def show_insights(filtered_data, full_data):
+def show_insights(filtered_data, full_data, filter_metrics=None):
     """
     Page insights avec tendances récentes et recommandations stratégiques
     """
     st.title("💡 Insights & Recommandations Stratégiques")
     
+    # Métriques de la période filtrée (partagées entre pages et sessions quand app.py les fournit)
+    if filter_metrics is None:
+        filter_metrics = FilterMetrics(filtered_data, full_data)
+    
     # Calcul des périodes pour comparaison
     current_year = datetime.now().year
-    recent_data = full_data[full_data['year'] >= current_year - 2]  # 2 dernières années
-    historical_data = full_data[full_data['year'] < current_year - 2]  # Données historiques
+    is_recent = full_data['year'].to_numpy() >= current_year - 2
+    recent_data = full_data[is_recent]  # 2 dernières années
+    historical_data = full_data[~is_recent]  # Données historiques
+    
+    # Métriques des deux périodes en une passe
+    period_metrics = batch_performance_metrics(full_data, {'recent': is_recent, 'historical': ~is_recent})
     
-    # Tabs pour organiser les insights
-    tab1, tab2, tab3 = st.tabs(["📈 Tendances Récentes", "🎯 Projections & Objectifs", "🏆 Recommandations FFF"])
+    # Sections pour organiser les insights (seule la section affichée est calculée)
+    tab1, tab2, tab3 = "📈 Tendances Récentes", "🎯 Projections & Objectifs", "🏆 Recommandations FFF"
+    section = section_selector([tab1, tab2, tab3], key="insights_section")
     
-    with tab1:
+    if section == tab1:
         st.markdown("### 📈 Analyse des Tendances Récentes")
         
         # Comparaison récent vs historique
         col1, col2, col3 = st.columns(3)
         
         if len(recent_data) > 0 and len(historical_data) > 0:
-            recent_metrics = calculate_performance_metrics(recent_data)
-            historical_metrics = calculate_performance_metrics(historical_data)
+            recent_metrics = period_metrics['recent']
+            historical_metrics = period_metrics['historical']
             
             with col1:
                 win_rate_trend = recent_metrics['win_rate'] - historical_metrics['win_rate']
@@ -61,7 +72,7 @@ def show_insights(filtered_data, full_data):
         
         if len(filtered_data) >= 15:
             # Calcul du momentum avec moyennes mobiles
-            trend_data = calculate_trend_metrics(filtered_data, window=8)
+            trend_data = filter_metrics.trend(8)
             
             fig_momentum = go.Figure()
             
@@ -111,21 +122,11 @@ def show_insights(filtered_data, full_data):
             # Analyse des séries
             st.markdown("#### 🔥 Analyse des Séries")
             
-            # Calcul des séries actuelles
+            # Séries sur toute la période filtrée (codage par plages, mis en cache)
             recent_matches = trend_data.sort_values('date').tail(10)
-            current_streak = 0
-            streak_type = "Unknown"
-            
-            if len(recent_matches) > 0:
-                last_result = recent_matches.iloc[-1]['result']
-                streak_type = last_result
-                
-                # Compter la série actuelle
-                for i in range(len(recent_matches) - 1, -1, -1):
-                    if recent_matches.iloc[i]['result'] == last_result:
-                        current_streak += 1
-                    else:
-                        break
+            streaks = filter_metrics.streaks()
+            current_streak = streaks['current']['length']
+            streak_type = streaks['current']['type'] or "Unknown"
             
             col1, col2, col3 = st.columns(3)
             
@@ -156,6 +157,16 @@ def show_insights(filtered_data, full_data):
                         st.error(f"📉 **Tendance Négative** ({trend:.2f})")
                     else:
                         st.info(f"➡️ **Tendance Stable** ({trend:+.2f})")
+            
+            # Séries records de la période
+            records = []
+            for key, label in [('longest_win', 'victoires'), ('longest_unbeaten', 'matchs sans défaite'),
+                               ('longest_winless', 'matchs sans victoire')]:
+                record = streaks[key]
+                if record['length'] > 0:
+                    records.append(f"**{record['length']} {label}** ({record['start']:%d/%m/%Y} → {record['end']:%d/%m/%Y})")
+            if records:
+                st.markdown("🏅 Records de la période : " + " · ".join(records))
         
         else:
             st.warning("⚠️ Données insuffisantes pour l'analyse du momentum (minimum 15 matchs)")
@@ -165,14 +176,14 @@ def show_insights(filtered_data, full_data):
         st.markdown("### 📅 Patterns Temporels")
         
         if len(filtered_data) > 0:
-            # Performance par mois
-            monthly_performance = filtered_data.groupby('month').agg({
-                'result': lambda x: (x == 'Victoire').sum() / len(x) * 100,
-                'france_score': 'mean',
-                'opponent_score': 'mean'
-            }).reset_index()
-            
-            monthly_performance.columns = ['month', 'win_rate', 'goals_scored', 'goals_conceded']
+            # Performance par mois : cumul des cellules du cube
+            monthly = filter_metrics.rollup('month')
+            monthly_performance = pd.DataFrame({
+                'month': monthly.index.to_numpy(),
+                'win_rate': monthly['win_rate'].to_numpy(),
+                'goals_scored': monthly['avg_goals_scored'].to_numpy(),
+                'goals_conceded': monthly['avg_goals_conceded'].to_numpy()
+            })
             
             # Mapping des mois
             month_names = ['Jan', 'Fév', 'Mar', 'Avr', 'Mai', 'Jun',
@@ -218,12 +229,12 @@ def show_insights(filtered_data, full_data):
                     elif winter_avg > summer_avg + 10:
                         st.info("❄️ **Meilleures performances hivernales**")
     
-    with tab2:
+    if section == tab2:
         st.markdown("### 🎯 Projections et Objectifs")
         
         # Définition d'objectifs basés sur les données
         if len(recent_data) > 0:
-            current_performance = calculate_performance_metrics(recent_data)
+            current_performance = period_metrics['recent']
             
             # Objectifs recommandés
             st.markdown("#### 🎯 Objectifs Recommandés pour la Prochaine Période")
@@ -259,67 +270,70 @@ def show_insights(filtered_data, full_data):
             with col2:
                 st.markdown("##### 📈 Projections Basées sur les Tendances")
                 
-                # Projection simple basée sur la tendance récente
+                # Projection Monte-Carlo : forces de Poisson de toutes les équipes,
+                # saisons simulées contre des adversaires tirés du calendrier récent
                 if len(recent_data) >= 10:
-                    # Calcul de la tendance sur les matchs récents
-                    recent_sorted = recent_data.sort_values('date')
-                    first_half = recent_sorted.head(len(recent_sorted)//2)
-                    second_half = recent_sorted.tail(len(recent_sorted)//2)
+                    span_years = max((recent_data['day'].max() - recent_data['day'].min()) / 365.25, 1)
+                    n_matches = max(int(round(len(recent_data) / span_years)), 4)
+                    checkpoints = [max(n_matches // 4, 1), max(n_matches // 2, 1), n_matches]
+                    projection = filter_metrics.projection(recent_data, n_matches, checkpoints)
+                    bands = projection['bands']
+                    
+                    # Médiane et bande à 90% du taux de victoire sur 12 mois
+                    projected_win_rate = bands[-1, 2]
+                    trend = projected_win_rate - current_win_rate
+                    target_probability = (projection['win_rates'] >= target_win_rate).mean() * 100
+                    
+                    st.markdown("**🔮 Projection 12 mois:**")
+                    projection_text = (f"{projected_win_rate:.1f}% victoires projetées "
+                                       f"(90% des simulations entre {bands[-1, 0]:.0f}% et {bands[-1, 4]:.0f}%)")
                     
-                    if len(first_half) > 0 and len(second_half) > 0:
-                        trend_wins = (len(second_half[second_half['result'] == 'Victoire']) / len(second_half)) - \
-                                   (len(first_half[first_half['result'] == 'Victoire']) / len(first_half))
-                        
-                        # Projection à 12 mois
-                        projected_win_rate = current_win_rate + (trend_wins * 100 * 2)  # Extrapolation
-                        projected_win_rate = max(0, min(100, projected_win_rate))  # Bornes réalistes
-                        
-                        st.markdown("**🔮 Projection 12 mois:**")
-                        
-                        if trend_wins > 0.1:
-                            st.success(f"📈 Tendance positive: {projected_win_rate:.1f}% victoires projetées")
-                        elif trend_wins < -0.1:
-                            st.error(f"📉 Tendance négative: {projected_win_rate:.1f}% victoires projetées")
-                        else:
-                            st.info(f"➡️ Tendance stable: {projected_win_rate:.1f}% victoires projetées")
-                        
-                        # Graphique de projection
-                        months = ['Actuel', 'Dans 3 mois', 'Dans 6 mois', 'Dans 12 mois']
-                        projections = [
-                            current_win_rate,
-                            current_win_rate + (trend_wins * 100 * 0.5),
-                            current_win_rate + (trend_wins * 100 * 1),
-                            projected_win_rate
-                        ]
-                        
-                        fig_projection = px.line(
-                            x=months,
-                            y=projections,
-                            title="Projection Performance",
-                            markers=True
-                        )
-                        fig_projection.add_hline(y=50, line_dash="dash", line_color="gray")
-                        fig_projection.update_layout(
-                            template="plotly_white",
-                            height=250,
-                            yaxis_title="% Victoires"
-                        )
-                        st.plotly_chart(fig_projection, use_container_width=True)
+                    if trend > 5:
+                        st.success(f"📈 Tendance positive: {projection_text}")
+                    elif trend < -5:
+                        st.error(f"📉 Tendance négative: {projection_text}")
+                    else:
+                        st.info(f"➡️ Tendance stable: {projection_text}")
+                    st.caption(f"{projection['simulations']:,} saisons simulées de {n_matches} matchs - "
+                               f"probabilité d'atteindre l'objectif de {target_win_rate:.1f}% : {target_probability:.0f}%")
+                    
+                    # Graphique de projection : médiane et bandes de confiance
+                    months = ['Actuel', 'Dans 3 mois', 'Dans 6 mois', 'Dans 12 mois']
+                    lower = [current_win_rate] + list(bands[:, 0])
+                    upper = [current_win_rate] + list(bands[:, 4])
+                    median = [current_win_rate] + list(bands[:, 2])
+                    
+                    fig_projection = go.Figure()
+                    fig_projection.add_trace(go.Scatter(x=months, y=upper, mode='lines', line=dict(width=0),
+                                                        showlegend=False, hoverinfo='skip'))
+                    fig_projection.add_trace(go.Scatter(x=months, y=lower, mode='lines', line=dict(width=0),
+                                                        fill='tonexty', fillcolor='rgba(25, 112, 180, 0.2)',
+                                                        name='Bande à 90%'))
+                    fig_projection.add_trace(go.Scatter(x=months, y=median, mode='lines+markers',
+                                                        line=dict(color='#1970b4', width=3), name='Médiane'))
+                    fig_projection.add_hline(y=50, line_dash="dash", line_color="gray")
+                    fig_projection.update_layout(
+                        title="Projection Performance",
+                        template="plotly_white",
+                        height=250,
+                        yaxis_title="% Victoires"
+                    )
+                    st.plotly_chart(fig_projection, use_container_width=True)
         
         # Benchmarking international
         st.markdown("---")
         st.markdown("### 🌍 Benchmarking International")
         
-        # Simulation de standards internationaux (à adapter avec de vraies données)
-        international_standards = {
-            'Top 5 Mondial': {'win_rate': 70, 'goals_per_match': 2.1, 'goals_conceded': 0.8},
-            'Top 10 Mondial': {'win_rate': 60, 'goals_per_match': 1.8, 'goals_conceded': 1.1},
-            'Top 20 Mondial': {'win_rate': 50, 'goals_per_match': 1.5, 'goals_conceded': 1.4}
-        }
+        # Standards internationaux : seuils des Top 5/10/20 de toutes les équipes sur la période
+        international_standards, france_ranks = filter_metrics.benchmarks()
         
-        current_metrics = calculate_performance_metrics(filtered_data)
+        current_metrics = filter_metrics.current()
         
         st.markdown("#### 📊 Positionnement vs Standards Internationaux")
+        if france_ranks:
+            st.caption(f"Classement sur la période parmi {france_ranks['teams']} nations (10 matchs minimum, toutes compétitions) : "
+                       f"{france_ranks['win_rate']}e au % de victoires, {france_ranks['goals_per_match']}e en attaque, "
+                       f"{france_ranks['goals_conceded']}e en défense")
         
         # Graphique radar de comparaison
         categories = ['Taux de Victoire', 'Efficacité Offensive', 'Solidité Défensive']
@@ -341,16 +355,22 @@ def show_insights(filtered_data, full_data):
             line_color='#0055A4'
         ))
         
-        # Standards Top 10
-        top10_values = [60, 90, 66.67]  # Valeurs normalisées
-        fig_radar.add_trace(go.Scatterpolar(
-            r=top10_values,
-            theta=categories,
-            fill='toself',
-            name='Standard Top 10',
-            line_color='#28a745',
-            opacity=0.5
-        ))
+        # Standards Top 10 (même normalisation)
+        top10 = international_standards.get('Top 10 Mondial')
+        if top10:
+            top10_values = [
+                top10['win_rate'],
+                top10['goals_per_match'] * 50,
+                (3 - top10['goals_conceded']) * 33.33
+            ]
+            fig_radar.add_trace(go.Scatterpolar(
+                r=top10_values,
+                theta=categories,
+                fill='toself',
+                name='Standard Top 10',
+                line_color='#28a745',
+                opacity=0.5
+            ))
         
         fig_radar.update_layout(
             polar=dict(
@@ -385,13 +405,13 @@ def show_insights(filtered_data, full_data):
             gap_df = pd.DataFrame(gaps)
             st.dataframe(gap_df, use_container_width=True, hide_index=True)
     
-    with tab3:
+    if section == tab3:
         st.markdown("### 🏆 Recommandations Stratégiques pour la FFF")
         
         # Analyse SWOT automatisée
         st.markdown("#### 📊 Analyse SWOT Automatisée")
         
-        current_metrics = calculate_performance_metrics(filtered_data)
+        current_metrics = filter_metrics.current()
         
         col1, col2 = st.columns(2)
         
@@ -408,7 +428,7 @@ def show_insights(filtered_data, full_data):
             if current_metrics.get('avg_goals_conceded', 0) < 1.2:
                 forces.append("✅ Solidité défensive (<1.2 buts encaissés/match)")
             
-            home_adv = calculate_home_advantage(filtered_data) if len(filtered_data) > 0 else 0
+            home_adv = filter_metrics.home_advantage() if len(filtered_data) > 0 else 0
             if home_adv > 10:
                 forces.append("✅ Fort avantage du terrain à domicile")
             
@@ -0,0 +1,20 @@
+import streamlit as st
+
+def section_selector(labels, key):
+    """
+    Sélecteur de sections remplaçant st.tabs : Streamlit exécute le contenu de
+    tous les onglets à chaque rerun, alors qu'ici seule la section choisie est
+    calculée et affichée. Le choix est conservé dans st.session_state[key],
+    y compris quand on change de page (le widget est alors supprimé).
+    """
+    remembered = st.session_state.get(key, labels[0])
+    section = st.radio(
+        "Section",
+        labels,
+        index=labels.index(remembered) if remembered in labels else 0,
+        horizontal=True,
+        label_visibility="collapsed",
+        key=f"{key}_selector"
+    )
+    st.session_state[key] = section
+    return section
@@ -0,0 +1,36 @@
+"""
+Données partagées par les tests des index précalculés : données d'exemple et
+filtres aléatoires de la barre latérale
+"""
+import numpy as np
+import pytest
+
+from utils.data_processing import generate_sample_data
+
+N_FILTERS = 300
+
+
+@pytest.fixture(scope='session')
+def sample():
+    return generate_sample_data()
+
+
+@pytest.fixture(scope='session')
+def filters(sample):
+    """
+    Filtres aléatoires (années de début et de fin, compétitions ou None) ;
+    les périodes débordent parfois de l'historique
+    """
+    rng = np.random.default_rng(0)
+    first, last = int(sample['year'].min()), int(sample['year'].max())
+    tournaments = list(sample['tournament'].cat.categories)
+    drawn = []
+    for _ in range(N_FILTERS):
+        start_year, end_year = sorted(rng.integers(first - 2, last + 3, size=2).tolist())
+        if rng.random() < 0.3:
+            selection = None
+        else:
+            size = int(rng.integers(1, len(tournaments) + 1))
+            selection = [str(name) for name in rng.choice(tournaments, size=size, replace=False)]
+        drawn.append((start_year, end_year, selection))
+    return drawn
@@ -0,0 +1,42 @@
+"""
+Calcul de référence des tests des index : filtrage direct des matchs puis
+compteurs recalculés en pandas simple
+"""
+
+COUNTED = ['total_matches', 'victories', 'draws', 'defeats', 'goals_scored', 'goals_conceded',
+           'clean_sheets', 'big_wins', 'narrow_wins', 'heavy_defeats']
+
+
+def filter_rows(df, start_year, end_year, tournaments=None):
+    """
+    Filtrage direct de la table des pages
+    """
+    keep = df['year'].between(start_year, end_year)
+    if tournaments:
+        keep &= df['tournament'].astype(str).isin(tournaments)
+    return df[keep]
+
+
+def reference_metrics(df):
+    """
+    Compteurs calculés directement sur les matchs (vide s'il n'y en a aucun)
+    """
+    if len(df) == 0:
+        return {}
+    difference = df['france_score'].astype(int) - df['opponent_score'].astype(int)
+    return {
+        'total_matches': len(df),
+        'victories': int((df['result'] == 'Victoire').sum()),
+        'draws': int((df['result'] == 'Nul').sum()),
+        'defeats': int((df['result'] == 'Défaite').sum()),
+        'goals_scored': int(df['france_score'].astype(int).sum()),
+        'goals_conceded': int(df['opponent_score'].astype(int).sum()),
+        'clean_sheets': int((df['opponent_score'] == 0).sum()),
+        'big_wins': int((difference >= 3).sum()),
+        'narrow_wins': int((difference == 1).sum()),
+        'heavy_defeats': int((difference <= -3).sum())
+    }
+
+
+def counted(metrics):
+    return {key: metrics[key] for key in COUNTED if key in metrics}
@@ -0,0 +1,14 @@
+"""
+Les bitmaps des filtres année et compétition doivent retenir exactement les
+lignes du filtrage direct de la table.
+"""
+from reference import filter_rows
+from utils.bitmap_index import BitmapIndex
+
+
+def test_bitmap_mask_matches_filtered_rows(sample, filters):
+    index = BitmapIndex(sample)
+    for start_year, end_year, tournaments in filters:
+        mask = index.mask(start_year, end_year, tournaments)
+        expected = filter_rows(sample, start_year, end_year, tournaments)
+        assert sample['match_id'].to_numpy()[mask].tolist() == expected['match_id'].tolist()
@@ -0,0 +1,50 @@
+"""
+Intervalles de confiance bootstrap : les valeurs centrales sont les moyennes
+de chaque groupe, les intervalles sont reproductibles et les encadrent.
+"""
+import numpy as np
+import pandas.testing as pdt
+import pytest
+
+from utils.bootstrap import BOOTSTRAP_STATS, bootstrap_intervals, grouped_bootstrap
+
+
+def reference_means(df, by):
+    scored = df['france_score'].astype(int)
+    conceded = df['opponent_score'].astype(int)
+    per_match = df.assign(
+        win_rate=(scored > conceded) * 100.0,
+        avg_goals_scored=scored.astype(float),
+        avg_goal_difference=(scored - conceded).astype(float)
+    )
+    return per_match.groupby(by, observed=True)[BOOTSTRAP_STATS].mean()
+
+
+def test_point_values_equal_group_means(sample):
+    intervals = bootstrap_intervals(sample, by='opponent', n_replicates=500)
+    expected = reference_means(sample, 'opponent')
+    assert intervals['matches'].tolist() == sample.groupby('opponent', observed=True).size().tolist()
+    assert intervals.index.astype(str).tolist() == expected.index.astype(str).tolist()
+    pdt.assert_frame_equal(intervals[BOOTSTRAP_STATS].reset_index(drop=True), expected.reset_index(drop=True))
+
+    total = bootstrap_intervals(sample, n_replicates=500)
+    assert total.loc['total', 'matches'] == len(sample)
+    assert total.loc['total', 'win_rate'] == pytest.approx((sample['result'] == 'Victoire').mean() * 100)
+
+
+def test_intervals_bound_point_values(sample):
+    intervals = bootstrap_intervals(sample, by='tournament', n_replicates=1000, seed=7)
+    for stat in BOOTSTRAP_STATS:
+        assert (intervals[f'{stat}_low'] <= intervals[stat]).all()
+        assert (intervals[stat] <= intervals[f'{stat}_high']).all()
+    pdt.assert_frame_equal(intervals, bootstrap_intervals(sample, by='tournament', n_replicates=1000, seed=7))
+
+
+def test_constant_and_empty_groups():
+    values = np.array([[1.0], [1.0], [3.0], [5.0]])
+    groups = np.array([0, 0, 2, 2])
+    means = grouped_bootstrap(values, groups, 3, n_replicates=200)
+    assert means.shape == (200, 3, 1)
+    assert np.all(means[:, 0, 0] == 1.0)
+    assert np.all(np.isnan(means[:, 1, 0]))
+    assert set(np.unique(means[:, 2, 0])) <= {3.0, 4.0, 5.0}
@@ -0,0 +1,68 @@
+"""
+Cache binaire des tables traitées : une table relue depuis le cache, ou
+complétée par les lignes ajoutées en fin de CSV, doit être identique à celle
+construite depuis le CSV source.
+"""
+import os
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from utils import data_processing
+from utils.data_cache import FEATHER_AVAILABLE, cache_paths
+from utils.data_processing import load_team_perspective
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'results.csv')
+
+pytestmark = pytest.mark.skipif(not FEATHER_AVAILABLE, reason="cache Feather indisponible sans pyarrow")
+
+
+def write_results(path, lines):
+    with open(path, 'wb') as f:
+        f.writelines(lines)
+
+
+@pytest.fixture(scope='module')
+def results_lines():
+    with open(RESULTS_PATH, 'rb') as f:
+        return f.readlines()
+
+
+def test_cached_table_equals_fresh_build(tmp_path, results_lines):
+    path = str(tmp_path / 'results.csv')
+    write_results(path, results_lines[:3001])
+
+    built = load_team_perspective(path).table
+    data_path, meta_path = cache_paths(path, 'team_perspective')
+    assert os.path.exists(data_path) and os.path.exists(meta_path)
+
+    cached = load_team_perspective(path).table
+    pdt.assert_frame_equal(cached, built)
+    pdt.assert_frame_equal(cached, load_team_perspective(path, use_cache=False).table)
+
+
+def decoded(table):
+    """
+    Table aux catégories décodées, triée par équipe, jour et match : l'ajout
+    incrémental étend les dictionnaires en fin (et place les blocs des
+    nouvelles équipes après les autres), une reconstruction les trie
+    """
+    table = table.astype({column: object for column in table.columns
+                          if isinstance(table[column].dtype, pd.CategoricalDtype)})
+    return table.sort_values(['team', 'day', 'match_id']).reset_index(drop=True)
+
+
+def test_tail_append_equals_full_rebuild(tmp_path, results_lines, monkeypatch):
+    path = str(tmp_path / 'results.csv')
+    write_results(path, results_lines[:6001])
+    load_team_perspective(path)
+
+    # Lignes ajoutées en fin de fichier : seule la fin est relue
+    write_results(path, results_lines)
+    monkeypatch.setattr(data_processing, 'process_results_file', None)
+    appended = load_team_perspective(path).table
+    monkeypatch.undo()
+
+    rebuilt = load_team_perspective(path, use_cache=False).table
+    pdt.assert_frame_equal(decoded(appended), decoded(rebuilt))
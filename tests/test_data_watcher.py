@@ -0,0 +1,45 @@
+"""
+Rechargement à chaud : un changement de results.csv publie un nouvel
+instantané complet, sans modifier celui que lisent encore les sessions.
+"""
+import os
+
+import pytest
+
+from utils.data_watcher import DataWatcher
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'results.csv')
+
+
+@pytest.fixture(scope='module')
+def results_lines():
+    with open(RESULTS_PATH, 'rb') as f:
+        return f.readlines()
+
+
+def test_change_publishes_new_snapshot(tmp_path, results_lines):
+    path = tmp_path / 'results.csv'
+    path.write_bytes(b''.join(results_lines[:6001]))
+    watcher = DataWatcher(data_dir=str(tmp_path), interval=0.01)
+    old = watcher.current()
+    old_matches, old_aggregates = len(old.france_data), dict(old.aggregates)
+    assert not watcher.check_now()
+
+    path.write_bytes(b''.join(results_lines))
+    assert watcher.check_now()
+    new = watcher.current()
+    assert new.version == old.version + 1
+    assert len(new.france_data) > old_matches
+    assert set(new.aggregates) == set(old_aggregates)
+
+    # L'instantané précédent reste entier pour les sessions qui le lisent encore
+    assert len(old.france_data) == old_matches
+    assert all(old.aggregates[name] is value for name, value in old_aggregates.items())
+    assert not watcher.check_now()
+
+
+def test_unreadable_results_keep_serving_data(tmp_path):
+    watcher = DataWatcher(data_dir=str(tmp_path), interval=0.01)
+    snapshot = watcher.current()
+    assert snapshot.perspective is None
+    assert len(snapshot.france_data) > 0
@@ -0,0 +1,53 @@
+"""
+Classement Elo : traiter l'historique en deux fois (mise à jour
+incrémentale) doit donner exactement les notes du calcul complet.
+"""
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from utils.data_processing import dashboard_data_for_team, load_team_perspective
+from utils.elo import EloRatings, match_rows
+
+
+@pytest.fixture(scope='module')
+def perspective():
+    return load_team_perspective(use_cache=False)
+
+
+@pytest.fixture(scope='module')
+def matches(perspective):
+    return match_rows(perspective.table)
+
+
+@pytest.mark.parametrize('split', [0, 1, 4000, 9000])
+def test_incremental_update_equals_full_history(perspective, matches, split):
+    full = EloRatings(matches)
+    updated = EloRatings(matches.iloc[:split]).update(matches)
+    assert updated is not None
+
+    pdt.assert_series_equal(updated.current().sort_index(), full.current().sort_index())
+    assert np.array_equal(updated.match_ids, full.match_ids)
+    assert np.array_equal(updated.home_change, full.home_change)
+    france = dashboard_data_for_team(perspective)
+    pdt.assert_frame_equal(updated.pre_match(france), full.pre_match(france))
+    pdt.assert_frame_equal(updated.team_series('france'), full.team_series('france'))
+
+
+def test_update_leaves_previous_ratings_untouched(matches):
+    previous = EloRatings(matches.iloc[:4000])
+    ratings = previous.current()
+    previous.update(matches)
+    pdt.assert_series_equal(previous.current(), ratings)
+    assert len(previous.match_ids) == 4000
+
+
+def test_changed_history_is_rejected(matches):
+    previous = EloRatings(matches.iloc[:4000])
+    edited = matches.copy()
+    edited.loc[edited.index[10], 'home_score'] += 1
+    assert previous.update(edited) is None
+    assert previous.update(matches.iloc[:3000]) is None
+    # Match ajouté antérieur au dernier match traité
+    assert previous.update(pd.concat([matches.iloc[:4000], matches.iloc[[0]]])) is None
@@ -0,0 +1,33 @@
+"""
+Cache des figures : une figure resservie est une copie reconstruite depuis le
+JSON mémorisé, que l'appelant peut modifier sans altérer le cache.
+"""
+import json
+
+import plotly.graph_objects as go
+
+from utils.figure_cache import FigureCache
+
+
+def build_figure():
+    return go.Figure(go.Bar(x=['A', 'B'], y=[1, 2]))
+
+
+def test_hit_returns_independent_copy():
+    cache = FigureCache()
+    first = cache.get_or_build('bar', build_figure)
+    first.update_layout(title='modifiée')
+
+    second = cache.get_or_build('bar', build_figure)
+    assert second is not first
+    assert json.loads(second.to_json()) == json.loads(build_figure().to_json())
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_size_bound_evicts_least_recent():
+    size = len(build_figure().to_json())
+    cache = FigureCache(max_bytes=2 * size)
+    for key in ['a', 'b', 'c']:
+        cache.get_or_build(key, build_figure)
+    assert list(cache.entries) == ['b', 'c']
+    assert cache.stats()['bytes'] == 2 * size
@@ -0,0 +1,18 @@
+"""
+La matrice des confrontations directes doit donner exactement les métriques
+des matchs filtrés contre chaque adversaire.
+"""
+from reference import counted, filter_rows, reference_metrics
+from utils.head_to_head import HeadToHead
+
+
+def test_head_to_head_matches_filtered_opponent(sample, filters):
+    index = HeadToHead(sample, score_column='france_score')
+    team = str(sample['team'].iloc[0])
+    opponents = sample['opponent'].cat.categories
+    for start_year, end_year, _ in filters[:100]:
+        rows = filter_rows(sample, start_year, end_year)
+        for opponent in opponents:
+            expected = reference_metrics(rows[rows['opponent'] == opponent])
+            assert counted(index.metrics(team, opponent, start_year, end_year)) == expected, \
+                (opponent, start_year, end_year)
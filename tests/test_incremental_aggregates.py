@@ -0,0 +1,87 @@
+"""
+Mises à jour incrémentales des agrégats additifs du surveillant de données :
+compléter l'agrégat de l'instantané précédent avec les matchs ajoutés en fin
+de results.csv doit donner le même agrégat qu'une reconstruction complète.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_cache import FEATHER_AVAILABLE
+from utils.data_watcher import AGGREGATE_BUILDERS, AGGREGATE_UPDATERS, build_snapshot
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'results.csv')
+ADDITIVE = ['period_index', 'olap_cube', 'team_periods']
+
+# Ajouts en fin de fichier : match ancien, nouvelle équipe et nouvelle compétition
+BACKDATED_LINES = [
+    b'1965-05-02,France,Atlantis,2,2,Coupe des Tests,Paris,France,FALSE\n',
+    b'2030-01-15,Atlantis,Germany,0,3,Friendly,Atlantis,Atlantis,TRUE\n'
+]
+
+pytestmark = pytest.mark.skipif(not FEATHER_AVAILABLE, reason="ajout incrémental indisponible sans pyarrow")
+
+
+@pytest.fixture(scope='module')
+def results_lines():
+    with open(RESULTS_PATH, 'rb') as f:
+        return f.readlines()
+
+
+def snapshots(tmp_path, before, after):
+    """
+    Instantané des lignes `before`, puis instantané des lignes `after` qui le complète
+    """
+    path = str(tmp_path / 'results.csv')
+    with open(path, 'wb') as f:
+        f.writelines(before)
+    previous = build_snapshot(path, version=1)
+    with open(path, 'wb') as f:
+        f.writelines(after)
+    return previous, build_snapshot(path, version=2, previous=previous)
+
+
+def assert_same_aggregate(updated, rebuilt):
+    assert type(updated) is type(rebuilt)
+    assert vars(updated).keys() == vars(rebuilt).keys()
+    for name, value in vars(rebuilt).items():
+        other = vars(updated)[name]
+        values = value.values() if isinstance(value, dict) else [value]
+        others = other.values() if isinstance(other, dict) else [other]
+        for expected, actual in zip(values, others):
+            if isinstance(expected, pd.Index):
+                assert actual.equals(expected), name
+            elif isinstance(expected, np.ndarray):
+                assert np.array_equal(actual, expected), name
+            else:
+                assert actual == expected, name
+
+
+@pytest.mark.parametrize('split', [6001, 8001])
+def test_appended_rows_update_equals_rebuild(tmp_path, results_lines, split):
+    previous, snapshot = snapshots(tmp_path, results_lines[:split], results_lines)
+    assert snapshot.appended_from is not None
+    for name in ADDITIVE:
+        updated = AGGREGATE_UPDATERS[name](previous.aggregates[name], snapshot, str(tmp_path))
+        assert updated is not None, name
+        assert_same_aggregate(updated, AGGREGATE_BUILDERS[name](snapshot, str(tmp_path)))
+        assert_same_aggregate(snapshot.aggregates[name], updated)
+
+
+def test_backdated_rows_with_new_labels(tmp_path, results_lines):
+    previous, snapshot = snapshots(tmp_path, results_lines, results_lines + BACKDATED_LINES)
+    assert snapshot.appended_from == len(results_lines) - 1
+    for name in ADDITIVE:
+        updated = AGGREGATE_UPDATERS[name](previous.aggregates[name], snapshot, str(tmp_path))
+        assert_same_aggregate(updated, AGGREGATE_BUILDERS[name](snapshot, str(tmp_path)))
+
+
+def test_modified_rows_rebuild(tmp_path, results_lines):
+    modified = list(results_lines)
+    modified[1] = modified[1].replace(b',2,1,', b',1,2,')
+    previous, snapshot = snapshots(tmp_path, results_lines, modified)
+    assert snapshot.appended_from is None
+    for name in ADDITIVE:
+        assert AGGREGATE_UPDATERS[name](previous.aggregates[name], snapshot, str(tmp_path)) is None
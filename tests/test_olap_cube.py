@@ -0,0 +1,20 @@
+"""
+Les agrégations du cube de compteurs doivent donner exactement les métriques
+d'un groupby sur les matchs filtrés.
+"""
+import pytest
+
+from reference import counted, filter_rows, reference_metrics
+from utils.olap_cube import MatchCube
+
+
+@pytest.mark.parametrize('by', ['year', 'month', 'tournament', 'opponent'])
+def test_cube_rollup_matches_groupby(sample, filters, by):
+    cube = MatchCube(sample)
+    for start_year, end_year, tournaments in filters[:50]:
+        rollup = cube.rollup(by, start_year, end_year, tournaments)
+        rows = filter_rows(sample, start_year, end_year, tournaments)
+        expected = {value: reference_metrics(group) for value, group in rows.groupby(by, observed=True)}
+        assert sorted(rollup.index.tolist()) == sorted(expected)
+        for value, metrics in expected.items():
+            assert counted(rollup.loc[value].to_dict()) == metrics, (by, value, start_year, end_year, tournaments)
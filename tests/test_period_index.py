@@ -0,0 +1,15 @@
+"""
+L'index des périodes (sommes cumulées par date et par année × compétition)
+doit donner exactement les métriques du filtrage des matchs suivi du calcul
+direct.
+"""
+from reference import counted, filter_rows, reference_metrics
+from utils.period_index import PeriodIndex
+
+
+def test_period_index_matches_filtered_metrics(sample, filters):
+    index = PeriodIndex(sample)
+    for start_year, end_year, tournaments in filters:
+        expected = reference_metrics(filter_rows(sample, start_year, end_year, tournaments))
+        assert counted(index.metrics(start_year, end_year, tournaments)) == expected, \
+            (start_year, end_year, tournaments)
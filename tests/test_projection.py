@@ -0,0 +1,49 @@
+"""
+Projection par simulation : résultats reproductibles pour une graine,
+identiques quel que soit le nombre de processus, bandes cohérentes.
+"""
+import numpy as np
+import pytest
+
+from utils.projection import BAND_PERCENTILES, CHUNK_SIZE, PoissonRates, project_season
+
+
+@pytest.fixture(scope='module')
+def rates(sample):
+    return PoissonRates(sample, score_column='france_score')
+
+
+@pytest.fixture(scope='module')
+def schedule(sample):
+    return sample.tail(20)
+
+
+def test_same_seed_same_projection(rates, schedule):
+    first = project_season(rates, 'france', schedule, 12, n_simulations=2000, seed=3)
+    second = project_season(rates, 'france', schedule, 12, n_simulations=2000, seed=3)
+    other = project_season(rates, 'france', schedule, 12, n_simulations=2000, seed=4)
+    assert np.array_equal(first['win_rates'], second['win_rates'])
+    assert np.array_equal(first['bands'], second['bands'])
+    assert not np.array_equal(first['win_rates'], other['win_rates'])
+
+
+def test_process_pool_matches_single_process(rates, schedule):
+    n_simulations = 2 * CHUNK_SIZE + 10
+    single = project_season(rates, 'france', schedule, 6, n_simulations=n_simulations, seed=1, processes=1)
+    pooled = project_season(rates, 'france', schedule, 6, n_simulations=n_simulations, seed=1, processes=2)
+    assert np.array_equal(single['win_rates'], pooled['win_rates'])
+    assert single['draw_rate'] == pooled['draw_rate']
+
+
+def test_rates_and_bands(rates, schedule):
+    checkpoints = [3, 6, 12]
+    projection = project_season(rates, 'france', schedule, 12, n_simulations=5000, seed=0,
+                                checkpoints=checkpoints)
+    assert projection['win_rates'].shape == (5000,)
+    total = projection['win_rates'].mean() + projection['draw_rate'] + projection['defeat_rate']
+    assert total == pytest.approx(100)
+
+    bands = projection['bands']
+    assert bands.shape == (len(checkpoints), len(BAND_PERCENTILES))
+    assert np.all(np.diff(bands, axis=1) >= 0)
+    assert bands[-1, BAND_PERCENTILES.index(50)] == pytest.approx(np.median(projection['win_rates']))
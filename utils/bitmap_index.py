@@ -0,0 +1,77 @@
+"""
+Index bitmap des filtres compétition et année
+
+Pour chaque compétition, un bitmap compacté (np.packbits, un bit par ligne)
+marque ses matchs dans la table France. Pour les années, un bitmap cumulé
+« année <= y » par année permet d'obtenir n'importe quelle plage en un ET et
+un ET NON. Une combinaison de filtres se réduit ainsi à quelques OU/ET sur
+des tableaux d'octets, et le masque obtenu est passé directement aux noyaux
+de calcul au lieu d'une copie filtrée de la table.
+"""
+import numpy as np
+
+
+def packed_bitmaps(codes, n_values):
+    """
+    Un bitmap compacté par valeur : ligne k = bits des lignes de code k
+    """
+    bitmaps = np.zeros((n_values, (len(codes) + 7) // 8), dtype=np.uint8)
+    positions = np.flatnonzero(codes >= 0)
+    # Même ordre de bits que np.packbits (bit de poids fort = première ligne)
+    bits = (0x80 >> (positions & 7)).astype(np.uint8)
+    np.bitwise_or.at(bitmaps, (codes[positions], positions >> 3), bits)
+    return bitmaps
+
+
+class BitmapIndex:
+    """
+    Bitmaps par compétition et par année d'une table du dashboard
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+
+        tournaments = df['tournament'].astype('category')
+        self.tournaments = tournaments.cat.categories
+        self.tournament_bitmaps = packed_bitmaps(tournaments.cat.codes.to_numpy(), len(self.tournaments))
+
+        # years_upto[i] : matchs des années <= first_year + i - 1 (ligne 0 : aucun)
+        years = df['year'].to_numpy().astype(np.int64)
+        self.first_year = int(years.min()) if len(years) else 0
+        n_years = int(years.max()) - self.first_year + 1 if len(years) else 0
+        by_year = packed_bitmaps(years - self.first_year, n_years)
+        self.years_upto = np.zeros((n_years + 1, by_year.shape[1]), dtype=np.uint8)
+        np.bitwise_or.accumulate(by_year, axis=0, out=self.years_upto[1:])
+
+    def _years_upto(self, year):
+        return self.years_upto[int(np.clip(year - self.first_year + 1, 0, len(self.years_upto) - 1))]
+
+    def year_bitmap(self, start_year, end_year):
+        """
+        Bitmap des matchs joués de start_year à end_year inclus
+        """
+        return self._years_upto(end_year) & ~self._years_upto(start_year - 1)
+
+    def tournament_bitmap(self, tournaments=None):
+        """
+        Bitmap des matchs des compétitions données (toutes si aucune)
+        """
+        if not tournaments:
+            return np.full(self.tournament_bitmaps.shape[1], 0xFF, dtype=np.uint8)
+        codes = self.tournaments.get_indexer(list(tournaments))
+        return np.bitwise_or.reduce(self.tournament_bitmaps[codes[codes >= 0]], axis=0,
+                                    initial=0).astype(np.uint8)
+
+    def mask(self, start_year, end_year, tournaments=None):
+        """
+        Masque booléen des lignes satisfaisant les filtres année et compétition
+        """
+        packed = self.year_bitmap(start_year, end_year) & self.tournament_bitmap(tournaments)
+        return np.unpackbits(packed, count=self.n_rows).astype(bool)
+
+
+def bitmap_index_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : bitmaps des filtres de la table France
+    """
+    return BitmapIndex(snapshot.france_data)
@@ -0,0 +1,94 @@
+"""
+Intervalles de confiance bootstrap des métriques principales
+
+Les matchs sont triés par groupe (adversaire, compétition... ou un seul
+groupe pour toute la période), puis une matrice d'indices (réplicats ×
+matchs) tire, pour chaque place d'un groupe, un match de ce même groupe. Les
+sommes par groupe et par réplicat s'obtiennent en un np.add.reduceat sur les
+segments contigus des groupes : tous les groupes sont rééchantillonnés dans
+le même appel. Les réplicats sont traités par blocs pour borner la mémoire.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.grouped_aggregation import dimension_codes
+from utils.metrics_kernel import frame_scores
+
+DEFAULT_REPLICATES = 2000
+DEFAULT_CONFIDENCE = 95
+# Taille maximale d'un bloc de la matrice d'indices (réplicats × matchs)
+MAX_BLOCK_CELLS = 4_000_000
+
+# Statistiques par match moyennées dans chaque groupe
+BOOTSTRAP_STATS = ['win_rate', 'avg_goals_scored', 'avg_goal_difference']
+
+
+def grouped_bootstrap(values, groups, n_groups, n_replicates=DEFAULT_REPLICATES, seed=0):
+    """
+    Moyennes bootstrap par groupe : values (matchs, statistiques), groups
+    (numéro de groupe de chaque match). Renvoie (réplicats, groupes, statistiques) ;
+    les groupes vides valent NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    order = np.argsort(groups, kind='stable')
+    values = values[order]
+    sizes = np.bincount(groups, minlength=n_groups)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    played = np.flatnonzero(sizes > 0)
+
+    # Pour chaque place : début et taille du segment de son groupe
+    slot_groups = np.repeat(np.arange(n_groups), sizes)
+    slot_offsets = offsets[slot_groups]
+    slot_sizes = sizes[slot_groups]
+
+    rng = np.random.default_rng(seed)
+    means = np.full((n_replicates, n_groups, values.shape[1]), np.nan)
+    block = max(1, MAX_BLOCK_CELLS // max(len(values), 1))
+    for start in range(0, n_replicates, block):
+        stop = min(start + block, n_replicates)
+        draws = rng.random((stop - start, len(values)))
+        indices = slot_offsets + (draws * slot_sizes).astype(np.intp)
+        sums = np.add.reduceat(values[indices], offsets[played], axis=1)
+        means[start:stop, played] = sums / sizes[played][None, :, None]
+    return means
+
+
+def bootstrap_intervals(df, by=None, n_replicates=DEFAULT_REPLICATES, confidence=DEFAULT_CONFIDENCE, seed=0):
+    """
+    Valeur et intervalle de confiance du taux de victoire, des buts marqués
+    par match et de la différence de buts par match, pour chaque valeur de
+    `by` (None : toute la table). Colonnes : matches, <stat>, <stat>_low,
+    <stat>_high ; groupes sans match omis.
+    """
+    team_score, opponent_score = frame_scores(df)
+    team_score = team_score.astype(np.float64)
+    opponent_score = opponent_score.astype(np.float64)
+    values = np.column_stack([
+        (team_score > opponent_score) * 100.0,
+        team_score,
+        team_score - opponent_score
+    ])
+
+    if by is None:
+        groups, labels = np.zeros(len(df), dtype=np.intp), pd.Index(['total'])
+    else:
+        codes, labels = dimension_codes(df[by])
+        known = codes >= 0
+        values, groups = values[known], codes[known].astype(np.intp)
+    n_groups = len(labels)
+
+    means = grouped_bootstrap(values, groups, n_groups, n_replicates, seed)
+    tail = (100 - confidence) / 2
+    sizes = np.bincount(groups, minlength=n_groups)
+    played = sizes > 0
+    totals = np.column_stack([np.bincount(groups, weights=values[:, s], minlength=n_groups)
+                              for s in range(values.shape[1])])
+    point = totals[played] / sizes[played][:, None]
+    low, high = np.percentile(means[:, played], [tail, 100 - tail], axis=0)
+
+    columns = {'matches': sizes[played]}
+    for s, stat in enumerate(BOOTSTRAP_STATS):
+        columns[stat] = point[:, s]
+        columns[f'{stat}_low'] = low[:, s]
+        columns[f'{stat}_high'] = high[:, s]
+    return pd.DataFrame(columns, index=pd.Index(labels[played], name=by))
@@ -0,0 +1,99 @@
+"""
+Lecture typée des fichiers CSV de données (results.csv, goalscorers.csv)
+
+Types explicites (aucune inférence), dates au format fixe, moteur pyarrow
+quand il est installé (multi-thread) et sélection des colonnes dès la lecture
+(`usecols`) : les colonnes non demandées ne sont jamais matérialisées.
+"""
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - moteur de lecture CSV optionnel de pandas
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DATE_FORMAT = '%Y-%m-%d'
+
+# Types logiques des colonnes (ceux produits par le moteur pyarrow)
+RESULTS_DTYPES = {
+    'date': 'datetime64[s]',
+    'home_team': str,
+    'away_team': str,
+    'home_score': 'Int16',
+    'away_score': 'Int16',
+    'tournament': 'category',
+    'city': 'category',
+    'country': 'category',
+    'neutral': 'boolean'
+}
+RESULTS_COLUMNS = list(RESULTS_DTYPES)
+
+# Colonnes utilisées par les pages du dashboard (ni ville ni pays)
+DASHBOARD_COLUMNS = [column for column in RESULTS_COLUMNS if column not in ('city', 'country')]
+
+# Équivalents rapides pour le moteur C, où les types nullables et les dates
+# coûtent cher à la lecture : flottants (NaN) pour les scores, booléens via
+# true/false_values, dates lues en texte puis converties au format fixe
+C_ENGINE_DTYPES = {
+    'datetime64[s]': str,
+    'Int16': 'float32',
+    'boolean': None
+}
+
+BOOL_VALUES = {
+    'true_values': ['TRUE', 'True', 'true'],
+    'false_values': ['FALSE', 'False', 'false']
+}
+
+
+def csv_engine(engine=None):
+    """
+    Moteur de lecture : celui demandé, sinon pyarrow s'il est installé, sinon le moteur C
+    """
+    if engine is not None:
+        return engine
+    return 'pyarrow' if PYARROW_AVAILABLE else 'c'
+
+
+def read_typed_csv(source, dtypes, usecols=None, engine=None, names=None):
+    """
+    Lit un CSV avec des types explicites en ne gardant que `usecols`.
+    `names` sert aux fragments sans en-tête (lignes ajoutées en fin de fichier) ;
+    ils sont petits et lus par le moteur C, que pyarrow ne remplace pas dans ce cas.
+    """
+    usecols = list(usecols or dtypes)
+    engine = 'c' if names is not None else csv_engine(engine)
+    read_dtypes = {column: dtypes[column] for column in usecols}
+    if engine != 'pyarrow':
+        read_dtypes = {column: C_ENGINE_DTYPES.get(dtype, dtype) for column, dtype in read_dtypes.items()}
+    options = {
+        'usecols': usecols,
+        'dtype': {column: dtype for column, dtype in read_dtypes.items() if dtype is not None},
+        **BOOL_VALUES
+    }
+    
+    if names is not None:
+        df = pd.read_csv(source, header=None, names=names, engine=engine, **options)
+    else:
+        df = pd.read_csv(source, engine=engine, **options)
+    
+    # Dates lues en texte par le moteur C : conversion au format fixe
+    for column in usecols:
+        if dtypes[column] == 'datetime64[s]' and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = parse_dates(df[column])
+    return df
+
+
+def read_results_csv(source, usecols=None, engine=None, names=None):
+    """
+    Lit results.csv (ou un fragment) avec les types de RESULTS_DTYPES
+    """
+    return read_typed_csv(source, RESULTS_DTYPES, usecols=usecols, engine=engine, names=names)
+
+
+def parse_dates(dates):
+    """
+    Conversion des dates au format fixe AAAA-MM-JJ (pas de détection de format)
+    """
+    return pd.to_datetime(dates, format=DATE_FORMAT)
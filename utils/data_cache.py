@@ -0,0 +1,248 @@
+"""
+Cache binaire persistant des tables traitées (format Feather)
+
+La table produite par le pipeline est écrite à côté du fichier source, dans
+un dossier `.cache/`, avec un fichier de métadonnées décrivant la source
+(taille, date de modification, empreinte du contenu). Au démarrage suivant,
+la table est relue directement tant que la source n'a pas changé.
+
+Si la source a seulement grandi par ajout de lignes en fin de fichier, seule
+la nouvelle fin est analysée et ajoutée à la table en cache (mode incrémental).
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - requis par pandas pour le format Feather
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+    print("pyarrow n'est pas installé : cache Feather désactivé, les tables seront "
+          "reconstruites à chaque démarrage (pip install -r requirements.txt)")
+
+# À incrémenter dès que le pipeline change la forme de la table produite
+CACHE_FORMAT_VERSION = 4
+CACHE_DIRNAME = '.cache'
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Empreinte BLAKE2 du contenu d'un fichier
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_signature(path):
+    """
+    Signature rapide d'un fichier source (taille et date de modification)
+    """
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def describe_content(content):
+    """
+    Métadonnées décrivant un contenu CSV lu en mémoire : empreinte, en-tête
+    et nombre de lignes de données
+    """
+    header_end = content.find(b'\n')
+    header = content[:header_end if header_end >= 0 else len(content)].decode('utf-8').rstrip('\r')
+    newlines = content.count(b'\n')
+    ends_with_newline = content.endswith(b'\n')
+    return {
+        'size': len(content),
+        'digest': _digest(content),
+        'header': header,
+        'source_rows': max(newlines - 1 + (0 if ends_with_newline else 1), 0),
+        'appendable': ends_with_newline
+    }
+
+
+def cache_paths(source_path, name):
+    """
+    Chemins du fichier de données et des métadonnées du cache
+    """
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(source_path)), CACHE_DIRNAME)
+    return os.path.join(cache_dir, f'{name}.feather'), os.path.join(cache_dir, f'{name}.json')
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    """
+    Écrit via un fichier temporaire puis renommage, pour qu'un autre
+    processus ne lise jamais un fichier à moitié écrit
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_meta(meta_path, meta):
+    def write(p):
+        with open(p, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    _write_atomic(meta_path, write)
+
+
+def is_cache_valid(meta, source_path, signature):
+    """
+    Vérifie que les métadonnées du cache correspondent toujours à la source.
+    Si seule la date de modification diffère (nouvelle copie du fichier sur
+    un autre serveur), l'empreinte du contenu tranche.
+    """
+    if meta is None or meta.get('version') != CACHE_FORMAT_VERSION:
+        return False
+    if meta.get('size') != signature['size']:
+        return False
+    if meta.get('mtime_ns') == signature['mtime_ns']:
+        return True
+    return meta.get('digest') == file_digest(source_path)
+
+
+def range_digest(path, start, end, chunk_size=1 << 20):
+    """
+    Empreinte BLAKE2 des octets [start, end) d'un fichier
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def read_appended_tail(meta, source_path):
+    """
+    Retourne les octets ajoutés depuis la mise en cache si la source n'a fait
+    que grandir, sinon None. Le début du fichier est vérifié par son empreinte :
+    un hachage est bien moins coûteux que l'analyse CSV qu'il évite.
+    """
+    if meta is None or meta.get('version') != CACHE_FORMAT_VERSION or not meta.get('appendable'):
+        return None
+    
+    offset = meta['size']
+    if os.path.getsize(source_path) <= offset or range_digest(source_path, 0, offset) != meta['digest']:
+        return None
+    
+    with open(source_path, 'rb') as f:
+        f.seek(offset)
+        tail = f.read()
+    return tail or None
+
+
+def header_columns(header):
+    """
+    Noms de colonnes d'une ligne d'en-tête CSV
+    """
+    return next(csv.reader([header]))
+
+
+def load_cached_table(source_path, builder, name=None, appender=None):
+    """
+    Retourne la table construite par `builder(source)`, en la relisant depuis
+    le cache binaire si la source n'a pas changé depuis sa création.
+    
+    Si `appender(table, tail, first_row, columns)` est fourni et que la source
+    a seulement grandi, seules les lignes ajoutées sont traitées.
+    """
+    if not FEATHER_AVAILABLE:
+        return builder(source_path)
+    
+    name = name or os.path.splitext(os.path.basename(source_path))[0]
+    data_path, meta_path = cache_paths(source_path, name)
+    signature = source_signature(source_path)
+    meta = _read_meta(meta_path)
+    cached = None
+    
+    if os.path.exists(data_path) and meta is not None:
+        try:
+            cached = pd.read_feather(data_path)
+        except (OSError, ValueError) as e:
+            print(f"Cache illisible ({data_path}), reconstruction : {e}")
+    
+    if cached is not None and is_cache_valid(meta, source_path, signature):
+        if meta['mtime_ns'] != signature['mtime_ns']:
+            _write_meta(meta_path, dict(meta, **signature))
+        return cached
+    
+    if cached is not None and appender is not None:
+        tail = read_appended_tail(meta, source_path)
+        if tail is not None:
+            table = appender(cached, tail, meta['source_rows'], header_columns(meta['header']))
+            save_cached_table(table, source_path, name, appended_meta(meta, tail, source_path, signature, table))
+            return table
+    
+    # Reconstruction complète, à partir d'une seule lecture du fichier pour que
+    # les métadonnées décrivent exactement les octets analysés
+    with open(source_path, 'rb') as f:
+        content = f.read()
+    table = builder(io.BytesIO(content))
+    meta = dict(
+        describe_content(content),
+        mtime_ns=signature['mtime_ns'],
+        version=CACHE_FORMAT_VERSION,
+        rows=len(table)
+    )
+    save_cached_table(table, source_path, name, meta)
+    return table
+
+
+def appended_meta(meta, tail, source_path, signature, table):
+    """
+    Métadonnées après ajout de `tail` : seuls les octets effectivement
+    analysés sont décrits, même si le fichier a encore grandi depuis
+    """
+    size = meta['size'] + len(tail)
+    return dict(
+        meta,
+        size=size,
+        mtime_ns=signature['mtime_ns'],
+        digest=range_digest(source_path, 0, size),
+        source_rows=meta['source_rows'] + tail.count(b'\n') + (0 if tail.endswith(b'\n') else 1),
+        appendable=tail.endswith(b'\n'),
+        rows=len(table)
+    )
+
+
+def save_cached_table(table, source_path, name, meta):
+    """
+    Écrit la table et ses métadonnées ; un échec d'écriture (disque en
+    lecture seule, etc.) n'empêche pas l'application de fonctionner
+    """
+    data_path, meta_path = cache_paths(source_path, name)
+    
+    try:
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        _write_atomic(data_path, lambda p: table.reset_index(drop=True).to_feather(p))
+        _write_meta(meta_path, meta)
+    except (OSError, ValueError) as e:
+        print(f"Impossible d'écrire le cache {data_path} : {e}")
@@ -1,237 +1,211 @@
+import io
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from utils.csv_reader import DASHBOARD_COLUMNS, parse_dates, read_results_csv
+from utils.data_cache import load_cached_table
+from utils.grouped_aggregation import grouped_metrics
+from utils.metrics_kernel import frame_scores, match_counters, metrics_from_counters
+from utils.rolling import RollingStats
+from utils.synthetic_data import iter_synthetic_chunks
+from utils.team_perspective import (
+    WIN, TeamPerspective, append_to_team_perspective, build_team_perspective,
+    day_to_date, result_codes
+)
 
-def load_and_process_data():
+# Données d'exemple : la France face à des adversaires et compétitions réalistes
+SAMPLE_MATCHES = 300
+SAMPLE_TEAMS = ['France', 'Germany', 'USA', 'Brazil', 'England', 'Sweden', 'Netherlands', 'Norway',
+                'Spain', 'Italy', 'Australia']
+SAMPLE_TOURNAMENTS = ['FIFA World Cup', 'UEFA European Championship', 'Friendly', 'SheBelieves Cup',
+                      'Algarve Cup']
+
+def load_and_process_data(path='data/results.csv', use_cache=True, team='france'):
     """
-    Charge et traite les données de l'équipe de France féminine
+    Charge et traite les données de l'équipe de France féminine.
+    La vue France est un découpage de la table point de vue équipe (toutes équipes),
+    elle-même relue depuis le cache binaire tant que le CSV source n'a pas changé.
     """
     try:
-        # Chargement du dataset principal
-        df = pd.read_csv('data/results.csv')
-        
-        # Vérification de la structure des données
-        required_columns = ['date', 'home_team', 'away_team', 'home_score', 'away_score', 
-                          'tournament', 'city', 'country', 'neutral']
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            print(f"Colonnes manquantes dans le fichier: {missing_columns}")
-            return generate_sample_data()
-        
-        # Nettoyage et normalisation des données
-        df['home_team'] = df['home_team'].str.lower().str.strip()
-        df['away_team'] = df['away_team'].str.lower().str.strip()
-        
-        # Filtrage pour l'équipe de France (en minuscules)
-        france_matches = df[
-            (df['home_team'] == 'france') | 
-            (df['away_team'] == 'france')
-        ].copy()
-        
-        if len(france_matches) == 0:
-            print("Aucun match de l'équipe de France trouvé dans les données. Utilisation des données d'exemple.")
-            return generate_sample_data()
-        
-        # Conversion de la date
-        france_matches['date'] = pd.to_datetime(france_matches['date'])
-        france_matches['year'] = france_matches['date'].dt.year
-        france_matches['month'] = france_matches['date'].dt.month
-        
-        # Gestion des valeurs manquantes pour les scores
-        france_matches = france_matches.dropna(subset=['home_score', 'away_score'])
-        
-        # Conversion des scores en entiers
-        france_matches['home_score'] = france_matches['home_score'].astype(int)
-        france_matches['away_score'] = france_matches['away_score'].astype(int)
-        
-        # Détermination si la France joue à domicile ou à l'extérieur
-        france_matches['is_home'] = france_matches['home_team'] == 'france'
-        
-        # Calcul des scores France avec la méthode apply (plus robuste)
-        france_matches['france_score'] = france_matches.apply(
-            lambda row: row['home_score'] if row['home_team'] == 'france' else row['away_score'], 
-            axis=1
-        )
-        france_matches['opponent_score'] = france_matches.apply(
-            lambda row: row['away_score'] if row['home_team'] == 'france' else row['home_score'], 
-            axis=1
-        )
-        
-        # Détermination de l'adversaire
-        france_matches['opponent'] = france_matches.apply(
-            lambda row: row['away_team'] if row['home_team'] == 'france' else row['home_team'], 
-            axis=1
-        )
-        
-        # Calcul du résultat
-        france_matches['result'] = france_matches.apply(
-            lambda row: 'Victoire' if row['france_score'] > row['opponent_score'] 
-                       else 'Défaite' if row['france_score'] < row['opponent_score'] 
-                       else 'Nul', 
-            axis=1
-        )
-        
-        # Calcul de l'écart de buts
-        france_matches['goal_difference'] = france_matches['france_score'] - france_matches['opponent_score']
-        
-        # Nettoyage des types de compétition
-        france_matches['tournament'] = france_matches['tournament'].fillna('Amical')
-        
-        return france_matches
-        
+        perspective = load_team_perspective(path, use_cache)
     except FileNotFoundError:
         # Génération de données d'exemple si le fichier n'existe pas
         return generate_sample_data()
+    except ValueError as e:
+        print(e)
+        return generate_sample_data()
+    
+    return dashboard_data_for_team(perspective, team)
 
-def generate_sample_data():
+def dashboard_data_for_team(perspective, team='france'):
+    """
+    Table des pages pour une équipe, découpée dans la table point de vue équipe
+    """
+    team_matches = perspective.team_view(team)
+    if len(team_matches) == 0:
+        print("Aucun match de l'équipe de France trouvé dans les données. Utilisation des données d'exemple.")
+        return generate_sample_data()
+    
+    return to_dashboard_frame(team_matches)
+
+def to_dashboard_frame(team_matches):
+    """
+    Vue d'une équipe -> table attendue par les pages (colonne 'date' et score 'france_score')
+    """
+    frame = team_matches.rename(columns={'team_score': 'france_score'}).reset_index(drop=True)
+    frame.insert(0, 'date', day_to_date(frame['day'].to_numpy()))
+    return frame
+
+def load_team_perspective(path='data/results.csv', use_cache=True, columns=DASHBOARD_COLUMNS):
+    """
+    Charge la table point de vue équipe (tous les matchs, vus de chaque côté).
+    Seules les colonnes `columns` de results.csv sont lues (ville et pays
+    ne sont pas utilisés par les pages et ne sont lus que sur demande).
+    """
+    def build(source_path):
+        return build_team_perspective(process_results_file(source_path, columns))
+    
+    def append(table, csv_tail, first_row, header):
+        return append_results_tail(table, csv_tail, first_row, header, columns)
+    
+    if use_cache:
+        # Une entrée de cache par jeu de colonnes optionnelles
+        extra = [column for column in columns if column not in DASHBOARD_COLUMNS]
+        name = '+'.join(['team_perspective'] + extra)
+        table = load_cached_table(path, build, name=name, appender=append)
+    else:
+        table = build(path)
+    return TeamPerspective(table)
+
+def process_results_file(path, columns=None):
+    """
+    Pipeline CSV -> table des matchs (une ligne par match, toutes équipes)
+    """
+    # Chargement du dataset principal (types explicites, colonnes utiles uniquement)
+    return process_results_frame(read_results_csv(path, usecols=columns))
+
+def append_results_tail(table, csv_tail, first_row, header, columns=None):
+    """
+    Mode incrémental : traite uniquement les lignes ajoutées en fin de
+    results.csv et les insère dans la table point de vue équipe en cache
     """
-    Génère des données d'exemple pour les tests
-    """
-    np.random.seed(42)
-    
-    # Listes d'adversaires et de compétitions réalistes
-    opponents = ['Germany', 'USA', 'Brazil', 'England', 'Sweden', 'Netherlands', 'Norway', 'Spain', 'Italy', 'Australia']
-    tournaments = ['FIFA World Cup', 'UEFA European Championship', 'Friendly', 'SheBelieves Cup', 'Algarve Cup']
-    
-    # Génération de 300 matchs sur 20 ans
-    dates = pd.date_range(start='2004-01-01', end='2024-01-01', freq='2W')[:300]
-    
-    data = []
-    for i, date in enumerate(dates):
-        is_home = np.random.choice([True, False])
-        opponent = np.random.choice(opponents)
-        tournament = np.random.choice(tournaments)
-        
-        # Simulation des scores avec une tendance réaliste
-        if is_home:
-            france_score = np.random.poisson(1.8)  # Légèrement plus de buts à domicile
-            opponent_score = np.random.poisson(1.2)
-        else:
-            france_score = np.random.poisson(1.5)
-            opponent_score = np.random.poisson(1.4)
-        
-        data.append({
-            'date': date,
-            'home_team': 'France' if is_home else opponent,
-            'away_team': opponent if is_home else 'France',
-            'home_score': france_score if is_home else opponent_score,
-            'away_score': opponent_score if is_home else france_score,
-            'tournament': tournament,
-            'city': 'Paris' if is_home else 'Various',
-            'country': 'France' if is_home else 'Various',
-            'neutral': False
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Application du même traitement que pour les vraies données
-    df['date'] = pd.to_datetime(df['date'])
+    new_rows = read_results_csv(io.BytesIO(csv_tail), usecols=columns, names=header)
+    matches = process_results_frame(new_rows, first_row=first_row)
+    return append_to_team_perspective(table, matches)
+
+def process_results_frame(df, first_row=0):
+    """
+    Nettoyage et colonnes dérivées d'un lot de lignes de results.csv
+    """
+    # Vérification de la structure des données
+    required_columns = DASHBOARD_COLUMNS
+    
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Colonnes manquantes dans le fichier: {missing_columns}")
+    
+    # Identifiant stable du match : sa position dans le fichier source
+    df['match_id'] = np.arange(first_row, first_row + len(df), dtype=np.int32)
+    
+    # Nettoyage et normalisation des données
+    df['home_team'] = df['home_team'].str.lower().str.strip()
+    df['away_team'] = df['away_team'].str.lower().str.strip()
+    
+    # Conversion de la date (déjà faite par le lecteur typé, sinon format fixe AAAA-MM-JJ)
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = parse_dates(df['date'])
     df['year'] = df['date'].dt.year
     df['month'] = df['date'].dt.month
     
-    df['is_home'] = df['home_team'] == 'France'
-    
-    df['france_score'] = np.where(df['is_home'], df['home_score'], df['away_score'])
-    df['opponent_score'] = np.where(df['is_home'], df['away_score'], df['home_score'])
-    df['opponent'] = np.where(df['is_home'], df['away_team'], df['home_team'])
+    # Gestion des valeurs manquantes pour les scores
+    df = df.dropna(subset=['home_score', 'away_score'])
     
-    df['result'] = np.where(
-        df['france_score'] > df['opponent_score'], 'Victoire',
-        np.where(df['france_score'] < df['opponent_score'], 'Défaite', 'Nul')
-    )
+    # Conversion des scores en entiers
+    df['home_score'] = df['home_score'].astype(np.int16)
+    df['away_score'] = df['away_score'].astype(np.int16)
     
-    df['goal_difference'] = df['france_score'] - df['opponent_score']
+    # Nettoyage des types de compétition
+    tournaments = df['tournament']
+    if tournaments.isna().any():
+        if isinstance(tournaments.dtype, pd.CategoricalDtype) and 'Amical' not in tournaments.cat.categories:
+            tournaments = tournaments.cat.add_categories(['Amical'])
+        df['tournament'] = tournaments.fillna('Amical')
+    df['neutral'] = df['neutral'].fillna(False).astype(bool)
     
     return df
 
-def calculate_performance_metrics(df, period=None):
+def generate_sample_data():
+    """
+    Génère des données d'exemple pour les tests : 300 matchs de la France
+    tirés par le générateur de utils.synthetic_data, puis traités comme les
+    lignes de results.csv
+    """
+    matches, _ = next(iter_synthetic_chunks(
+        SAMPLE_MATCHES, teams=SAMPLE_TEAMS, tournaments=SAMPLE_TOURNAMENTS, seed=42,
+        start='2004-01-01', end='2016-01-01', focus_team='France', with_goalscorers=False
+    ))
+    # Le générateur écrit les booléens comme le CSV ('TRUE' / 'FALSE')
+    matches['neutral'] = matches['neutral'] == 'TRUE'
+    
+    perspective = TeamPerspective(build_team_perspective(process_results_frame(matches)))
+    return to_dashboard_frame(perspective.team_view('france'))
+
+def calculate_performance_metrics(df, period=None, mask=None):
     """
     Calcule les métriques de performance clés
+    (une passe sur les scores, voir utils.metrics_kernel ; mask : masque
+    booléen des lignes à retenir, par exemple issu de l'index bitmap)
     """
     if period:
-        df = df[df['year'].between(period[0], period[1])]
-    
-    total_matches = len(df)
-    if total_matches == 0:
-        return {}
-    
-    victories = len(df[df['result'] == 'Victoire'])
-    defeats = len(df[df['result'] == 'Défaite'])
-    draws = len(df[df['result'] == 'Nul'])
-    
-    metrics = {
-        'total_matches': total_matches,
-        'victories': victories,
-        'defeats': defeats,
-        'draws': draws,
-        'win_rate': (victories / total_matches) * 100,
-        'defeat_rate': (defeats / total_matches) * 100,
-        'draw_rate': (draws / total_matches) * 100,
-        'goals_scored': df['france_score'].sum(),
-        'goals_conceded': df['opponent_score'].sum(),
-        'avg_goals_scored': df['france_score'].mean(),
-        'avg_goals_conceded': df['opponent_score'].mean(),
-        'goal_difference_total': df['goal_difference'].sum(),
-        'avg_goal_difference': df['goal_difference'].mean(),
-        'clean_sheets': len(df[df['opponent_score'] == 0]),
-        'big_wins': len(df[df['goal_difference'] >= 3]),  # Victoires par 3+ buts
-        'narrow_wins': len(df[(df['result'] == 'Victoire') & (df['goal_difference'] == 1)]),
-        'heavy_defeats': len(df[df['goal_difference'] <= -3])  # Défaites par 3+ buts
-    }
-    
-    return metrics
+        df = filter_data_by_period(df, period[0], period[1])
+    
+    return metrics_from_counters(match_counters(*frame_scores(df), mask=mask))
 
 def filter_data_by_period(df, start_year, end_year):
     """
     Filtre les données par période
     """
-    return df[df['year'].between(start_year, end_year)]
+    year = df['year'].to_numpy()
+    return df[(year >= start_year) & (year <= end_year)]
 
-def calculate_home_advantage(df):
+def calculate_home_advantage(df, mask=None):
     """
     Calcule l'avantage du terrain
+    (mask : masque booléen des lignes à retenir, appliqué aux tableaux sans copier la table)
     """
-    home_matches = df[df['is_home'] == True]
-    away_matches = df[df['is_home'] == False]
+    is_home = df['is_home'].to_numpy()
+    wins = result_codes(df) == WIN
+    if mask is not None:
+        is_home, wins = is_home[mask], wins[mask]
     
-    if len(home_matches) == 0 or len(away_matches) == 0:
+    home_matches = np.count_nonzero(is_home)
+    away_matches = len(is_home) - home_matches
+    
+    if home_matches == 0 or away_matches == 0:
         return 0
     
-    home_win_rate = len(home_matches[home_matches['result'] == 'Victoire']) / len(home_matches)
-    away_win_rate = len(away_matches[away_matches['result'] == 'Victoire']) / len(away_matches)
+    home_win_rate = np.count_nonzero(wins & is_home) / home_matches
+    away_win_rate = np.count_nonzero(wins & ~is_home) / away_matches
     
     return (home_win_rate - away_win_rate) * 100
 
 def get_performance_by_opponent(df, min_matches=3):
     """
     Analyse les performances contre chaque adversaire
+    (tous les adversaires en une passe, voir utils.grouped_aggregation)
     """
-    opponent_stats = []
-    
-    for opponent in df['opponent'].unique():
-        opp_matches = df[df['opponent'] == opponent]
-        
-        if len(opp_matches) >= min_matches:
-            metrics = calculate_performance_metrics(opp_matches)
-            metrics['opponent'] = opponent
-            metrics['matches_played'] = len(opp_matches)
-            opponent_stats.append(metrics)
-    
-    return pd.DataFrame(opponent_stats).sort_values('matches_played', ascending=False)
+    opponent_stats = grouped_metrics(df, 'opponent')
+    opponent_stats = opponent_stats[opponent_stats['total_matches'] >= min_matches]
+    
+    opponent_stats = opponent_stats.assign(
+        opponent=opponent_stats.index,
+        matches_played=opponent_stats['total_matches']
+    ).reset_index(drop=True)
+    return opponent_stats.sort_values('matches_played', ascending=False, kind='stable')
 
 def calculate_trend_metrics(df, window=10):
     """
     Calcule les métriques de tendance avec moyenne mobile
+    (un tri et un cumul, voir utils.rolling pour plusieurs fenêtres à la fois)
     """
-    df_sorted = df.sort_values('date').copy()
-    
-    # Conversion du résultat en points (3 victoire, 1 nul, 0 défaite)
-    df_sorted['points'] = df_sorted['result'].map({'Victoire': 3, 'Nul': 1, 'Défaite': 0})
-    
-    # Moyennes mobiles
-    df_sorted['rolling_points'] = df_sorted['points'].rolling(window=window, min_periods=1).mean()
-    df_sorted['rolling_goals_scored'] = df_sorted['france_score'].rolling(window=window, min_periods=1).mean()
-    df_sorted['rolling_goals_conceded'] = df_sorted['opponent_score'].rolling(window=window, min_periods=1).mean()
-    
-    return df_sorted
+    return RollingStats(df).trend_frame([window])
@@ -0,0 +1,167 @@
+"""
+Rechargement à chaud des données en arrière-plan
+
+Un thread surveille les fichiers `data/*.csv`. Lorsqu'un fichier change, la
+table point de vue équipe, la table France et les agrégats enregistrés sont
+reconstruits hors du chemin des requêtes, puis publiés d'un seul coup : les
+sessions lisent toujours un instantané complet, l'ancien ou le nouveau.
+
+Quand results.csv n'a reçu que des lignes en fin de fichier, l'instantané
+note le premier match ajouté (appended_from) et les agrégats qui ont une
+mise à jour incrémentale ne traitent que ces matchs.
+"""
+import glob
+import os
+import threading
+import time
+from collections import namedtuple
+
+from utils.data_processing import dashboard_data_for_team, generate_sample_data, load_team_perspective
+from utils.team_perspective import first_appended_match
+from utils.bitmap_index import bitmap_index_aggregate
+from utils.elo import elo_aggregate, elo_update
+from utils.goalscorers import goalscorer_aggregate
+from utils.head_to_head import head_to_head_aggregate
+from utils.international_benchmarks import team_period_aggregate, team_period_update
+from utils.olap_cube import cube_aggregate, cube_update
+from utils.period_index import period_index_aggregate, period_index_update
+from utils.projection import poisson_rates_aggregate
+
+DataSnapshot = namedtuple('DataSnapshot', ['version', 'perspective', 'france_data', 'aggregates', 'built_at',
+                                           'appended_from'])
+
+# Agrégats précalculés à chaque nouvelle version : nom -> fonction(snapshot, data_dir) -> valeur
+AGGREGATE_BUILDERS = {}
+# Mises à jour incrémentales : nom -> fonction(précédent, snapshot, data_dir) -> valeur ou None
+AGGREGATE_UPDATERS = {}
+
+
+def register_aggregate(name, builder, updater=None):
+    """
+    Déclare un agrégat à reconstruire avec chaque nouvelle version des données.
+    `updater` met à jour la valeur de la version précédente (None : reconstruire).
+    """
+    AGGREGATE_BUILDERS[name] = builder
+    if updater is not None:
+        AGGREGATE_UPDATERS[name] = updater
+
+
+register_aggregate('goalscorers', goalscorer_aggregate)
+register_aggregate('period_index', period_index_aggregate, period_index_update)
+register_aggregate('bitmap_index', bitmap_index_aggregate)
+register_aggregate('olap_cube', cube_aggregate, cube_update)
+register_aggregate('elo', elo_aggregate, elo_update)
+register_aggregate('head_to_head', head_to_head_aggregate)
+register_aggregate('poisson_rates', poisson_rates_aggregate)
+register_aggregate('team_periods', team_period_aggregate, team_period_update)
+
+
+def build_snapshot(results_path, version, team='france', previous=None):
+    """
+    Construit un instantané complet des données (appelé hors requêtes).
+    Les agrégats incrémentaux partent de ceux de l'instantané `previous`.
+    """
+    try:
+        perspective = load_team_perspective(results_path)
+        france_data = dashboard_data_for_team(perspective, team)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Données indisponibles ({e}), utilisation des données d'exemple")
+        perspective = None
+        france_data = generate_sample_data()
+    
+    # Premier match ajouté depuis l'instantané précédent (None : tout a pu changer)
+    appended_from = None
+    if previous is not None and previous.perspective is not None and perspective is not None:
+        appended_from = first_appended_match(previous.perspective.table, perspective.table)
+        # La table France précédente doit être celle des matchs déjà connus (pas les données d'exemple)
+        if appended_from is not None and \
+                (france_data['match_id'].to_numpy() < appended_from).sum() != len(previous.france_data):
+            appended_from = None
+    
+    snapshot = DataSnapshot(version, perspective, france_data, {}, time.time(), appended_from)
+    data_dir = os.path.dirname(results_path)
+    for name, builder in AGGREGATE_BUILDERS.items():
+        value = None
+        if previous is not None and name in AGGREGATE_UPDATERS and previous.aggregates.get(name) is not None:
+            value = AGGREGATE_UPDATERS[name](previous.aggregates[name], snapshot, data_dir)
+        snapshot.aggregates[name] = value if value is not None else builder(snapshot, data_dir)
+    return snapshot
+
+
+class DataWatcher:
+    """
+    Surveille un dossier de CSV et publie un nouvel instantané à chaque changement
+    """
+    
+    def __init__(self, data_dir='data', pattern='*.csv', results_file='results.csv', interval=2.0):
+        self.data_dir = data_dir
+        self.pattern = pattern
+        self.results_path = os.path.join(data_dir, results_file)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._signatures = self._scan()
+        # Construction initiale synchrone : la première requête a besoin des données
+        self._snapshot = build_snapshot(self.results_path, version=1)
+    
+    def _scan(self):
+        signatures = {}
+        for path in sorted(glob.glob(os.path.join(self.data_dir, self.pattern))):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signatures[path] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+    
+    def current(self):
+        """
+        Instantané courant ; la lecture d'un attribut est atomique, aucun verrou nécessaire
+        """
+        return self._snapshot
+    
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='data-watcher', daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+    
+    def check_now(self):
+        """
+        Reconstruit et publie un nouvel instantané si un fichier a changé.
+        On attend que la signature soit stable sur deux relevés pour ne pas
+        lire un fichier en cours d'écriture.
+        """
+        signatures = self._scan()
+        if signatures == self._signatures:
+            return False
+        
+        time.sleep(min(self.interval, 0.5))
+        if self._scan() != signatures:
+            return False
+        
+        try:
+            snapshot = build_snapshot(self.results_path, version=self._snapshot.version + 1,
+                                      previous=self._snapshot)
+        except Exception as e:
+            # On garde l'instantané courant, nouvel essai au prochain relevé
+            print(f"Échec du rechargement des données : {e}")
+            return False
+        
+        self._signatures = signatures
+        self._snapshot = snapshot
+        return True
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check_now()
+
+
+def start_data_watcher(data_dir='data', interval=2.0):
+    """
+    Crée le surveillant, charge les données et lance le thread de surveillance
+    """
+    return DataWatcher(data_dir=data_dir, interval=interval).start()
@@ -0,0 +1,298 @@
+"""
+Classement Elo de toutes les équipes sur l'historique complet
+
+Les matchs de results.csv sont parcourus une fois dans l'ordre chronologique.
+L'état du moteur est un seul tableau de notes indexé par code d'équipe ; pour
+chaque match on conserve les notes d'avant-match et la variation, ce qui
+donne la série de notes de n'importe quelle équipe et les notes d'avant-match
+de chaque rencontre de la table France (métriques ajustées à la force des
+adversaires). Les matchs ajoutés en fin de fichier sont traités à la suite,
+sans rejouer l'historique.
+
+Formule inspirée de eloratings.net : avantage du terrain de 100 points,
+coefficient K selon l'importance de la compétition, multiplié selon l'écart
+de buts.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+
+from utils.team_perspective import day_to_date, result_codes
+
+INITIAL_RATING = 1500.0
+HOME_ADVANTAGE = 100.0
+
+# Coefficient K selon la compétition (les autres tournois valent K_DEFAULT)
+K_WORLD_CUP = 60
+K_MAJOR = 50
+K_QUALIFICATION = 40
+K_DEFAULT = 30
+K_FRIENDLY = 20
+MAJOR_TOURNAMENTS = {'Olympic Games', 'UEFA Euro', 'Copa América', 'AFC Asian Cup', 'AFC Championship',
+                     'African Championship', 'African Cup of Nations', 'CONCACAF Championship',
+                     'CONCACAF Gold Cup', 'OFC Championship'}
+
+# Colonnes d'un match (une ligne par match) utilisées par le moteur
+MATCH_FIELDS = ['match_id', 'day', 'home_team', 'away_team', 'home_score', 'away_score', 'tournament', 'neutral']
+
+
+def tournament_k(tournament):
+    """
+    Coefficient K d'une compétition
+    """
+    if tournament == 'FIFA World Cup':
+        return K_WORLD_CUP
+    if 'qualification' in tournament.lower():
+        return K_QUALIFICATION
+    if tournament in MAJOR_TOURNAMENTS:
+        return K_MAJOR
+    if tournament in ('Friendly', 'Amical'):
+        return K_FRIENDLY
+    return K_DEFAULT
+
+
+def goal_multiplier(goal_difference):
+    """
+    Multiplicateur de K selon l'écart de buts (1 ; 1,5 ; puis (11 + écart) / 8)
+    """
+    margin = np.abs(goal_difference).astype(np.float64)
+    return np.where(margin <= 1, 1.0, np.where(margin == 2, 1.5, (11 + margin) / 8))
+
+
+def expected_score(rating_difference):
+    """
+    Score attendu (victoire = 1, nul = 0,5) pour un écart de notes
+    """
+    return 1 / (10 ** (-np.asarray(rating_difference) / 400) + 1)
+
+
+def match_rows(table, one_side=True):
+    """
+    Une ligne par match, dans l'ordre chronologique : côté domicile d'une
+    table point de vue équipe, ou table d'une seule équipe (one_side=False)
+    """
+    matches = table[table['is_home'].to_numpy()] if one_side else table
+    order = np.lexsort((matches['match_id'].to_numpy(), matches['day'].to_numpy()))
+    return matches.take(order)[MATCH_FIELDS]
+
+
+class EloRatings:
+    """
+    Notes courantes (tableau indexé par code d'équipe) et historique des
+    notes d'avant-match de chaque match traité
+    """
+
+    def __init__(self, matches=None):
+        self.teams = pd.Index([], dtype=object)
+        self.ratings = np.empty(0)
+        self.match_ids = np.empty(0, dtype=np.int64)
+        self.days = np.empty(0, dtype=np.int64)
+        self.home = np.empty(0, dtype=np.int64)
+        self.away = np.empty(0, dtype=np.int64)
+        self.scores = np.empty((0, 2), dtype=np.int64)
+        self.home_pre = np.empty(0)
+        self.away_pre = np.empty(0)
+        self.home_change = np.empty(0)
+        self.position = np.empty(0, dtype=np.int64)
+        if matches is not None:
+            self.append(matches)
+
+    def _team_codes(self, names):
+        """
+        Codes des équipes ; les équipes inconnues sont ajoutées en fin de
+        dictionnaire avec la note initiale (les codes existants ne changent pas)
+        """
+        names = pd.Index(np.asarray(names, dtype=object))
+        added = names.unique().difference(self.teams)
+        if len(added) > 0:
+            self.teams = self.teams.append(added)
+            self.ratings = np.concatenate([self.ratings, np.full(len(added), INITIAL_RATING)])
+        return self.teams.get_indexer(names).astype(np.int64)
+
+    def append(self, matches):
+        """
+        Traite des matchs postérieurs à ceux déjà traités (colonnes
+        MATCH_FIELDS, ordre chronologique)
+        """
+        if len(matches) == 0:
+            return self
+        home = self._team_codes(matches['home_team'])
+        away = self._team_codes(matches['away_team'])
+        home_score = matches['home_score'].to_numpy().astype(np.int64)
+        away_score = matches['away_score'].to_numpy().astype(np.int64)
+
+        # Tout ce qui ne dépend pas des notes est calculé d'un bloc
+        tournaments = matches['tournament'].astype('category')
+        k_by_tournament = np.array([tournament_k(str(t)) for t in tournaments.cat.categories], dtype=np.float64)
+        goal_difference = home_score - away_score
+        weight = k_by_tournament[tournaments.cat.codes.to_numpy()] * goal_multiplier(goal_difference)
+        actual = (np.sign(goal_difference) + 1) / 2
+        advantage = np.where(matches['neutral'].to_numpy(dtype=bool), 0.0, HOME_ADVANTAGE)
+
+        # Parcours séquentiel : chaque match dépend des notes laissées par les précédents
+        ratings = self.ratings.tolist()
+        n = len(home)
+        home_pre, away_pre, change = np.empty(n), np.empty(n), np.empty(n)
+        for i, (h, a, w, result, adv) in enumerate(zip(home.tolist(), away.tolist(), weight.tolist(),
+                                                      actual.tolist(), advantage.tolist())):
+            home_rating, away_rating = ratings[h], ratings[a]
+            expected = 1 / (10 ** ((away_rating - home_rating - adv) / 400) + 1)
+            delta = w * (result - expected)
+            ratings[h] = home_rating + delta
+            ratings[a] = away_rating - delta
+            home_pre[i], away_pre[i], change[i] = home_rating, away_rating, delta
+        self.ratings = np.asarray(ratings)
+
+        match_ids = matches['match_id'].to_numpy().astype(np.int64)
+        first = len(self.match_ids)
+        self.match_ids = np.concatenate([self.match_ids, match_ids])
+        self.days = np.concatenate([self.days, matches['day'].to_numpy().astype(np.int64)])
+        self.home = np.concatenate([self.home, home])
+        self.away = np.concatenate([self.away, away])
+        self.scores = np.concatenate([self.scores, np.column_stack([home_score, away_score])])
+        self.home_pre = np.concatenate([self.home_pre, home_pre])
+        self.away_pre = np.concatenate([self.away_pre, away_pre])
+        self.home_change = np.concatenate([self.home_change, change])
+
+        # Position de chaque match dans l'historique, indexée par match_id
+        size = max(len(self.position), int(match_ids.max()) + 1)
+        position = np.full(size, -1, dtype=np.int64)
+        position[:len(self.position)] = self.position
+        position[match_ids] = first + np.arange(n)
+        self.position = position
+        return self
+
+    def update(self, matches):
+        """
+        Version incrémentale : `matches` (toute l'histoire, ordre chronologique)
+        doit commencer par les matchs déjà traités, inchangés ; seuls les
+        suivants sont traités. Renvoie un nouveau moteur (celui-ci reste lu
+        par les sessions de l'instantané précédent), ou None si l'historique
+        a été modifié ou si un nouveau match est antérieur au dernier traité.
+        """
+        n = len(self.match_ids)
+        if len(matches) < n:
+            return None
+        known = matches.iloc[:n]
+        same_prefix = (
+            np.array_equal(known['match_id'].to_numpy(), self.match_ids)
+            and np.array_equal(known['home_score'].to_numpy(), self.scores[:, 0])
+            and np.array_equal(known['away_score'].to_numpy(), self.scores[:, 1])
+            and np.array_equal(self.teams.get_indexer(known['home_team'].to_numpy(dtype=object)), self.home)
+            and np.array_equal(self.teams.get_indexer(known['away_team'].to_numpy(dtype=object)), self.away)
+        )
+        new = matches.iloc[n:]
+        if not same_prefix or (n > 0 and len(new) > 0 and new['day'].to_numpy().min() < self.days[-1]):
+            return None
+        # Copie superficielle : append remplace les tableaux sans les modifier
+        return copy.copy(self).append(new)
+
+    def current(self):
+        """
+        Notes actuelles de toutes les équipes, de la meilleure à la moins bonne
+        """
+        return pd.Series(self.ratings, index=self.teams, name='rating').sort_values(ascending=False, kind='stable')
+
+    def rating(self, team):
+        """
+        Note actuelle d'une équipe, None si inconnue
+        """
+        code = self.teams.get_indexer([team])[0]
+        return float(self.ratings[code]) if code >= 0 else None
+
+    def rank(self, team):
+        """
+        Rang actuel d'une équipe (1 = meilleure note), None si inconnue
+        """
+        code = self.teams.get_indexer([team])[0]
+        if code < 0:
+            return None
+        return int(np.count_nonzero(self.ratings > self.ratings[code])) + 1
+
+    def team_series(self, team):
+        """
+        Note d'une équipe après chacun de ses matchs (colonnes date et rating)
+        """
+        code = self.teams.get_indexer([team])[0]
+        positions = np.flatnonzero((self.home == code) | (self.away == code)) if code >= 0 else np.empty(0, dtype=np.int64)
+        is_home = self.home[positions] == code
+        pre = np.where(is_home, self.home_pre[positions], self.away_pre[positions])
+        change = np.where(is_home, self.home_change[positions], -self.home_change[positions])
+        return pd.DataFrame({
+            'date': day_to_date(self.days[positions]),
+            'match_id': self.match_ids[positions],
+            'rating': pre + change
+        })
+
+    def pre_match(self, df):
+        """
+        Notes d'avant-match des matchs d'une table du dashboard (match_id,
+        is_home, neutral) : note de l'équipe, de l'adversaire et score
+        attendu (avantage du terrain compris)
+        """
+        match_ids = df['match_id'].to_numpy().astype(np.int64)
+        inside = match_ids < len(self.position)
+        positions = np.full(len(match_ids), -1, dtype=np.int64)
+        positions[inside] = self.position[match_ids[inside]]
+        known = positions >= 0
+        safe = np.where(known, positions, 0)
+
+        is_home = df['is_home'].to_numpy(dtype=bool)
+        team_rating = np.where(is_home, self.home_pre[safe], self.away_pre[safe]) if len(self.home_pre) else np.zeros(len(df))
+        opponent_rating = np.where(is_home, self.away_pre[safe], self.home_pre[safe]) if len(self.home_pre) else np.zeros(len(df))
+        team_rating = np.where(known, team_rating, np.nan)
+        opponent_rating = np.where(known, opponent_rating, np.nan)
+        advantage = np.where(is_home, HOME_ADVANTAGE, -HOME_ADVANTAGE)
+        if 'neutral' in df.columns:
+            advantage = np.where(df['neutral'].to_numpy(dtype=bool), 0.0, advantage)
+        return pd.DataFrame({
+            'team_rating': team_rating,
+            'opponent_rating': opponent_rating,
+            'expected_score': expected_score(team_rating - opponent_rating + advantage)
+        }, index=df.index)
+
+
+def strength_adjusted_metrics(df, elo):
+    """
+    Métriques ajustées à la force des adversaires : note moyenne des
+    adversaires, points Elo obtenus (victoire 1, nul 0,5) contre points attendus
+    """
+    ratings = elo.pre_match(df).dropna()
+    if len(ratings) == 0:
+        return {}
+    actual = result_codes(df.loc[ratings.index]) / 2
+    expected = ratings['expected_score'].to_numpy()
+    return {
+        'matches': len(ratings),
+        'avg_opponent_rating': float(ratings['opponent_rating'].mean()),
+        'actual_score': float(actual.sum()),
+        'expected_score': float(expected.sum()),
+        'performance_vs_expected': float((actual - expected).sum()),
+        'strong_opponent_matches': int(np.count_nonzero(ratings['opponent_rating'] >= ratings['team_rating']))
+    }
+
+
+def snapshot_matches(snapshot):
+    """
+    Matchs de l'historique complet d'un instantané (table France seule si
+    results.csv est indisponible)
+    """
+    if snapshot.perspective is not None:
+        return match_rows(snapshot.perspective.table)
+    return match_rows(snapshot.france_data, one_side=False)
+
+
+def elo_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : classement Elo de l'historique complet
+    """
+    return EloRatings(snapshot_matches(snapshot))
+
+
+def elo_update(previous, snapshot, data_dir):
+    """
+    Mise à jour incrémentale de l'agrégat : seuls les matchs ajoutés sont
+    traités (None si l'historique a changé)
+    """
+    return previous.update(snapshot_matches(snapshot))
@@ -0,0 +1,137 @@
+"""
+Cache des figures Plotly partagé par toutes les pages et toutes les sessions
+
+Chaque graphique est mémorisé sous une clé formée du nom de la fonction qui
+le construit, d'une empreinte des matchs affichés et des autres paramètres
+du graphique. L'empreinte se calcule directement sur les tableaux des
+colonnes (octets des valeurs, codes des catégories), sans agrégation pandas :
+une combinaison de filtres déjà affichée renvoie la figure construite, sans
+refaire ni les calculs. Les figures sont conservées sous leur forme JSON et
+reconstruites à chaque lecture : chaque session reçoit sa propre copie, et la
+chaîne mémorisée sert aussi à borner la taille du cache (éviction LRU).
+"""
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+# Taille sérialisée maximale de l'ensemble des figures mémorisées
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def frame_fingerprint(df):
+    """
+    Empreinte du contenu d'un DataFrame (colonnes et valeurs, hors index)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.int64(len(df)).tobytes())
+    for name in df.columns:
+        column = df[name]
+        digest.update(str(name).encode())
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Le hash du type est calculé une fois pour toutes sur les catégories
+            digest.update(np.int64(hash(column.dtype)).tobytes())
+            digest.update(column.array.codes.tobytes())
+            continue
+        values = column.to_numpy()
+        if values.dtype == object:
+            values = pd.util.hash_array(values)
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Figures sérialisées en JSON, LRU bornées par leur taille, protégées par un
+    verrou (les sessions Streamlit s'exécutent dans des threads différents)
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """
+        Figure associée à `key`, construite par `build()` si absente ; une
+        nouvelle figure est reconstruite depuis le JSON mémorisé à chaque succès
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                serialized = self.entries[key]
+            else:
+                serialized = None
+                self.misses += 1
+        if serialized is not None:
+            return pio.from_json(serialized)
+
+        # Construction hors verrou, comme pour le cache des métriques
+        figure = build()
+        serialized = figure.to_json()
+        size = len(serialized)
+        if size > self.max_bytes:
+            return figure
+
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= len(self.entries[key])
+            self.entries[key] = serialized
+            self.entries.move_to_end(key)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+        return figure
+
+    def stats(self):
+        """
+        Compteurs du cache (figures, taille, succès, échecs, taux de succès)
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total * 100) if total > 0 else 0
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache unique du processus serveur
+FIGURE_CACHE = FigureCache()
+
+
+def cached_figure(build):
+    """
+    Décorateur des fonctions de utils.visualizations : la figure est mémorisée
+    sous (nom de la fonction, empreinte du premier argument, autres paramètres).
+    Les autres arguments DataFrame sont des agrégats précalculés du premier
+    (cube, tendance...) et n'entrent pas dans la clé. Chaque appel renvoie une
+    figure distincte, que l'appelant peut modifier sans toucher au cache.
+    """
+    @functools.wraps(build)
+    def wrapper(df, *args, **kwargs):
+        parameters = tuple(None if isinstance(value, pd.DataFrame) else value for value in args)
+        named = tuple(sorted((name, value) for name, value in kwargs.items()
+                             if not isinstance(value, pd.DataFrame)))
+        key = (build.__name__, frame_fingerprint(df), parameters, named)
+        return FIGURE_CACHE.get_or_build(key, lambda: build(df, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,158 @@
+"""
+Ingestion des buteuses (data/goalscorers.csv) et jointure aux matchs
+
+Chaque but est rattaché à son match de la table point de vue équipe par un
+index de hachage sur la clé (date, équipe à domicile, équipe à l'extérieur),
+les noms d'équipes étant normalisés comme dans load_and_process_data.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.csv_reader import read_typed_csv
+from utils.team_perspective import date_to_day
+
+GOALSCORER_DTYPES = {
+    'date': 'datetime64[s]',
+    'home_team': str,
+    'away_team': str,
+    'team': str,
+    'scorer': str,
+    'minute': 'Int16',
+    'own_goal': 'boolean',
+    'penalty': 'boolean'
+}
+
+
+def read_goalscorers(path='data/goalscorers.csv'):
+    """
+    Lit le fichier des buteuses avec des types explicites :
+    minute en entier (-1 si inconnue), own_goal et penalty en booléens
+    """
+    df = read_typed_csv(path, GOALSCORER_DTYPES)
+    
+    for column in ['home_team', 'away_team', 'team']:
+        df[column] = df[column].str.lower().str.strip()
+    
+    df['day'] = date_to_day(df['date'])
+    df['minute'] = df['minute'].fillna(-1).astype(np.int16)
+    for column in ['own_goal', 'penalty']:
+        df[column] = df[column].fillna(False).astype(bool)
+    
+    return df.drop(columns='date')
+
+
+def match_keys(days, home_codes, away_codes):
+    """
+    Clé int64 (jour, domicile, extérieur) ; -1 si une équipe est inconnue
+    """
+    keys = ((days.astype(np.int64) - np.iinfo(np.int32).min) << 32) \
+        | (home_codes.astype(np.int64) << 16) | away_codes.astype(np.int64)
+    return np.where((home_codes < 0) | (away_codes < 0), -1, keys)
+
+
+def join_goals_to_matches(goals, perspective_table):
+    """
+    Rattache chaque but à son match (match_id, -1 si introuvable) via un
+    index de hachage construit sur les lignes « domicile » de la table
+    """
+    teams = perspective_table['team'].cat.categories
+    home_rows = perspective_table[perspective_table['is_home'].to_numpy()]
+    
+    keys = match_keys(
+        home_rows['day'].to_numpy(),
+        home_rows['team'].cat.codes.to_numpy(),
+        home_rows['opponent'].cat.codes.to_numpy()
+    )
+    # En cas de doublon (deux matchs le même jour entre les mêmes équipes), on garde le premier
+    unique = ~pd.Index(keys).duplicated()
+    match_index = pd.Index(keys[unique])
+    match_ids = home_rows['match_id'].to_numpy()[unique]
+    
+    home_codes = teams.get_indexer(goals['home_team'])
+    away_codes = teams.get_indexer(goals['away_team'])
+    positions = match_index.get_indexer(match_keys(goals['day'].to_numpy(), home_codes, away_codes))
+    
+    return pd.DataFrame({
+        'match_id': np.where(positions >= 0, match_ids[positions], -1).astype(np.int32),
+        'day': goals['day'].to_numpy(),
+        'team': pd.Categorical.from_codes(teams.get_indexer(goals['team']), teams),
+        'scorer': pd.Categorical(goals['scorer']),
+        'minute': goals['minute'].to_numpy(),
+        'own_goal': goals['own_goal'].to_numpy(),
+        'penalty': goals['penalty'].to_numpy()
+    })
+
+
+class GoalscorerIndex:
+    """
+    Buts triés par match avec les bornes du bloc de chaque match :
+    les buts d'un match ou d'une liste de matchs se lisent sans jointure
+    """
+    
+    def __init__(self, events):
+        events = events[events['match_id'].to_numpy() >= 0]
+        order = np.argsort(events['match_id'].to_numpy(), kind='stable')
+        self.events = events.take(order).reset_index(drop=True)
+        match_ids = self.events['match_id'].to_numpy()
+        n_matches = int(match_ids.max()) + 1 if len(match_ids) else 0
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(match_ids, minlength=n_matches))])
+    
+    def goals_for_match(self, match_id):
+        """
+        Buts d'un match (découpage direct de son bloc)
+        """
+        if match_id < 0 or match_id + 1 >= len(self.offsets):
+            return self.events.iloc[0:0]
+        return self.events.iloc[self.offsets[match_id]:self.offsets[match_id + 1]]
+    
+    def goals_for_matches(self, match_ids):
+        """
+        Buts d'un ensemble de matchs (par exemple les match_id d'une vue filtrée)
+        """
+        match_ids = np.asarray(match_ids)
+        match_ids = match_ids[(match_ids >= 0) & (match_ids + 1 < len(self.offsets))]
+        starts = self.offsets[match_ids]
+        counts = self.offsets[match_ids + 1] - starts
+        # Positions de toutes les lignes des blocs sélectionnés, sans boucle Python
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.events.iloc[positions]
+    
+    def top_scorers(self, team, match_ids=None, n=10):
+        """
+        Meilleures buteuses d'une équipe (hors contre-son-camp), éventuellement
+        limitées à un ensemble de matchs
+        """
+        events = self.events if match_ids is None else self.goals_for_matches(match_ids)
+        teams = events['team'].cat.categories
+        if team not in teams:
+            return pd.DataFrame(columns=['scorer', 'goals', 'penalties'])
+        mask = (events['team'].cat.codes.to_numpy() == teams.get_loc(team)) & ~events['own_goal'].to_numpy()
+        scorers = events['scorer'].cat.codes.to_numpy()[mask]
+        counts = np.bincount(scorers, minlength=len(events['scorer'].cat.categories))
+        top = np.argsort(-counts, kind='stable')[:n]
+        top = top[counts[top] > 0]
+        return pd.DataFrame({
+            'scorer': events['scorer'].cat.categories[top],
+            'goals': counts[top],
+            'penalties': np.bincount(scorers, weights=events['penalty'].to_numpy()[mask],
+                                     minlength=len(counts))[top].astype(int)
+        })
+
+
+def load_goalscorer_index(perspective, path='data/goalscorers.csv'):
+    """
+    Ingestion complète : lecture typée, jointure aux matchs et index par match
+    """
+    return GoalscorerIndex(join_goals_to_matches(read_goalscorers(path), perspective.table))
+
+
+def goalscorer_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : index des buteuses de la version courante
+    """
+    path = os.path.join(data_dir, 'goalscorers.csv')
+    if snapshot.perspective is None or not os.path.exists(path):
+        return None
+    return load_goalscorer_index(snapshot.perspective, path)
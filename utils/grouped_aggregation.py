@@ -0,0 +1,98 @@
+"""
+Agrégations groupées par réducteurs natifs, partagées par toutes les vues
+
+Chaque match se traduit en colonnes indicatrices additives (un match, une
+victoire 0/1, ..., buts marqués et encaissés : les COUNTER_FIELDS de
+utils.metrics_kernel). Les sommes par groupe s'obtiennent par np.bincount,
+sans appel Python par groupe ni filtre par groupe, et toutes les métriques
+(taux de victoire, moyennes de buts, nombres de matchs) s'en déduisent par
+metrics_table. Les vues par année, mois, compétition ou adversaire passent
+par ce module, directement sur les matchs ou via les cellules du cube
+(utils.olap_cube).
+"""
+import numpy as np
+import pandas as pd
+
+from utils.metrics_kernel import (
+    GOALS_CONCEDED, GOALS_SCORED, MATCHES, N_OUTCOMES, counters_from_outcomes,
+    frame_scores, grouped_counters, metrics_table, outcome_codes
+)
+
+# Colonnes indicatrices d'un match selon son code d'issue (hors buts, ajoutés ensuite)
+OUTCOME_COUNTERS = counters_from_outcomes(np.eye(N_OUTCOMES, dtype=np.int64), 0, 0)
+
+
+def match_indicators(team_score, opponent_score):
+    """
+    Colonnes indicatrices de chaque match : tableau (matchs, COUNTER_FIELDS)
+    """
+    indicators = OUTCOME_COUNTERS[outcome_codes(team_score, opponent_score)]
+    indicators[:, GOALS_SCORED] = team_score
+    indicators[:, GOALS_CONCEDED] = opponent_score
+    return indicators
+
+
+def dimension_codes(values):
+    """
+    Codes (>= 0, -1 si manquant) et libellés triés d'une colonne de la table
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype(np.int64), values.cat.categories
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), labels
+
+
+def combine_codes(codes, labels, names):
+    """
+    Numéro de groupe unique pour une combinaison de dimensions : (numéros,
+    nombre de groupes possibles, fonction numéros -> index des groupes)
+    """
+    sizes = tuple(max(len(dimension_labels), 1) for dimension_labels in labels)
+    group_ids = np.ravel_multi_index(codes, sizes) if len(codes[0]) else np.empty(0, dtype=np.intp)
+
+    def index_of(groups):
+        group_codes = np.unravel_index(groups, sizes)
+        arrays = [dimension_labels[values] for dimension_labels, values in zip(labels, group_codes)]
+        if len(names) == 1:
+            return pd.Index(arrays[0], name=names[0])
+        return pd.MultiIndex.from_arrays(arrays, names=names)
+
+    return group_ids, int(np.prod(sizes)), index_of
+
+
+def grouped_sum(groups, values, n_groups):
+    """
+    Somme des colonnes de `values` (lignes, colonnes entières) par groupe,
+    une passe np.bincount par colonne : tableau (n_groups, colonnes)
+    """
+    values = np.asarray(values)
+    sums = np.empty((n_groups, values.shape[1]), dtype=np.int64)
+    for column in range(values.shape[1]):
+        sums[:, column] = np.bincount(groups, weights=values[:, column], minlength=n_groups)
+    return sums
+
+
+def grouped_metrics(df, by):
+    """
+    Métriques complètes (colonnes de metrics_table) de chaque valeur de `by`
+    (une colonne ou une liste de colonnes) ; les groupes sans match et les
+    matchs dont une valeur est manquante sont omis
+    """
+    names = [by] if isinstance(by, str) else list(by)
+    codes, labels = zip(*(dimension_codes(df[name]) for name in names))
+    known = np.logical_and.reduce([dimension_values >= 0 for dimension_values in codes])
+    group_ids, n_groups, index_of = combine_codes([dimension_values[known] for dimension_values in codes],
+                                                  labels, names)
+
+    team_score, opponent_score = frame_scores(df)
+    if n_groups <= 4 * max(len(df), 1):
+        # Groupes possibles peu nombreux : comptage direct sur tous les numéros
+        counters = grouped_counters(team_score[known], opponent_score[known], group_ids, n_groups)
+        played = np.flatnonzero(counters[:, MATCHES] > 0)
+        return metrics_table(counters[played], index_of(played))
+
+    # Combinaisons nombreuses (plusieurs dimensions) : seuls les groupes présents
+    groups, inverse = np.unique(group_ids, return_inverse=True)
+    counters = grouped_counters(team_score[known], opponent_score[known], inverse, len(groups))
+    return metrics_table(counters, index_of(groups))
+
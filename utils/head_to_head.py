@@ -0,0 +1,102 @@
+"""
+Confrontations directes entre toutes les équipes de results.csv
+
+La table point de vue équipe contient chaque match une fois pour chaque
+couple ordonné (équipe, adversaire). Les compteurs additifs de
+utils.metrics_kernel sont calculés par couple et par année en une passe
+bincount, uniquement pour les couples qui se sont rencontrés (structure
+creuse), puis cumulés année après année dans le bloc de chaque couple. Un
+dictionnaire donne le bloc d'un couple : le bilan d'une confrontation sur
+n'importe quelle période se lit alors en temps constant, sans parcourir les
+matchs.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.metrics_kernel import COUNTER_FIELDS, grouped_counters, metrics_from_counters
+
+
+class HeadToHead:
+    """
+    Compteurs cumulés par couple ordonné (équipe, adversaire) et par année
+    """
+
+    def __init__(self, table, team_column='team', score_column='team_score'):
+        team, opponent = table[team_column], table['opponent']
+        if isinstance(team.dtype, pd.CategoricalDtype) and team.dtype == opponent.dtype:
+            # Dictionnaire commun de la table point de vue équipe
+            self.teams = team.cat.categories
+            team_codes = team.cat.codes.to_numpy().astype(np.int64)
+            opponent_codes = opponent.cat.codes.to_numpy().astype(np.int64)
+        else:
+            codes, self.teams = pd.factorize(np.concatenate([team.to_numpy(dtype=object),
+                                                             opponent.to_numpy(dtype=object)]), sort=True)
+            team_codes, opponent_codes = codes[:len(table)].astype(np.int64), codes[len(table):].astype(np.int64)
+        years = table['year'].to_numpy().astype(np.int64)
+        self.first_year = int(years.min()) if len(years) else 0
+        n_years = int(years.max()) - self.first_year + 1 if len(years) else 0
+
+        # Cellules non vides (couple, année), triées par couple puis par année
+        n_teams = len(self.teams)
+        cell_ids = (team_codes * n_teams + opponent_codes) * n_years + (years - self.first_year)
+        cells, inverse = np.unique(cell_ids, return_inverse=True)
+        counters = grouped_counters(table[score_column].to_numpy(), table['opponent_score'].to_numpy(),
+                                    inverse, len(cells))
+        self.years = cells % n_years + self.first_year if n_years else cells
+        self.cumulative = np.zeros((len(cells) + 1, len(COUNTER_FIELDS)), dtype=np.int64)
+        np.cumsum(counters, axis=0, out=self.cumulative[1:])
+
+        # Bloc [début, fin) de chaque couple dans les cellules
+        pairs = cells // n_years if n_years else cells
+        pair_keys, starts = np.unique(pairs, return_index=True)
+        ends = np.append(starts[1:], len(cells))
+        self.n_teams = n_teams
+        self.blocks = dict(zip(pair_keys.tolist(), zip(starts.tolist(), ends.tolist())))
+        self.team_codes = {team: code for code, team in enumerate(self.teams)}
+
+    def _block(self, team, opponent):
+        team_code, opponent_code = self.team_codes.get(team), self.team_codes.get(opponent)
+        if team_code is None or opponent_code is None:
+            return None
+        return self.blocks.get(team_code * self.n_teams + opponent_code)
+
+    def counters(self, team, opponent, start_year=None, end_year=None):
+        """
+        Compteurs de `team` contre `opponent` sur les années start_year à
+        end_year incluses (tout l'historique par défaut)
+        """
+        block = self._block(team, opponent)
+        if block is None:
+            return np.zeros(len(COUNTER_FIELDS), dtype=np.int64)
+        start, end = block
+        years = self.years[start:end]
+        first = start + (np.searchsorted(years, start_year, side='left') if start_year is not None else 0)
+        last = start + (np.searchsorted(years, end_year, side='right') if end_year is not None else end - start)
+        return self.cumulative[max(last, first)] - self.cumulative[first]
+
+    def metrics(self, team, opponent, start_year=None, end_year=None):
+        """
+        Métriques (clés de calculate_performance_metrics) de `team` contre
+        `opponent` ; vide s'ils ne se sont pas rencontrés sur la période
+        """
+        return metrics_from_counters(self.counters(team, opponent, start_year, end_year))
+
+    def opponents(self, team):
+        """
+        Adversaires déjà rencontrés par une équipe
+        """
+        code = self.team_codes.get(team)
+        if code is None:
+            return self.teams[:0]
+        pairs = np.array(list(self.blocks), dtype=np.int64)
+        return self.teams[np.sort(pairs[pairs // self.n_teams == code] % self.n_teams)]
+
+
+def head_to_head_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : confrontations directes de toutes
+    les équipes (table France seule si results.csv est indisponible)
+    """
+    if snapshot.perspective is not None:
+        return HeadToHead(snapshot.perspective.table)
+    return HeadToHead(snapshot.france_data, score_column='france_score')
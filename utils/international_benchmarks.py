@@ -0,0 +1,147 @@
+"""
+Standards internationaux calculés sur toutes les équipes de results.csv
+
+Les compteurs additifs de utils.metrics_kernel sont calculés par équipe et
+par année en une passe bincount sur la table point de vue équipe, puis
+cumulés année après année : les compteurs de toutes les équipes sur une
+période valent la différence de deux tranches. Les équipes de la période
+(avec un minimum de matchs) sont ensuite classées par taux de victoire, buts
+marqués et buts encaissés par match ; le seuil d'un niveau « Top k » est la
+valeur de la k-ième meilleure équipe pour chaque critère.
+
+Comme les autres agrégats additifs, les compteurs se complètent avec les
+matchs ajoutés en fin de results.csv (extend) sans repartir de toute la table.
+"""
+import copy
+
+import numpy as np
+
+from utils.metrics_kernel import COUNTER_FIELDS, MATCHES, grouped_counters, metrics_table
+from utils.period_index import merge_year_grids
+
+# Niveaux de référence : nom -> nombre d'équipes
+BENCHMARK_LEVELS = {'Top 5 Mondial': 5, 'Top 10 Mondial': 10, 'Top 20 Mondial': 20}
+# Matchs minimum sur la période pour figurer au classement
+MIN_MATCHES = 10
+
+# Critères de classement : colonne de metrics_table, clé du standard, meilleur = plus grand
+BENCHMARK_CRITERIA = [
+    ('win_rate', 'win_rate', True),
+    ('avg_goals_scored', 'goals_per_match', True),
+    ('avg_goals_conceded', 'goals_conceded', False)
+]
+
+
+class TeamPeriodIndex:
+    """
+    Compteurs cumulés par année et par équipe : (années + 1, équipes, compteurs)
+    """
+
+    def __init__(self, table, score_column='team_score'):
+        self.teams = table['team'].cat.categories
+        team_codes = table['team'].cat.codes.to_numpy().astype(np.int64)
+        years = table['year'].to_numpy().astype(np.int64)
+        self.first_year = int(years.min()) if len(years) else 0
+        n_years = int(years.max()) - self.first_year + 1 if len(years) else 0
+
+        cells = (years - self.first_year) * len(self.teams) + team_codes
+        by_cell = grouped_counters(table[score_column].to_numpy(), table['opponent_score'].to_numpy(),
+                                   cells, n_years * len(self.teams))
+        self.cumulative = np.zeros((n_years + 1, len(self.teams), len(COUNTER_FIELDS)), dtype=np.int64)
+        np.cumsum(by_cell.reshape(n_years, len(self.teams), -1), axis=0, out=self.cumulative[1:])
+
+    def extend(self, rows, score_column='team_score'):
+        """
+        Compteurs complétés par les matchs `rows` ajoutés à la table : nouvel
+        index, celui-ci restant lu par l'instantané précédent ; None s'il faut
+        le reconstruire (dictionnaire des équipes réordonné)
+        """
+        if len(rows) == 0:
+            return self
+        added = TeamPeriodIndex(rows, score_column)
+        if len(self.cumulative) <= 1 or not added.teams[:len(self.teams)].equals(self.teams):
+            return None
+        extended = copy.copy(self)
+        extended.teams = added.teams
+        extended.first_year, extended.cumulative = merge_year_grids(
+            self.cumulative, self.first_year, added.cumulative, added.first_year)
+        return extended
+
+    def _year_position(self, year):
+        return int(np.clip(year - self.first_year, 0, len(self.cumulative) - 1))
+
+    def team_counters(self, start_year, end_year):
+        """
+        Compteurs de chaque équipe sur les années start_year à end_year incluses
+        """
+        start, end = self._year_position(start_year), self._year_position(end_year + 1)
+        return self.cumulative[max(end, start)] - self.cumulative[start]
+
+    def team_metrics(self, start_year, end_year, min_matches=MIN_MATCHES):
+        """
+        Métriques (colonnes de metrics_table) des équipes ayant joué au moins
+        min_matches matchs sur la période
+        """
+        counters = self.team_counters(start_year, end_year)
+        ranked = counters[:, MATCHES] >= max(min_matches, 1)
+        return metrics_table(counters[ranked], self.teams[ranked])
+
+    def standards(self, start_year, end_year, min_matches=MIN_MATCHES):
+        """
+        Seuils de chaque niveau de BENCHMARK_LEVELS : {niveau: {win_rate,
+        goals_per_match, goals_conceded, percentile}} ; le percentile est la
+        part des équipes classées sous le seuil
+        """
+        table = self.team_metrics(start_year, end_year, min_matches)
+        n_teams = len(table)
+        if n_teams == 0:
+            return {}
+
+        standards = {}
+        for level, k in BENCHMARK_LEVELS.items():
+            position = min(k, n_teams) - 1
+            standard = {'percentile': 100 * (1 - (position + 1) / n_teams)}
+            for column, key, higher_is_better in BENCHMARK_CRITERIA:
+                values = table[column].to_numpy()
+                ordered = -np.partition(-values, position) if higher_is_better else np.partition(values, position)
+                standard[key] = float(ordered[position])
+            standards[level] = standard
+        return standards
+
+    def ranks(self, team, start_year, end_year, min_matches=MIN_MATCHES):
+        """
+        Rang d'une équipe pour chaque critère parmi les équipes classées de la
+        période ({clé du standard: rang}, plus 'teams' : nombre d'équipes) ;
+        vide si l'équipe n'est pas classée
+        """
+        table = self.team_metrics(start_year, end_year, min_matches)
+        if team not in table.index:
+            return {}
+        ranks = {'teams': len(table)}
+        for column, key, higher_is_better in BENCHMARK_CRITERIA:
+            values = table[column].to_numpy()
+            value = table.at[team, column]
+            better = values > value if higher_is_better else values < value
+            ranks[key] = int(np.count_nonzero(better)) + 1
+        return ranks
+
+
+def team_period_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : compteurs par équipe et par année de
+    toutes les équipes (table France seule si results.csv est indisponible)
+    """
+    if snapshot.perspective is not None:
+        return TeamPeriodIndex(snapshot.perspective.table)
+    return TeamPeriodIndex(snapshot.france_data, score_column='france_score')
+
+
+def team_period_update(previous, snapshot, data_dir):
+    """
+    Mise à jour incrémentale de l'agrégat : seuls les matchs ajoutés en fin
+    de results.csv sont traités (None si les données ont changé autrement)
+    """
+    if snapshot.appended_from is None:
+        return None
+    table = snapshot.perspective.table
+    return previous.extend(table[table['match_id'].to_numpy() >= snapshot.appended_from])
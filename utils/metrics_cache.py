@@ -0,0 +1,305 @@
+"""
+Cache des métriques partagé par toutes les pages et toutes les sessions
+
+Les métriques dérivées des filtres (performance, avantage du terrain,
+tendances) sont mémorisées au niveau du processus, sous une clé décrivant les
+filtres : version des données, équipe, années et compétitions sélectionnées.
+Une même combinaison de filtres n'est donc calculée qu'une fois, quelle que
+soit la page ou la session qui la demande. Le cache est borné (éviction LRU)
+et compte ses succès et échecs.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+from utils.bootstrap import bootstrap_intervals
+from utils.data_processing import calculate_home_advantage, calculate_performance_metrics, get_performance_by_opponent
+from utils.elo import strength_adjusted_metrics
+from utils.figure_cache import frame_fingerprint
+from utils.international_benchmarks import TeamPeriodIndex
+from utils.olap_cube import MatchCube
+from utils.projection import PoissonRates, project_season
+from utils.rolling import RollingStats
+from utils.streaks import streak_summary
+
+FilterSignature = namedtuple('FilterSignature', ['version', 'team', 'start_year', 'end_year', 'tournaments'])
+
+
+def filter_signature(version, team, year_range, tournaments=None):
+    """
+    Clé des filtres de la barre latérale ; l'ordre de sélection des
+    compétitions n'a pas d'importance (aucune sélection = toutes)
+    """
+    return FilterSignature(
+        version, team, int(year_range[0]), int(year_range[1]),
+        tuple(sorted(tournaments)) if tournaments else None
+    )
+
+
+def tracked_team(df, signature=None):
+    """
+    Équipe suivie par le tableau de bord : lue dans les données, sinon dans
+    la signature des filtres
+    """
+    if 'team' in df.columns and len(df) > 0:
+        return str(df['team'].iloc[0])
+    return signature.team if signature is not None else 'france'
+
+
+class MetricsCache:
+    """
+    Dictionnaire LRU borné, protégé par un verrou (les sessions Streamlit
+    s'exécutent dans des threads différents)
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Valeur associée à `key`, calculée par `compute()` si absente
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        # Calcul hors verrou : deux sessions peuvent calculer la même clé en
+        # parallèle, la seconde écriture est alors simplement redondante
+        value = compute()
+
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """
+        Compteurs du cache (taille, succès, échecs, taux de succès)
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total * 100) if total > 0 else 0
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache unique du processus serveur
+METRICS_CACHE = MetricsCache()
+
+
+class FilterMetrics:
+    """
+    Métriques d'une combinaison de filtres, calculées à la demande et
+    mémorisées dans METRICS_CACHE sous la signature des filtres.
+    Sans signature (appel direct d'une page), rien n'est mis en cache.
+    `mask` (masque des filtres sur full_data) permet aux noyaux de calcul de
+    travailler sur la table complète sans copie filtrée ; `cube` (cube de
+    full_data) répond aux vues agrégées sans parcourir les matchs ; `elo`
+    (utils.elo.EloRatings) fournit les notes d'avant-match des adversaires et
+    `head_to_head` (utils.head_to_head.HeadToHead) les confrontations directes
+    entre toutes les équipes, `poisson_rates` (utils.projection.PoissonRates)
+    les forces utilisées par les projections, `team_periods`
+    (utils.international_benchmarks.TeamPeriodIndex) les standards internationaux
+    et `goalscorers` (utils.goalscorers.GoalscorerIndex) les buts de chaque match.
+    """
+
+    def __init__(self, filtered_data, full_data, signature=None, period_index=None, mask=None,
+                 cube=None, elo=None, head_to_head=None, poisson_rates=None, team_periods=None,
+                 goalscorers=None, cache=METRICS_CACHE):
+        self.filtered_data = filtered_data
+        self.full_data = full_data
+        self.signature = signature
+        self.period_index = period_index
+        self.mask = mask
+        self.cube = cube
+        self.elo = elo
+        self.head_to_head = head_to_head
+        self.poisson_rates = poisson_rates
+        self.team_periods = team_periods
+        self.goalscorers = goalscorers
+        self.cache = cache
+        # Équipe suivie, nommée comme dans les agrégats ('france', en
+        # minuscules comme toutes les équipes de results.csv)
+        self.team = tracked_team(full_data, signature)
+
+    def _cached(self, name, compute):
+        if self.signature is None:
+            return compute()
+        return self.cache.get_or_compute((self.signature, name), compute)
+
+    def current(self):
+        """
+        Métriques de performance de la période filtrée
+        """
+        def compute():
+            signature = self.signature
+            if self.period_index is not None and signature is not None:
+                return self.period_index.metrics(signature.start_year, signature.end_year, signature.tournaments)
+            if self.mask is not None:
+                return calculate_performance_metrics(self.full_data, mask=self.mask)
+            return calculate_performance_metrics(self.filtered_data)
+        return self._cached('performance', compute)
+
+    def all_time(self):
+        """
+        Métriques de performance de tout l'historique (sans filtre)
+        """
+        def compute():
+            return calculate_performance_metrics(self.full_data)
+        if self.signature is None:
+            return compute()
+        return self.cache.get_or_compute((self.signature.version, self.signature.team, 'all_time'), compute)
+
+    def home_advantage(self):
+        """
+        Avantage du terrain sur la période filtrée
+        """
+        def compute():
+            if self.mask is not None:
+                return calculate_home_advantage(self.full_data, mask=self.mask)
+            return calculate_home_advantage(self.filtered_data)
+        return self._cached('home_advantage', compute)
+
+    def rolling(self):
+        """
+        Ordre chronologique et cumuls de la période filtrée, partagés par toutes les fenêtres
+        """
+        return self._cached('rolling', lambda: RollingStats(self.filtered_data))
+
+    def trend(self, window=10):
+        """
+        Moyennes mobiles de la période filtrée (sans nouveau tri d'une fenêtre à l'autre)
+        """
+        return self._cached(('trend', window), lambda: self.rolling().trend_frame([window]))
+
+    def streaks(self):
+        """
+        Série en cours et séries records de la période filtrée
+        """
+        return self._cached('streaks', lambda: streak_summary(self.filtered_data))
+
+    def rollup(self, by):
+        """
+        Métriques de la période filtrée par année, mois, compétition,
+        adversaire ou lieu (`by` : une dimension ou un tuple de dimensions)
+        """
+        def compute():
+            signature = self.signature
+            if self.cube is not None and signature is not None:
+                return self.cube.rollup(by, signature.start_year, signature.end_year, signature.tournaments)
+            return MatchCube(self.filtered_data).rollup(by)
+        return self._cached(('rollup', by), compute)
+
+    def by_opponent(self, min_matches=1):
+        """
+        Bilan de chaque adversaire de la période filtrée (colonnes de
+        get_performance_by_opponent, du plus affronté au moins affronté)
+        """
+        return self._cached(('by_opponent', min_matches),
+                            lambda: get_performance_by_opponent(self.filtered_data, min_matches=min_matches))
+
+    def strength_adjusted(self):
+        """
+        Métriques de la période filtrée ajustées à la force des adversaires
+        (vide sans classement Elo)
+        """
+        if self.elo is None:
+            return {}
+        return self._cached('strength_adjusted', lambda: strength_adjusted_metrics(self.filtered_data, self.elo))
+
+    def top_scorers(self, n=10):
+        """
+        Meilleures buteuses de l'équipe sur les matchs filtrés (colonnes
+        scorer, goals, penalties) ; None sans index des buteuses
+        """
+        if self.goalscorers is None:
+            return None
+        return self._cached(('top_scorers', n), lambda: self.goalscorers.top_scorers(
+            self.team, self.filtered_data['match_id'].to_numpy(), n))
+
+    def intervals(self, by=None):
+        """
+        Intervalles de confiance bootstrap (taux de victoire, buts marqués et
+        différence de buts par match) de la période filtrée, par valeur de
+        `by` (adversaire, compétition...) ou pour toute la période
+        """
+        return self._cached(('bootstrap', by), lambda: bootstrap_intervals(self.filtered_data, by))
+
+    def year_range(self):
+        """
+        Années de la période filtrée
+        """
+        if self.signature is not None:
+            return self.signature.start_year, self.signature.end_year
+        if len(self.filtered_data) == 0:
+            return None, None
+        return int(self.filtered_data['year'].min()), int(self.filtered_data['year'].max())
+
+    def confrontation(self, team, opponent):
+        """
+        Bilan de `team` contre `opponent` sur les années filtrées (lecture en
+        temps constant ; vide sans index des confrontations ou sans match)
+        """
+        if self.head_to_head is None:
+            return {}
+        start_year, end_year = self.year_range()
+        return self.head_to_head.metrics(team, opponent, start_year, end_year)
+
+    def projection(self, schedule, n_matches, checkpoints, n_simulations=10_000):
+        """
+        Projection Monte-Carlo des n_matches prochains matchs contre les
+        adversaires de `schedule` (calendrier récent, indépendant des filtres :
+        mémorisée par version des données et par calendrier)
+        """
+        team = self.team
+
+        def compute():
+            rates = self.poisson_rates
+            if rates is None:
+                rates = PoissonRates(self.full_data, score_column='france_score')
+            return project_season(rates, team, schedule, n_matches, n_simulations, checkpoints=checkpoints)
+        if self.signature is None:
+            return compute()
+        # Le calendrier dépend de l'année en cours : ses adversaires et lieux entrent dans la clé
+        venue_columns = [column for column in ['opponent', 'is_home', 'neutral'] if column in schedule.columns]
+        key = (self.signature.version, team, 'projection', frame_fingerprint(schedule[venue_columns]),
+               n_matches, tuple(checkpoints), n_simulations)
+        return self.cache.get_or_compute(key, compute)
+
+    def benchmarks(self):
+        """
+        Standards internationaux (seuils Top 5/10/20) et rangs de l'équipe sur
+        les années filtrées, toutes compétitions : mémorisés par période
+        """
+        team = self.team
+        start_year, end_year = self.year_range()
+
+        def compute():
+            if start_year is None:
+                return {}, {}
+            team_periods = self.team_periods
+            if team_periods is None:
+                team_periods = TeamPeriodIndex(self.full_data, score_column='france_score')
+            return (team_periods.standards(start_year, end_year),
+                    team_periods.ranks(team, start_year, end_year))
+        if self.signature is None:
+            return compute()
+        return self.cache.get_or_compute((self.signature.version, team, 'benchmarks', start_year, end_year), compute)
@@ -0,0 +1,170 @@
+"""
+Noyau de calcul des métriques de performance sur tableaux d'entiers
+
+Toutes les métriques de calculate_performance_metrics se déduisent de
+compteurs additifs (matchs, victoires, nuls, défaites, buts marqués et
+encaissés, clean sheets, larges victoires, victoires courtes, lourdes
+défaites). Ces compteurs sont obtenus en une passe : chaque match reçoit un
+code d'issue (écart de buts borné à ±3, clean sheet ou non) et un seul
+`np.bincount` les dénombre, éventuellement pour de nombreux groupes à la fois.
+Les compteurs s'additionnent, ce qui permet aussi de les précalculer.
+"""
+import numpy as np
+import pandas as pd
+
+# Ordre des compteurs dans les tableaux (dernier axe)
+COUNTER_FIELDS = ['matches', 'victories', 'draws', 'defeats', 'goals_scored', 'goals_conceded',
+                  'clean_sheets', 'big_wins', 'narrow_wins', 'heavy_defeats']
+(MATCHES, VICTORIES, DRAWS, DEFEATS, GOALS_SCORED, GOALS_CONCEDED,
+ CLEAN_SHEETS, BIG_WINS, NARROW_WINS, HEAVY_DEFEATS) = range(len(COUNTER_FIELDS))
+
+# Code d'issue = (écart de buts borné à [-3, 3] + 3) * 2 + clean sheet
+MARGIN_LIMIT = 3
+N_OUTCOMES = (2 * MARGIN_LIMIT + 1) * 2
+
+
+def outcome_codes(team_score, opponent_score):
+    """
+    Code d'issue de chaque match (0 à N_OUTCOMES - 1)
+    """
+    team_score = np.asarray(team_score, dtype=np.int16)
+    opponent_score = np.asarray(opponent_score, dtype=np.int16)
+    margin = np.clip(team_score - opponent_score, -MARGIN_LIMIT, MARGIN_LIMIT) + MARGIN_LIMIT
+    return (margin * 2 + (opponent_score == 0)).astype(np.intp)
+
+
+def counters_from_outcomes(outcomes, goals_scored, goals_conceded):
+    """
+    Histogramme(s) des codes d'issue + sommes de buts -> compteurs additifs.
+    `outcomes` a pour dernier axe les N_OUTCOMES codes ; le résultat a pour
+    dernier axe COUNTER_FIELDS.
+    """
+    by_margin = outcomes.reshape(outcomes.shape[:-1] + (2 * MARGIN_LIMIT + 1, 2))
+    per_margin = by_margin.sum(axis=-1)
+    counters = np.empty(outcomes.shape[:-1] + (len(COUNTER_FIELDS),), dtype=np.int64)
+    counters[..., MATCHES] = per_margin.sum(axis=-1)
+    counters[..., VICTORIES] = per_margin[..., MARGIN_LIMIT + 1:].sum(axis=-1)
+    counters[..., DRAWS] = per_margin[..., MARGIN_LIMIT]
+    counters[..., DEFEATS] = per_margin[..., :MARGIN_LIMIT].sum(axis=-1)
+    counters[..., GOALS_SCORED] = goals_scored
+    counters[..., GOALS_CONCEDED] = goals_conceded
+    counters[..., CLEAN_SHEETS] = by_margin[..., 1].sum(axis=-1)
+    counters[..., BIG_WINS] = per_margin[..., 2 * MARGIN_LIMIT]
+    counters[..., NARROW_WINS] = per_margin[..., MARGIN_LIMIT + 1]
+    counters[..., HEAVY_DEFEATS] = per_margin[..., 0]
+    return counters
+
+
+def match_counters(team_score, opponent_score, mask=None):
+    """
+    Compteurs additifs d'un ensemble de matchs ; `mask` (booléens) restreint
+    le calcul sans copier de DataFrame
+    """
+    team_score = np.asarray(team_score)
+    opponent_score = np.asarray(opponent_score)
+    if mask is not None:
+        team_score, opponent_score = team_score[mask], opponent_score[mask]
+    outcomes = np.bincount(outcome_codes(team_score, opponent_score), minlength=N_OUTCOMES)
+    return counters_from_outcomes(outcomes, team_score.sum(dtype=np.int64), opponent_score.sum(dtype=np.int64))
+
+
+def grouped_counters(team_score, opponent_score, groups, n_groups):
+    """
+    Compteurs additifs de n_groups groupes en une passe (groups : numéro de
+    groupe de chaque match, de 0 à n_groups - 1). Résultat (n_groups, champs).
+    """
+    groups = np.asarray(groups, dtype=np.intp)
+    codes = groups * N_OUTCOMES + outcome_codes(team_score, opponent_score)
+    outcomes = np.bincount(codes, minlength=n_groups * N_OUTCOMES).reshape(n_groups, N_OUTCOMES)
+    goals_scored = np.bincount(groups, weights=team_score, minlength=n_groups).astype(np.int64)
+    goals_conceded = np.bincount(groups, weights=opponent_score, minlength=n_groups).astype(np.int64)
+    return counters_from_outcomes(outcomes, goals_scored, goals_conceded)
+
+
+def metrics_from_counters(counters):
+    """
+    Dictionnaire de métriques (clés de calculate_performance_metrics) à partir
+    d'une ligne de compteurs ; vide s'il n'y a aucun match
+    """
+    total_matches = int(counters[MATCHES])
+    if total_matches == 0:
+        return {}
+
+    victories, draws, defeats = int(counters[VICTORIES]), int(counters[DRAWS]), int(counters[DEFEATS])
+    goals_scored, goals_conceded = int(counters[GOALS_SCORED]), int(counters[GOALS_CONCEDED])
+
+    return {
+        'total_matches': total_matches,
+        'victories': victories,
+        'defeats': defeats,
+        'draws': draws,
+        'win_rate': (victories / total_matches) * 100,
+        'defeat_rate': (defeats / total_matches) * 100,
+        'draw_rate': (draws / total_matches) * 100,
+        'goals_scored': goals_scored,
+        'goals_conceded': goals_conceded,
+        'avg_goals_scored': goals_scored / total_matches,
+        'avg_goals_conceded': goals_conceded / total_matches,
+        'goal_difference_total': goals_scored - goals_conceded,
+        'avg_goal_difference': (goals_scored - goals_conceded) / total_matches,
+        'clean_sheets': int(counters[CLEAN_SHEETS]),
+        'big_wins': int(counters[BIG_WINS]),  # Victoires par 3+ buts
+        'narrow_wins': int(counters[NARROW_WINS]),
+        'heavy_defeats': int(counters[HEAVY_DEFEATS])  # Défaites par 3+ buts
+    }
+
+
+def frame_scores(df):
+    """
+    Scores d'une table du dashboard sous forme de tableaux numpy
+    """
+    return df['france_score'].to_numpy(), df['opponent_score'].to_numpy()
+
+
+def batch_performance_metrics(df, subsets):
+    """
+    Métriques de plusieurs sous-ensembles de matchs en une passe.
+    `subsets` associe un nom à un masque booléen ou à des positions de lignes
+    (les sous-ensembles peuvent se chevaucher) ; renvoie {nom: métriques}.
+    """
+    names = list(subsets)
+    positions = [
+        np.flatnonzero(subset) if np.asarray(subset).dtype == bool else np.asarray(subset, dtype=np.intp)
+        for subset in subsets.values()
+    ]
+    rows = np.concatenate(positions) if positions else np.empty(0, dtype=np.intp)
+    groups = np.repeat(np.arange(len(names)), [len(p) for p in positions])
+
+    team_score, opponent_score = frame_scores(df)
+    counters = grouped_counters(team_score[rows], opponent_score[rows], groups, len(names))
+    return {name: metrics_from_counters(row) for name, row in zip(names, counters)}
+
+
+def metrics_table(counters, index):
+    """
+    Version vectorisée de metrics_from_counters : une ligne de métriques par
+    ligne de compteurs (toutes les lignes doivent compter au moins un match)
+    """
+    counters = np.asarray(counters)
+    total_matches = counters[:, MATCHES]
+    goal_difference = counters[:, GOALS_SCORED] - counters[:, GOALS_CONCEDED]
+    return pd.DataFrame({
+        'total_matches': total_matches,
+        'victories': counters[:, VICTORIES],
+        'defeats': counters[:, DEFEATS],
+        'draws': counters[:, DRAWS],
+        'win_rate': counters[:, VICTORIES] / total_matches * 100,
+        'defeat_rate': counters[:, DEFEATS] / total_matches * 100,
+        'draw_rate': counters[:, DRAWS] / total_matches * 100,
+        'goals_scored': counters[:, GOALS_SCORED],
+        'goals_conceded': counters[:, GOALS_CONCEDED],
+        'avg_goals_scored': counters[:, GOALS_SCORED] / total_matches,
+        'avg_goals_conceded': counters[:, GOALS_CONCEDED] / total_matches,
+        'goal_difference_total': goal_difference,
+        'avg_goal_difference': goal_difference / total_matches,
+        'clean_sheets': counters[:, CLEAN_SHEETS],
+        'big_wins': counters[:, BIG_WINS],
+        'narrow_wins': counters[:, NARROW_WINS],
+        'heavy_defeats': counters[:, HEAVY_DEFEATS]
+    }, index=index)
+
@@ -0,0 +1,156 @@
+"""
+Cube de compteurs pré-agrégés (année × mois × compétition × adversaire × lieu)
+
+Les compteurs additifs de utils.metrics_kernel sont calculés une fois par
+cellule non vide du cube (une passe bincount sur les matchs). Les vues des
+pages (statistiques par année, par mois, par compétition...) s'obtiennent
+ensuite en additionnant des cellules : quelques centaines de lignes au lieu
+de toute la table, filtres année et compétition compris. Le cube est
+construit une fois par version des données par le surveillant de données,
+et complété cellule par cellule quand des matchs sont ajoutés en fin de
+results.csv.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+
+from utils.grouped_aggregation import combine_codes, dimension_codes, grouped_sum
+from utils.metrics_kernel import frame_scores, grouped_counters, metrics_table
+
+# Dimensions du cube, dans l'ordre de composition des numéros de cellule
+CUBE_DIMENSIONS = ['year', 'month', 'tournament', 'opponent', 'venue']
+
+# Lieu du match vu de l'équipe
+HOME, AWAY, NEUTRAL = range(3)
+VENUE_LABELS = ['Domicile', 'Extérieur', 'Neutre']
+
+
+def venue_codes(df):
+    """
+    Code de lieu de chaque match : domicile, extérieur ou terrain neutre
+    """
+    venue = np.where(df['is_home'].to_numpy(dtype=bool), HOME, AWAY)
+    if 'neutral' in df.columns:
+        venue[df['neutral'].to_numpy(dtype=bool)] = NEUTRAL
+    return venue
+
+
+class MatchCube:
+    """
+    Cellules non vides du cube et leurs compteurs additifs
+    """
+
+    def __init__(self, df):
+        codes, self.labels = [], {}
+        for dimension in CUBE_DIMENSIONS:
+            if dimension == 'venue':
+                dimension_values, labels = venue_codes(df).astype(np.int64), pd.Index(VENUE_LABELS)
+            else:
+                dimension_values, labels = dimension_codes(df[dimension])
+            codes.append(dimension_values)
+            self.labels[dimension] = labels
+        sizes = tuple(max(len(self.labels[dimension]), 1) for dimension in CUBE_DIMENSIONS)
+
+        # Matchs dont une dimension est inconnue (code -1) : hors du cube
+        known = np.logical_and.reduce([dimension_values >= 0 for dimension_values in codes]) \
+            if len(df) else np.zeros(0, dtype=bool)
+        cell_ids = np.ravel_multi_index([dimension_values[known] for dimension_values in codes], sizes)
+        cells, inverse = np.unique(cell_ids, return_inverse=True)
+
+        team_score, opponent_score = frame_scores(df)
+        self.counters = grouped_counters(team_score[known], opponent_score[known], inverse, len(cells))
+        self.cell_codes = dict(zip(CUBE_DIMENSIONS, np.unravel_index(cells, sizes)))
+
+    def extend(self, rows):
+        """
+        Cube complété par les matchs `rows` ajoutés à la table : nouveau cube,
+        celui-ci restant lu par l'instantané précédent ; None s'il faut le
+        reconstruire (dictionnaire d'une dimension catégorielle réordonné)
+        """
+        if len(rows) == 0:
+            return self
+        added = MatchCube(rows)
+
+        # Libellés de chaque dimension : dictionnaire des catégories (étendu en
+        # fin), réunion triée pour les dimensions factorisées (années, mois)
+        labels = {}
+        for dimension in CUBE_DIMENSIONS:
+            old, new = self.labels[dimension], added.labels[dimension]
+            if dimension == 'venue':
+                labels[dimension] = old
+            elif isinstance(rows[dimension].dtype, pd.CategoricalDtype):
+                if not new[:len(old)].equals(old):
+                    return None
+                labels[dimension] = new
+            else:
+                labels[dimension] = old.union(new)
+        sizes = tuple(max(len(labels[dimension]), 1) for dimension in CUBE_DIMENSIONS)
+
+        # Numéros des cellules des deux cubes dans le cube fusionné, puis somme des doublons
+        cell_ids = []
+        for cube in (self, added):
+            codes = [labels[dimension].get_indexer(cube.labels[dimension])[cube.cell_codes[dimension]]
+                     for dimension in CUBE_DIMENSIONS]
+            cell_ids.append(np.ravel_multi_index(codes, sizes))
+        cells, inverse = np.unique(np.concatenate(cell_ids), return_inverse=True)
+
+        extended = copy.copy(self)
+        extended.labels = labels
+        extended.counters = grouped_sum(inverse, np.concatenate([self.counters, added.counters]), len(cells))
+        extended.cell_codes = dict(zip(CUBE_DIMENSIONS, np.unravel_index(cells, sizes)))
+        return extended
+
+    def cell_mask(self, start_year=None, end_year=None, tournaments=None):
+        """
+        Cellules retenues par les filtres de la barre latérale (toutes par défaut)
+        """
+        mask = np.ones(len(self.counters), dtype=bool)
+        years = np.asarray(self.labels['year'])[self.cell_codes['year']] if len(self.counters) else np.zeros(0)
+        if start_year is not None:
+            mask &= years >= start_year
+        if end_year is not None:
+            mask &= years <= end_year
+        if tournaments:
+            selected = self.labels['tournament'].isin(list(tournaments))
+            mask &= selected[self.cell_codes['tournament']]
+        return mask
+
+    def rollup_counters(self, by, mask=None):
+        """
+        Somme des compteurs des cellules par valeur des dimensions `by` :
+        (index des groupes, compteurs), groupes triés par libellés
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        counters = self.counters if mask is None else self.counters[mask]
+        codes = [self.cell_codes[dimension] if mask is None else self.cell_codes[dimension][mask]
+                 for dimension in by]
+        group_ids, _, index_of = combine_codes(codes, [self.labels[dimension] for dimension in by], by)
+        groups, inverse = np.unique(group_ids, return_inverse=True)
+        return index_of(groups), grouped_sum(inverse, counters, len(groups))
+
+    def rollup(self, by, start_year=None, end_year=None, tournaments=None):
+        """
+        Métriques complètes (colonnes de metrics_table) par valeur des
+        dimensions `by`, pour les matchs retenus par les filtres
+        """
+        index, sums = self.rollup_counters(by, self.cell_mask(start_year, end_year, tournaments))
+        return metrics_table(sums, index)
+
+
+def cube_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : cube de compteurs de la table France
+    """
+    return MatchCube(snapshot.france_data)
+
+
+def cube_update(previous, snapshot, data_dir):
+    """
+    Mise à jour incrémentale de l'agrégat : seuls les matchs ajoutés en fin
+    de results.csv sont traités (None si les données ont changé autrement)
+    """
+    if snapshot.appended_from is None:
+        return None
+    france_data = snapshot.france_data
+    return previous.extend(france_data[france_data['match_id'].to_numpy() >= snapshot.appended_from])
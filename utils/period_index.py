@@ -0,0 +1,172 @@
+"""
+Index de sommes cumulées pour les métriques sur une période
+
+Les compteurs additifs de utils.metrics_kernel (victoires, nuls, défaites,
+buts, clean sheets...) sont cumulés une fois sur la table triée par date :
+les compteurs de n'importe quelle plage de dates valent alors la différence
+de deux lignes cumulées. Pour les années, les bornes de chaque année sont
+précalculées (deux lectures de tableau, sans recherche), et un cumul par
+année et par compétition répond aux filtres année + compétitions de la
+barre latérale sans filtrer la table.
+
+Les sommes étant additives, un index se complète avec les matchs ajoutés en
+fin de results.csv (extend) sans repartir de toute la table.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+
+from utils.grouped_aggregation import match_indicators
+from utils.metrics_kernel import COUNTER_FIELDS, frame_scores, grouped_counters, metrics_from_counters
+from utils.team_perspective import date_to_day
+
+
+def extend_year_grid(cumulative, first_year, new_first_year, n_years, n_labels):
+    """
+    Cumul par année × libellé (années + 1, libellés, compteurs) ramené à la
+    plage de n_years années commençant en new_first_year, qui contient la
+    sienne, et à n_labels libellés (ajoutés en fin) : cumul nul avant la
+    plage d'origine, constant après
+    """
+    rows = np.clip(new_first_year - first_year + np.arange(n_years + 1), 0, len(cumulative) - 1)
+    extended = np.zeros((n_years + 1, n_labels, cumulative.shape[2]), dtype=np.int64)
+    extended[:, :cumulative.shape[1]] = cumulative[rows]
+    return extended
+
+
+def merge_year_grids(cumulative, first_year, other, other_first_year):
+    """
+    Somme de deux cumuls par année × libellé sur la réunion de leurs plages
+    d'années (les libellés du premier sont en tête de ceux du second) :
+    (première année, cumul)
+    """
+    spans = [(start, start + len(grid) - 1) for start, grid in
+             [(first_year, cumulative), (other_first_year, other)] if len(grid) > 1]
+    start = min(span[0] for span in spans)
+    n_years = max(span[1] for span in spans) - start
+    n_labels = other.shape[1]
+    return start, (extend_year_grid(cumulative, first_year, start, n_years, n_labels)
+                   + extend_year_grid(other, other_first_year, start, n_years, n_labels))
+
+
+class PeriodIndex:
+    """
+    Compteurs cumulés d'une table du dashboard, par date et par année × compétition
+    """
+
+    def __init__(self, df):
+        days = df['day'].to_numpy()
+        order = np.argsort(days, kind='stable')
+        self.days = days[order]
+        team_score, opponent_score = (scores[order] for scores in frame_scores(df))
+
+        # Compteurs de chaque match puis cumul (ligne 0 = aucun match)
+        per_match = match_indicators(team_score, opponent_score)
+        self.cumulative = np.zeros((len(order) + 1, len(COUNTER_FIELDS)), dtype=np.int64)
+        np.cumsum(per_match, axis=0, out=self.cumulative[1:])
+
+        # Bornes de chaque année : les matchs de l'année y occupent [offsets[i], offsets[i + 1])
+        years = df['year'].to_numpy()[order].astype(np.int64)
+        self.first_year = int(years[0]) if len(years) else 0
+        n_years = int(years[-1]) - self.first_year + 1 if len(years) else 0
+        self.year_offsets = np.searchsorted(years, self.first_year + np.arange(n_years + 1))
+
+        # Cumul par année et par compétition : (années + 1, compétitions, compteurs)
+        tournaments = df['tournament'].astype('category')
+        self.tournaments = tournaments.cat.categories
+        tournament_codes = tournaments.cat.codes.to_numpy()[order].astype(np.int64)
+        cells = (years - self.first_year) * len(self.tournaments) + tournament_codes
+        by_cell = grouped_counters(team_score, opponent_score, cells, n_years * len(self.tournaments))
+        self.year_tournament = np.zeros((n_years + 1, len(self.tournaments), len(COUNTER_FIELDS)), dtype=np.int64)
+        np.cumsum(by_cell.reshape(n_years, len(self.tournaments), -1), axis=0, out=self.year_tournament[1:])
+
+    def extend(self, rows):
+        """
+        Index complété par les matchs `rows` ajoutés à la table (compétitions
+        existantes en tête de leur dictionnaire) : nouvel index, celui-ci
+        restant lu par l'instantané précédent ; None s'il faut reconstruire
+        """
+        if len(rows) == 0:
+            return self
+        added = PeriodIndex(rows)
+        if len(self.days) == 0 or not added.tournaments[:len(self.tournaments)].equals(self.tournaments):
+            return None
+
+        # Tri stable : les matchs existants précèdent les ajouts du même jour, comme dans la table
+        days = np.concatenate([self.days, added.days])
+        order = np.argsort(days, kind='stable')
+        per_match = np.concatenate([np.diff(self.cumulative, axis=0), np.diff(added.cumulative, axis=0)])
+        extended = copy.copy(self)
+        extended.days = days[order]
+        extended.cumulative = np.zeros((len(order) + 1, len(COUNTER_FIELDS)), dtype=np.int64)
+        np.cumsum(per_match[order], axis=0, out=extended.cumulative[1:])
+
+        extended.first_year, extended.year_tournament = merge_year_grids(
+            self.year_tournament, self.first_year, added.year_tournament, added.first_year)
+        extended.tournaments = added.tournaments
+        # Bornes des années : premier match à partir du 1er janvier de chaque année
+        n_years = len(extended.year_tournament) - 1
+        january_first = (extended.first_year - 1970 + np.arange(n_years + 1)).astype('datetime64[Y]')
+        extended.year_offsets = np.searchsorted(extended.days, january_first.astype('datetime64[D]').astype(np.int64))
+        return extended
+
+    def _year_position(self, year):
+        """
+        Indice (borné) de l'année dans les tableaux par année
+        """
+        return int(np.clip(year - self.first_year, 0, len(self.year_offsets) - 1))
+
+    def counters_between_years(self, start_year, end_year, tournaments=None):
+        """
+        Compteurs des matchs de start_year à end_year inclus, restreints
+        éventuellement à une liste de compétitions
+        """
+        start, end = self._year_position(start_year), self._year_position(end_year + 1)
+        if end <= start:
+            return np.zeros(len(COUNTER_FIELDS), dtype=np.int64)
+        if not tournaments:
+            return self.cumulative[self.year_offsets[end]] - self.cumulative[self.year_offsets[start]]
+        codes = self.tournaments.get_indexer(list(tournaments))
+        codes = codes[codes >= 0]
+        return (self.year_tournament[end, codes] - self.year_tournament[start, codes]).sum(axis=0)
+
+    def counters_between_dates(self, start_date, end_date):
+        """
+        Compteurs des matchs entre deux dates incluses
+        """
+        start_day, end_day = date_to_day(pd.to_datetime([start_date, end_date]))
+        start = np.searchsorted(self.days, start_day, side='left')
+        end = np.searchsorted(self.days, end_day, side='right')
+        return self.cumulative[max(end, start)] - self.cumulative[start]
+
+    def metrics(self, start_year, end_year, tournaments=None):
+        """
+        Équivalent de calculate_performance_metrics sur la table filtrée par
+        années (et compétitions), sans filtrer la table
+        """
+        return metrics_from_counters(self.counters_between_years(start_year, end_year, tournaments))
+
+    def metrics_between_dates(self, start_date, end_date):
+        """
+        Métriques des matchs entre deux dates incluses
+        """
+        return metrics_from_counters(self.counters_between_dates(start_date, end_date))
+
+
+def period_index_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : index des périodes de la table France
+    """
+    return PeriodIndex(snapshot.france_data)
+
+
+def period_index_update(previous, snapshot, data_dir):
+    """
+    Mise à jour incrémentale de l'agrégat : seuls les matchs ajoutés en fin
+    de results.csv sont traités (None si les données ont changé autrement)
+    """
+    if snapshot.appended_from is None:
+        return None
+    france_data = snapshot.france_data
+    return previous.extend(france_data[france_data['match_id'].to_numpy() >= snapshot.appended_from])
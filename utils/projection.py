@@ -0,0 +1,173 @@
+"""
+Projection Monte-Carlo des résultats à venir
+
+Un modèle de Poisson multiplicatif (buts attendus = moyenne × attaque de
+l'équipe × défense de l'adversaire × facteur terrain) est ajusté sur toute
+la table point de vue équipe, les matchs récents pesant davantage
+(demi-vie). L'ajustement alterne attaque et défense par sommes bincount.
+
+Les saisons futures sont ensuite simulées d'un bloc : un tableau
+(simulations × matchs) d'adversaires tirés dans le calendrier récent, puis
+deux tirages de Poisson vectorisés pour les scores. Les grands nombres de
+simulations sont découpés en lots à graine fixe, exécutables dans un pool
+de processus ; le résultat ne dépend pas du nombre de processus.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.team_perspective import DEFEAT, DRAW, WIN
+
+DEFAULT_HALF_LIFE_DAYS = 730
+# Nombre de matchs fictifs (au niveau moyen) ajoutés à chaque équipe
+PRIOR_MATCHES = 2.0
+FIT_ITERATIONS = 30
+
+# Simulations par lot (un lot = une graine dérivée, exécuté dans un processus)
+CHUNK_SIZE = 50_000
+# Percentiles des bandes de confiance
+BAND_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class PoissonRates:
+    """
+    Forces d'attaque et de défense de chaque équipe (1 = niveau moyen)
+    """
+
+    def __init__(self, table, half_life_days=DEFAULT_HALF_LIFE_DAYS, score_column='team_score'):
+        self.teams = table['team'].cat.categories
+        self.team_codes = {team: code for code, team in enumerate(self.teams)}
+        team = table['team'].cat.codes.to_numpy().astype(np.intp)
+        opponent = table['opponent'].cat.codes.to_numpy().astype(np.intp)
+        goals = table[score_column].to_numpy().astype(np.float64)
+        n_teams = len(self.teams)
+
+        days = table['day'].to_numpy().astype(np.float64)
+        weights = 0.5 ** ((days.max() - days) / half_life_days) if len(days) else days
+
+        # Facteur terrain : buts à domicile / buts à l'extérieur hors terrain neutre
+        venue = np.ones(len(table))
+        if 'neutral' in table.columns:
+            played_home = ~table['neutral'].to_numpy(dtype=bool)
+            is_home = table['is_home'].to_numpy(dtype=bool)
+            home_goals = np.average(goals[played_home & is_home], weights=weights[played_home & is_home]) \
+                if (played_home & is_home).any() else 1.0
+            away_goals = np.average(goals[played_home & ~is_home], weights=weights[played_home & ~is_home]) \
+                if (played_home & ~is_home).any() else 1.0
+            self.home_factor = float(np.sqrt(home_goals / away_goals)) if away_goals > 0 else 1.0
+            venue[played_home & is_home] = self.home_factor
+            venue[played_home & ~is_home] = 1 / self.home_factor
+        else:
+            self.home_factor = 1.0
+
+        self.mean_goals = float(np.average(goals, weights=weights)) if len(goals) else 1.0
+        base = weights * self.mean_goals * venue
+
+        # Ajustement alterné, chaque force rapprochée de 1 par PRIOR_MATCHES matchs fictifs
+        prior = PRIOR_MATCHES * self.mean_goals
+        scored = np.bincount(team, weights=weights * goals, minlength=n_teams)
+        conceded = np.bincount(opponent, weights=weights * goals, minlength=n_teams)
+        self.attack = np.ones(n_teams)
+        self.defence = np.ones(n_teams)
+        for _ in range(FIT_ITERATIONS):
+            exposure = np.bincount(team, weights=base * self.defence[opponent], minlength=n_teams)
+            self.attack = (scored + prior) / (exposure + prior)
+            exposure = np.bincount(opponent, weights=base * self.attack[team], minlength=n_teams)
+            self.defence = (conceded + prior) / (exposure + prior)
+
+    def expected_goals(self, team, opponents, venues):
+        """
+        Buts attendus de `team` et de ses adversaires pour chaque match
+        (venues : +1 domicile, -1 extérieur, 0 terrain neutre)
+        """
+        code = self.team_codes[team]
+        opponent_codes = np.array([self.team_codes.get(o, -1) for o in opponents], dtype=np.intp)
+        # Adversaire inconnu du modèle : niveau moyen
+        opponent_attack = np.where(opponent_codes >= 0, self.attack[opponent_codes], 1.0)
+        opponent_defence = np.where(opponent_codes >= 0, self.defence[opponent_codes], 1.0)
+        venue = self.home_factor ** np.asarray(venues, dtype=np.float64)
+        team_goals = self.mean_goals * self.attack[code] * opponent_defence * venue
+        opponent_goals = self.mean_goals * opponent_attack * self.defence[code] / venue
+        return team_goals, opponent_goals
+
+
+def simulate_chunk(team_goals, opponent_goals, n_matches, n_simulations, seed):
+    """
+    Un lot de saisons simulées : codes de résultat (simulations × matchs)
+    """
+    rng = np.random.default_rng(seed)
+    fixtures = rng.integers(0, len(team_goals), size=(n_simulations, n_matches))
+    scored = rng.poisson(team_goals[fixtures])
+    conceded = rng.poisson(opponent_goals[fixtures])
+    return (np.sign(scored - conceded) + 1).astype(np.int8)
+
+
+def simulate_results(team_goals, opponent_goals, n_matches, n_simulations=10_000, seed=0, processes=1):
+    """
+    Résultats simulés de n_simulations saisons de n_matches matchs, chaque
+    match contre un adversaire tiré du calendrier (team_goals/opponent_goals :
+    buts attendus de chaque match du calendrier). processes > 1 répartit les
+    lots sur un pool de processus (None : un par cœur).
+    """
+    team_goals = np.asarray(team_goals, dtype=np.float64)
+    opponent_goals = np.asarray(opponent_goals, dtype=np.float64)
+    sizes = [CHUNK_SIZE] * (n_simulations // CHUNK_SIZE)
+    if n_simulations % CHUNK_SIZE:
+        sizes.append(n_simulations % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = [(team_goals, opponent_goals, n_matches, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    processes = os.cpu_count() if processes is None else processes
+    if processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as pool:
+            results = list(pool.map(simulate_chunk, *zip(*chunks)))
+    else:
+        results = [simulate_chunk(*chunk) for chunk in chunks]
+    return np.concatenate(results) if results else np.empty((0, n_matches), dtype=np.int8)
+
+
+def win_rate_bands(results, checkpoints):
+    """
+    Percentiles (BAND_PERCENTILES) du taux de victoire cumulé après chaque
+    nombre de matchs de `checkpoints` : tableau (checkpoints, percentiles)
+    """
+    wins = np.cumsum(results == WIN, axis=1, dtype=np.int32)
+    rates = np.stack([wins[:, n - 1] / n * 100 for n in checkpoints], axis=0)
+    return np.percentile(rates, BAND_PERCENTILES, axis=1).T
+
+
+def project_season(rates, team, schedule, n_matches, n_simulations=10_000, seed=0, processes=1,
+                   checkpoints=None):
+    """
+    Projection des n_matches prochains matchs de `team` contre des adversaires
+    tirés de `schedule` (table du dashboard : opponent, is_home, neutral).
+    Renvoie les taux simulés (victoire, nul, défaite) et les bandes du taux
+    de victoire aux `checkpoints` (nombres de matchs joués).
+    """
+    venues = np.where(schedule['is_home'].to_numpy(dtype=bool), 1, -1)
+    if 'neutral' in schedule.columns:
+        venues = np.where(schedule['neutral'].to_numpy(dtype=bool), 0, venues)
+    team_goals, opponent_goals = rates.expected_goals(team, schedule['opponent'].astype(str).to_numpy(), venues)
+    results = simulate_results(team_goals, opponent_goals, n_matches, n_simulations, seed, processes)
+
+    checkpoints = checkpoints or [n_matches]
+    return {
+        'simulations': n_simulations,
+        'matches': n_matches,
+        'win_rates': (results == WIN).mean(axis=1) * 100,
+        'draw_rate': float((results == DRAW).mean() * 100),
+        'defeat_rate': float((results == DEFEAT).mean() * 100),
+        'checkpoints': checkpoints,
+        'bands': win_rate_bands(results, checkpoints)
+    }
+
+
+def poisson_rates_aggregate(snapshot, data_dir):
+    """
+    Agrégat du surveillant de données : forces de Poisson de toutes les
+    équipes (table France seule si results.csv est indisponible)
+    """
+    if snapshot.perspective is not None:
+        return PoissonRates(snapshot.perspective.table)
+    return PoissonRates(snapshot.france_data, score_column='france_score')
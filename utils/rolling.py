@@ -0,0 +1,79 @@
+"""
+Statistiques glissantes multi-fenêtres à partir d'un seul cumul
+
+La table est triée une fois par ordre chronologique, puis les statistiques
+par match (points, buts marqués, buts encaissés, victoires) sont cumulées en
+une passe. La moyenne glissante de n'importe quelle fenêtre s'obtient alors
+par différence de deux lignes cumulées, pour toutes les fenêtres demandées
+à la fois (mêmes valeurs que rolling(window, min_periods=1).mean()).
+"""
+import numpy as np
+
+from utils.team_perspective import WIN, result_codes
+
+# Points attribués par code de résultat (Défaite, Nul, Victoire)
+RESULT_POINTS = np.array([0, 1, 3], dtype=np.int8)
+
+# Statistiques cumulées, dans l'ordre des colonnes de RollingStats.cumulative
+ROLLING_STATS = ['points', 'goals_scored', 'goals_conceded', 'win_rate']
+
+
+class RollingStats:
+    """
+    Ordre chronologique et cumuls d'une table du dashboard, réutilisables
+    pour toutes les fenêtres
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.order = np.lexsort((df['match_id'].to_numpy(), df['day'].to_numpy()))
+        results = result_codes(df)[self.order]
+        self.points = RESULT_POINTS[results]
+
+        per_match = np.column_stack([
+            self.points,
+            df['france_score'].to_numpy()[self.order],
+            df['opponent_score'].to_numpy()[self.order],
+            (results == WIN) * 100
+        ]).astype(np.int64)
+        self.cumulative = np.zeros((len(self.order) + 1, len(ROLLING_STATS)), dtype=np.int64)
+        np.cumsum(per_match, axis=0, out=self.cumulative[1:])
+
+    def means(self, windows):
+        """
+        Moyennes glissantes de chaque statistique pour chaque fenêtre :
+        tableau (fenêtres, matchs, statistiques)
+        """
+        n = len(self.order)
+        counts = np.arange(1, n + 1, dtype=np.float64)[:, None]
+        means = np.empty((len(windows), n, len(ROLLING_STATS)))
+        for w, window in enumerate(windows):
+            # Fenêtres complètes : différence de deux tranches du cumul ; début
+            # de série : moyenne de tous les matchs déjà joués (min_periods=1)
+            head = min(window, n)
+            means[w, :head] = self.cumulative[1:head + 1] / counts[:head]
+            means[w, head:] = (self.cumulative[head + 1:] - self.cumulative[1:n - head + 1]) / window
+        return means
+
+    def sorted_frame(self):
+        """
+        Table triée chronologiquement, avec les points de chaque match
+        """
+        frame = self.df.take(self.order)
+        frame['points'] = self.points
+        return frame
+
+    def trend_frame(self, windows=(10,)):
+        """
+        Table triée avec les moyennes glissantes. La première fenêtre donne
+        les colonnes rolling_<stat> ; chaque fenêtre donne aussi rolling_<stat>_<n>.
+        """
+        windows = list(windows)
+        frame = self.sorted_frame()
+        means = self.means(windows)
+        for w, window in enumerate(windows):
+            for s, stat in enumerate(ROLLING_STATS):
+                if w == 0:
+                    frame[f'rolling_{stat}'] = means[w, :, s]
+                frame[f'rolling_{stat}_{window}'] = means[w, :, s]
+        return frame
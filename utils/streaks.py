@@ -0,0 +1,67 @@
+"""
+Séries de résultats par codage par plages (run-length encoding)
+
+La suite chronologique des résultats est découpée en plages de valeurs
+identiques en une opération numpy : la série en cours est la dernière plage,
+et les plus longues séries de victoires, sans défaite ou sans victoire sont
+les plus longues plages de la condition correspondante. Aucun accès ligne à
+ligne, quelle que soit la période.
+"""
+import numpy as np
+
+from utils.team_perspective import DEFEAT, RESULT_LABELS, WIN, day_to_date, result_codes
+
+
+def run_lengths(values):
+    """
+    Plages de valeurs identiques consécutives : (débuts, longueurs, valeurs)
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), values
+    starts = np.concatenate([[0], np.flatnonzero(values[1:] != values[:-1]) + 1])
+    lengths = np.diff(np.append(starts, len(values)))
+    return starts, lengths, values[starts]
+
+
+def longest_run(condition, dates):
+    """
+    Plus longue plage où `condition` est vraie (la première en cas d'égalité),
+    avec ses dates de début et de fin
+    """
+    starts, lengths, values = run_lengths(condition)
+    lengths = np.where(values, lengths, 0)
+    if len(lengths) == 0 or lengths.max() == 0:
+        return {'length': 0, 'start': None, 'end': None}
+    best = int(np.argmax(lengths))
+    start, length = int(starts[best]), int(lengths[best])
+    return {'length': length, 'start': dates[start], 'end': dates[start + length - 1]}
+
+
+def streak_summary(df):
+    """
+    Série en cours et séries records d'une table du dashboard :
+    current (type = 'Victoire', 'Nul' ou 'Défaite'), longest_win,
+    longest_unbeaten et longest_winless, chacune avec longueur et dates
+    """
+    order = np.lexsort((df['match_id'].to_numpy(), df['day'].to_numpy()))
+    results = result_codes(df)[order]
+    dates = day_to_date(df['day'].to_numpy()[order])
+
+    starts, lengths, values = run_lengths(results)
+    if len(starts) == 0:
+        current = {'type': None, 'length': 0, 'start': None, 'end': None}
+    else:
+        current = {
+            'type': RESULT_LABELS[values[-1]],
+            'length': int(lengths[-1]),
+            'start': dates[starts[-1]],
+            'end': dates[-1]
+        }
+
+    return {
+        'current': current,
+        'longest_win': longest_run(results == WIN, dates),
+        'longest_unbeaten': longest_run(results != DEFEAT, dates),
+        'longest_winless': longest_run(results != WIN, dates)
+    }
@@ -0,0 +1,246 @@
+"""
+Générateur vectorisé de données synthétiques pour les tests de charge
+
+Produit des matchs au format `results.csv` et des buts au format
+`goalscorers.csv`, pour un nombre configurable d'équipes, de matchs (jusqu'à
+plusieurs dizaines de millions, écrits par blocs) et de compétitions.
+Toutes les tirages d'un bloc sont faits en une fois avec numpy.
+
+Usage : python -m utils.synthetic_data --matches 10000000 --teams 200 --out /tmp/synthetique
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    ARROW_CSV_AVAILABLE = True
+except ImportError:
+    ARROW_CSV_AVAILABLE = False
+
+DEFAULT_TOURNAMENTS = ['Friendly', 'World Cup', 'World Cup qualification', 'Euro',
+                       'Euro qualification', 'Olympic Games', 'SheBelieves Cup', 'Algarve Cup']
+
+RESULTS_COLUMNS = ['date', 'home_team', 'away_team', 'home_score', 'away_score',
+                   'tournament', 'city', 'country', 'neutral']
+GOALSCORERS_COLUMNS = ['date', 'home_team', 'away_team', 'team', 'scorer', 'minute', 'own_goal', 'penalty']
+
+PLAYERS_PER_TEAM = 23
+BOOL_LABELS = pd.Index(['FALSE', 'TRUE'])
+
+
+def make_teams(n_teams, first_team='France'):
+    """
+    Noms d'équipes synthétiques ; la première équipe porte un nom réel pour
+    que le dashboard trouve ses matchs
+    """
+    return np.array([first_team] + [f'Team {i:04d}' for i in range(1, n_teams)], dtype=object)
+
+
+def team_strengths(n_teams, seed=0):
+    """
+    Force relative de chaque équipe (log-intensité de buts), tirée une fois
+    pour tout le jeu de données afin que les blocs restent cohérents
+    """
+    return np.random.default_rng(seed).normal(0.0, 0.35, n_teams)
+
+
+def generate_matches(n_matches, teams, strengths, rng, start_day, end_day,
+                     tournaments=DEFAULT_TOURNAMENTS, focus_team=None,
+                     home_rate=1.55, away_rate=1.20, neutral_share=0.15):
+    """
+    Tire un bloc de matchs (format results.csv) en une seule série d'opérations numpy.
+    Les dates sont triées : des blocs aux plages de dates successives donnent un
+    fichier chronologique. Si `focus_team` est fourni, elle joue tous les matchs.
+    """
+    n_teams = len(teams)
+    if focus_team is None:
+        home = rng.integers(0, n_teams, n_matches)
+        # Décalage non nul : l'équipe à l'extérieur est toujours différente
+        away = (home + rng.integers(1, n_teams, n_matches)) % n_teams
+    else:
+        focus = int(np.flatnonzero(teams == focus_team)[0])
+        others = np.delete(np.arange(n_teams), focus)
+        opponent = others[rng.integers(0, len(others), n_matches)]
+        focus_home = rng.random(n_matches) < 0.5
+        home = np.where(focus_home, focus, opponent)
+        away = np.where(focus_home, opponent, focus)
+
+    # Intensités de buts de Poisson : force relative + avantage du terrain (sauf terrain neutre)
+    neutral = rng.random(n_matches) < neutral_share
+    neutral_rate = np.sqrt(home_rate * away_rate)
+    strength_gap = strengths[home] - strengths[away]
+    home_lambda = np.where(neutral, neutral_rate, home_rate) * np.exp(strength_gap)
+    away_lambda = np.where(neutral, neutral_rate, away_rate) * np.exp(-strength_gap)
+
+    days = np.sort(rng.integers(start_day, end_day, n_matches))
+    host = np.where(neutral, rng.integers(0, n_teams, n_matches), home)
+
+    # Colonnes texte en catégories (codes + petit dictionnaire) : ni chaînes
+    # par ligne à construire, ni conversion coûteuse avant l'écriture
+    team_labels = pd.Index(teams)
+    return pd.DataFrame({
+        'date': day_labels(days, start_day, end_day),
+        'home_team': pd.Categorical.from_codes(home, team_labels),
+        'away_team': pd.Categorical.from_codes(away, team_labels),
+        'home_score': rng.poisson(home_lambda).astype(np.int16),
+        'away_score': rng.poisson(away_lambda).astype(np.int16),
+        'tournament': pd.Categorical.from_codes(rng.integers(0, len(tournaments), n_matches), pd.Index(tournaments)),
+        'city': pd.Categorical.from_codes(host, pd.Index([f'Ville {i}' for i in range(n_teams)])),
+        'country': pd.Categorical.from_codes(host, team_labels),
+        'neutral': pd.Categorical.from_codes(neutral.astype(np.int8), BOOL_LABELS)
+    })
+
+
+def day_labels(days, start_day, end_day):
+    """
+    Dates ISO d'un tableau de numéros de jour, sous forme catégorielle
+    (une chaîne par jour de la plage, pas par match)
+    """
+    labels = np.datetime_as_string(np.arange(start_day, end_day).astype('datetime64[D]'))
+    return pd.Categorical.from_codes(days - start_day, pd.Index(labels))
+
+
+def generate_goalscorers(matches, rng, own_goal_share=0.02, penalty_share=0.08):
+    """
+    Buts d'un bloc de matchs (format goalscorers.csv) : une ligne par but,
+    répartis entre domicile et extérieur selon le score, sans boucle Python
+    """
+    home_score = matches['home_score'].to_numpy().astype(np.int64)
+    goals = home_score + matches['away_score'].to_numpy()
+    n_goals = int(goals.sum())
+
+    match_of_goal = np.repeat(np.arange(len(matches)), goals)
+    rank_in_match = np.arange(n_goals) - np.repeat(np.cumsum(goals) - goals, goals)
+    home_goal = rank_in_match < home_score[match_of_goal]
+
+    # Travail sur les codes d'équipes ; les colonnes restent catégorielles
+    teams = matches['home_team'].cat.categories
+    home_code = matches['home_team'].cat.codes.to_numpy()[match_of_goal]
+    away_code = matches['away_team'].cat.codes.to_numpy()[match_of_goal]
+    team_code = np.where(home_goal, home_code, away_code)
+    own_goal = rng.random(n_goals) < own_goal_share
+    # Un contre-son-camp est marqué par une joueuse de l'équipe adverse
+    scorer_team = np.where(own_goal, np.where(home_goal, away_code, home_code), team_code)
+    scorer = scorer_team.astype(np.int64) * PLAYERS_PER_TEAM + rng.integers(0, PLAYERS_PER_TEAM, n_goals)
+    roster = pd.Index([f'{team} #{number}' for team in teams for number in range(1, PLAYERS_PER_TEAM + 1)])
+    penalty = ~own_goal & (rng.random(n_goals) < penalty_share)
+
+    return pd.DataFrame({
+        'date': pd.Categorical.from_codes(matches['date'].cat.codes.to_numpy()[match_of_goal],
+                                          matches['date'].cat.categories),
+        'home_team': pd.Categorical.from_codes(home_code, teams),
+        'away_team': pd.Categorical.from_codes(away_code, teams),
+        'team': pd.Categorical.from_codes(team_code, teams),
+        'scorer': pd.Categorical.from_codes(scorer, roster),
+        'minute': rng.integers(1, 91, n_goals).astype(np.int8),
+        'own_goal': pd.Categorical.from_codes(own_goal.astype(np.int8), BOOL_LABELS),
+        'penalty': pd.Categorical.from_codes(penalty.astype(np.int8), BOOL_LABELS)
+    })
+
+
+def iter_synthetic_chunks(n_matches, n_teams=200, tournaments=DEFAULT_TOURNAMENTS, seed=0,
+                          start='1970-01-01', end='2025-01-01', chunk_size=1_000_000,
+                          focus_team=None, with_goalscorers=True, teams=None):
+    """
+    Génère le jeu de données bloc par bloc : (matchs, buts) pour chaque bloc.
+    Chaque bloc couvre une plage de dates successive et possède son propre
+    flux aléatoire dérivé de `seed`, ce qui rend la sortie reproductible.
+    `teams` remplace les noms synthétiques de make_teams (n_teams est alors ignoré).
+    """
+    if teams is None:
+        teams = make_teams(n_teams)
+    else:
+        teams = np.array(teams, dtype=object)
+        n_teams = len(teams)
+    tournaments = list(tournaments)
+    strengths = team_strengths(n_teams, seed)
+    start_day = int(np.datetime64(start, 'D').astype(np.int64))
+    end_day = int(np.datetime64(end, 'D').astype(np.int64))
+
+    n_chunks = max(1, -(-n_matches // chunk_size))
+    bounds = np.linspace(start_day, end_day, n_chunks + 1).astype(np.int64)
+    streams = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    for i in range(n_chunks):
+        size = min(chunk_size, n_matches - i * chunk_size)
+        rng = np.random.default_rng(streams[i])
+        matches = generate_matches(size, teams, strengths, rng, bounds[i], max(bounds[i + 1], bounds[i] + 1),
+                                   tournaments=tournaments, focus_team=focus_team)
+        goals = generate_goalscorers(matches, rng) if with_goalscorers else None
+        yield matches, goals
+
+
+def write_csv_chunk(df, file):
+    """
+    Ajoute un bloc (sans en-tête) à un fichier CSV ouvert en binaire.
+    L'écrivain CSV de pyarrow est nettement plus rapide que `to_csv` ;
+    pandas reste utilisé sans pyarrow ou si une valeur exige des guillemets.
+    """
+    if ARROW_CSV_AVAILABLE:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Catégories -> chaînes : l'écrivain CSV ne gère pas les dictionnaires
+        table = pa.table({
+            name: column.cast(pa.string()) if pa.types.is_dictionary(column.type) else column
+            for name, column in zip(table.column_names, table.columns)
+        })
+        buffer = pa.BufferOutputStream()
+        try:
+            pa_csv.write_csv(table, buffer, pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+        except pa.ArrowInvalid:
+            pass
+        else:
+            file.write(buffer.getvalue().to_pybytes())
+            return
+    df.to_csv(file, header=False, index=False, encoding='utf-8')
+
+
+def write_synthetic_dataset(out_dir, n_matches, with_goalscorers=True, **kwargs):
+    """
+    Écrit results.csv (et goalscorers.csv) dans `out_dir` en flux, bloc par
+    bloc, sans jamais garder le jeu complet en mémoire
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    results_path = os.path.join(out_dir, 'results.csv')
+    goals_path = os.path.join(out_dir, 'goalscorers.csv')
+
+    with open(results_path, 'wb') as results_file:
+        results_file.write((','.join(RESULTS_COLUMNS) + '\n').encode())
+        goals_file = open(goals_path, 'wb') if with_goalscorers else None
+        try:
+            if goals_file:
+                goals_file.write((','.join(GOALSCORERS_COLUMNS) + '\n').encode())
+            for matches, goals in iter_synthetic_chunks(n_matches, with_goalscorers=with_goalscorers, **kwargs):
+                write_csv_chunk(matches, results_file)
+                if goals_file:
+                    write_csv_chunk(goals, goals_file)
+        finally:
+            if goals_file:
+                goals_file.close()
+
+    return results_path, goals_path if with_goalscorers else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un jeu de données synthétique au format du dashboard")
+    parser.add_argument('--out', required=True, help="dossier de sortie")
+    parser.add_argument('--matches', type=int, default=1_000_000)
+    parser.add_argument('--teams', type=int, default=200)
+    parser.add_argument('--tournaments', nargs='*', default=DEFAULT_TOURNAMENTS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--no-goalscorers', action='store_true')
+    args = parser.parse_args()
+
+    paths = write_synthetic_dataset(
+        args.out, args.matches, with_goalscorers=not args.no_goalscorers, n_teams=args.teams,
+        tournaments=args.tournaments, seed=args.seed, chunk_size=args.chunk_size
+    )
+    print('\n'.join(path for path in paths if path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Table « point de vue équipe » : chaque match apparaît deux fois, une fois du
+côté de chaque équipe. La table est triée par équipe, ce qui permet d'extraire
+la vue d'une équipe par simple découpage des lignes [début, fin) de son bloc.
+
+Stockage compact : équipes, compétitions, villes, pays et résultat sont des
+catégories (codes int8/int16 + dictionnaire), les scores des int8 et la date
+un numéro de jour int32 (jours depuis le 1970-01-01).
+"""
+import numpy as np
+import pandas as pd
+
+# Codes du résultat : signe de l'écart de buts + 1
+DEFEAT, DRAW, WIN = 0, 1, 2
+RESULT_LABELS = pd.Index(['Défaite', 'Nul', 'Victoire'])
+
+# Colonnes du match d'origine recopiées telles quelles des deux côtés
+MATCH_COLUMNS = ['match_id', 'day', 'year', 'month', 'home_team', 'away_team',
+                 'home_score', 'away_score', 'tournament', 'city', 'country', 'neutral']
+
+
+def compact_int(values):
+    """
+    Convertit un tableau d'entiers vers le plus petit type signé qui le contient
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return values.astype(np.int8)
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= values.min() and values.max() <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def date_to_day(dates):
+    """
+    Dates -> numéros de jour int32
+    """
+    dates = pd.Series(dates)
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    return dates.to_numpy().astype('datetime64[D]').astype(np.int32)
+
+
+def day_to_date(days):
+    """
+    Numéros de jour -> dates (datetime64)
+    """
+    return pd.to_datetime(np.asarray(days, dtype='int64'), unit='D')
+
+
+def encode_result(goal_difference):
+    """
+    Résultat catégoriel (codes int8) à partir de l'écart de buts
+    """
+    codes = (np.sign(goal_difference) + 1).astype(np.int8)
+    return pd.Categorical.from_codes(codes, RESULT_LABELS)
+
+
+def result_codes(df):
+    """
+    Codes entiers du résultat d'une vue (DEFEAT, DRAW, WIN)
+    """
+    return df['result'].cat.codes.to_numpy()
+
+
+def build_team_perspective(matches):
+    """
+    Construit la table point de vue équipe à partir de la table des matchs
+    (une ligne par match, équipes déjà normalisées, scores entiers)
+    """
+    # Dictionnaire d'équipes commun aux colonnes domicile/extérieur (factorisation par hachage)
+    n_matches = len(matches)
+    codes, teams = pd.factorize(np.concatenate([
+        matches['home_team'].to_numpy(dtype=object),
+        matches['away_team'].to_numpy(dtype=object)
+    ]), sort=True)
+    codes = codes.astype(np.int16 if len(teams) < np.iinfo(np.int16).max else np.int32)
+    home_codes, away_codes = codes[:n_matches], codes[n_matches:]
+    home_score = compact_int(matches['home_score'].to_numpy())
+    away_score = compact_int(matches['away_score'].to_numpy())
+
+    # Ville et pays sont optionnels (non lus par le dashboard)
+    match_columns = [column for column in MATCH_COLUMNS if column in matches.columns or column == 'day']
+    compact = pd.DataFrame({
+        'match_id': matches['match_id'].to_numpy(dtype=np.int32),
+        'day': date_to_day(matches['date']),
+        'year': matches['year'].to_numpy(dtype=np.int16),
+        'month': matches['month'].to_numpy(dtype=np.int8),
+        'home_team': pd.Categorical.from_codes(home_codes, teams),
+        'away_team': pd.Categorical.from_codes(away_codes, teams),
+        'home_score': home_score,
+        'away_score': away_score,
+        'tournament': pd.Categorical(matches['tournament']),
+        'neutral': matches['neutral'].to_numpy(dtype=bool)
+    })
+    for column in ('city', 'country'):
+        if column in match_columns:
+            compact[column] = pd.Categorical(matches[column])
+
+    # Côté domicile puis côté extérieur, concaténés en une passe
+    team_codes = codes
+    team_score = np.concatenate([home_score, away_score])
+    opponent_score = np.concatenate([away_score, home_score])
+    goal_difference = compact_int(team_score.astype(np.int32) - opponent_score)
+
+    table = pd.concat([compact[match_columns]] * 2, ignore_index=True)
+    table['team'] = pd.Categorical.from_codes(team_codes, teams)
+    table['opponent'] = pd.Categorical.from_codes(np.concatenate([away_codes, home_codes]), teams)
+    table['is_home'] = np.repeat([True, False], n_matches)
+    table['team_score'] = team_score
+    table['opponent_score'] = opponent_score
+    table['result'] = encode_result(goal_difference)
+    table['goal_difference'] = goal_difference
+
+    # Tri par équipe puis chronologique : chaque équipe occupe un bloc contigu
+    order = np.lexsort((table['match_id'].to_numpy(), table['day'].to_numpy(), team_codes))
+    return table.take(order).reset_index(drop=True)
+
+
+# Colonnes catégorielles partageant un même dictionnaire
+CATEGORY_GROUPS = [
+    ['home_team', 'away_team', 'team', 'opponent'],
+    ['tournament'],
+    ['city'],
+    ['country']
+]
+
+
+def sort_keys(table):
+    """
+    Clé de tri int64 (équipe, jour) d'une table point de vue équipe
+    """
+    team_codes = table['team'].cat.codes.to_numpy().astype(np.int64)
+    days = table['day'].to_numpy().astype(np.int64) - np.iinfo(np.int32).min
+    return (team_codes << 32) | days
+
+
+def append_to_team_perspective(table, matches):
+    """
+    Ajoute de nouveaux matchs à une table point de vue équipe existante.
+    Les dictionnaires sont étendus en fin (les codes existants ne changent pas)
+    et les nouvelles lignes sont insérées à leur place dans le bloc de leur
+    équipe, sans retrier la table existante.
+    """
+    if len(matches) == 0:
+        return table
+    
+    new_rows = build_team_perspective(matches)
+    table = table.copy()
+    
+    for columns in CATEGORY_GROUPS:
+        if columns[0] not in table.columns:
+            continue
+        categories = table[columns[0]].cat.categories
+        added = new_rows[columns[0]].cat.categories.difference(categories)
+        if len(added) > 0:
+            categories = categories.append(added)
+            for column in columns:
+                table[column] = table[column].cat.add_categories(added)
+        for column in columns:
+            new_rows[column] = pd.Categorical(new_rows[column], categories=categories)
+    
+    # Nouvelles lignes triées entre elles, puis positions d'insertion dans la table
+    # existante (triée par équipe puis jour) par recherche dichotomique
+    new_keys = sort_keys(new_rows)
+    new_order = np.lexsort((new_rows['match_id'].to_numpy(), new_keys))
+    new_rows = new_rows.take(new_order).reset_index(drop=True)
+    positions = np.searchsorted(sort_keys(table), new_keys[new_order], side='right')
+    
+    n_existing = len(table)
+    order = np.insert(np.arange(n_existing), positions, np.arange(n_existing, n_existing + len(new_rows)))
+    combined = pd.concat([table, new_rows], ignore_index=True)
+    return combined.take(order).reset_index(drop=True)
+
+
+def first_appended_match(previous, table):
+    """
+    Premier match_id des lignes ajoutées à la table `previous` pour obtenir
+    `table` (lignes existantes inchangées et dans le même ordre, dictionnaires
+    étendus en fin, comme après append_to_team_perspective) ; None si la
+    table a été modifiée autrement
+    """
+    if len(previous) == 0 or list(previous.columns) != list(table.columns):
+        return None
+    first_new = int(previous['match_id'].max()) + 1
+    known = table[table['match_id'].to_numpy() < first_new]
+    if len(known) != len(previous):
+        return None
+    
+    for column in previous.columns:
+        old, new = previous[column], known[column]
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            categories = old.cat.categories
+            if not isinstance(new.dtype, pd.CategoricalDtype) or \
+                    not new.cat.categories[:len(categories)].equals(categories):
+                return None
+            old, new = old.cat.codes, new.cat.codes
+        if not np.array_equal(old.to_numpy(), new.to_numpy()):
+            return None
+    return first_new
+
+
+class TeamPerspective:
+    """
+    Table point de vue équipe et son index par équipe (bornes de chaque bloc)
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.teams = table['team'].cat.categories
+        team_codes = table['team'].cat.codes.to_numpy()
+        self.offsets = np.searchsorted(team_codes, np.arange(len(self.teams) + 1))
+
+    def team_code(self, team):
+        """
+        Code entier d'une équipe (-1 si inconnue)
+        """
+        return self.teams.get_loc(team) if team in self.teams else -1
+
+    def team_view(self, team):
+        """
+        Matchs d'une équipe de son point de vue, par découpage de son bloc
+        """
+        code = self.team_code(team)
+        if code < 0:
+            return self.table.iloc[0:0]
+        return self.table.iloc[self.offsets[code]:self.offsets[code + 1]]
+
+    def match_counts(self):
+        """
+        Nombre de matchs par équipe, lu directement dans l'index
+        """
+        return pd.Series(np.diff(self.offsets), index=self.teams)
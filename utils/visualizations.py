@@ -3,6 +3,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from utils.figure_cache import cached_figure
+from utils.grouped_aggregation import grouped_metrics
+from utils.olap_cube import MatchCube
 
 # Couleurs Durabilis&Co
 COLORS = {
@@ -17,19 +20,22 @@ COLORS = {
     'gradient': 'linear-gradient(135deg, #2ea9df 0%, #1970b4 50%, #2d3381 100%)'
 }
 
-def create_performance_evolution(df):
+@cached_figure
+def create_performance_evolution(df, yearly=None):
     """
     Crée un graphique d'évolution des performances dans le temps
+    (yearly : métriques par année déjà agrégées, voir utils.olap_cube)
     """
-    # Agrégation par année
-    yearly_stats = df.groupby('year').agg({
-        'result': lambda x: (x == 'Victoire').sum() / len(x) * 100,
-        'france_score': 'mean',
-        'opponent_score': 'mean',
-        'goal_difference': 'mean'
-    }).reset_index()
-    
-    yearly_stats.columns = ['year', 'win_rate', 'avg_goals_scored', 'avg_goals_conceded', 'avg_goal_diff']
+    # Agrégation par année : cumul des cellules du cube
+    if yearly is None:
+        yearly = MatchCube(df).rollup('year')
+    yearly_stats = pd.DataFrame({
+        'year': yearly.index.to_numpy(),
+        'win_rate': yearly['win_rate'].to_numpy(),
+        'avg_goals_scored': yearly['avg_goals_scored'].to_numpy(),
+        'avg_goals_conceded': yearly['avg_goals_conceded'].to_numpy(),
+        'avg_goal_diff': yearly['avg_goal_difference'].to_numpy()
+    })
     
     # Création du graphique
     fig = make_subplots(
@@ -94,6 +100,7 @@ def create_performance_evolution(df):
     
     # Répartition des résultats (secteurs)
     result_counts = df['result'].value_counts()
+    result_counts = result_counts[result_counts > 0]
     fig.add_trace(
         go.Pie(
             labels=result_counts.index,
@@ -113,31 +120,22 @@ def create_performance_evolution(df):
     
     return fig
 
+@cached_figure
 def create_comparison_charts(df):
     """
     Crée des graphiques de comparaison internationale
     """
-    # Performance contre les principales nations
-    top_opponents = df['opponent'].value_counts().head(8).index
-    top_opponents_data = df[df['opponent'].isin(top_opponents)]
-    
-    # Calcul des statistiques par adversaire
-    comparison_stats = []
-    for opponent in top_opponents:
-        opp_data = df[df['opponent'] == opponent]
-        wins = len(opp_data[opp_data['result'] == 'Victoire'])
-        total = len(opp_data)
-        win_rate = (wins / total * 100) if total > 0 else 0
-        
-        comparison_stats.append({
-            'opponent': opponent,
-            'matches': total,
-            'win_rate': win_rate,
-            'avg_goals_scored': opp_data['france_score'].mean(),
-            'avg_goals_conceded': opp_data['opponent_score'].mean()
-        })
-    
-    comparison_df = pd.DataFrame(comparison_stats)
+    # Performance contre les principales nations (tous les adversaires en une passe)
+    opponent_stats = grouped_metrics(df, 'opponent')
+    top_stats = opponent_stats.sort_values('total_matches', ascending=False, kind='stable').head(8)
+    
+    comparison_df = pd.DataFrame({
+        'opponent': top_stats.index,
+        'matches': top_stats['total_matches'].to_numpy(),
+        'win_rate': top_stats['win_rate'].to_numpy(),
+        'avg_goals_scored': top_stats['avg_goals_scored'].to_numpy(),
+        'avg_goals_conceded': top_stats['avg_goals_conceded'].to_numpy()
+    })
     
     fig = make_subplots(
         rows=2, cols=2,
@@ -226,6 +224,7 @@ def create_comparison_charts(df):
     
     return fig
 
+@cached_figure
 def create_home_advantage_chart(df):
     """
     Crée un graphique analysant l'avantage du terrain
@@ -330,13 +329,16 @@ def create_home_advantage_chart(df):
     
     return fig
 
-def create_momentum_chart(df):
+@cached_figure
+def create_momentum_chart(df, df_trend=None):
     """
     Crée un graphique de momentum et tendances récentes
+    (df_trend : moyennes mobiles déjà calculées, par exemple lues dans le cache des métriques)
     """
     from utils.data_processing import calculate_trend_metrics
     
-    df_trend = calculate_trend_metrics(df, window=10)
+    if df_trend is None:
+        df_trend = calculate_trend_metrics(df, window=10)
     
     fig = make_subplots(
         rows=2, cols=1,
@@ -396,18 +398,21 @@ def create_momentum_chart(df):
     
     return fig
 
-def create_tournament_performance_chart(df):
+@cached_figure
+def create_tournament_performance_chart(df, by_tournament=None):
     """
     Crée un graphique de performance par type de compétition
+    (by_tournament : métriques par compétition déjà agrégées, voir utils.olap_cube)
     """
-    tournament_stats = df.groupby('tournament').agg({
-        'result': lambda x: (x == 'Victoire').sum() / len(x) * 100,
-        'france_score': 'mean',
-        'opponent_score': 'mean',
-        'date': 'count'  # Utiliser 'date' pour compter le nombre de matchs
-    }).reset_index()
-    
-    tournament_stats.columns = ['tournament', 'win_rate', 'avg_goals_scored', 'avg_goals_conceded', 'matches']
+    if by_tournament is None:
+        by_tournament = MatchCube(df).rollup('tournament')
+    tournament_stats = pd.DataFrame({
+        'tournament': by_tournament.index.to_numpy(),
+        'win_rate': by_tournament['win_rate'].to_numpy(),
+        'avg_goals_scored': by_tournament['avg_goals_scored'].to_numpy(),
+        'avg_goals_conceded': by_tournament['avg_goals_conceded'].to_numpy(),
+        'matches': by_tournament['total_matches'].to_numpy()
+    })
     tournament_stats = tournament_stats.sort_values('matches', ascending=False)
     
     fig = px.scatter(